@@ -0,0 +1,10 @@
+#!/bin/sh
+set -e -x
+PYTHON=${PYTHON:=python}
+$PYTHON -mtimeit -r 6 -s'from gevent.lock import Semaphore; from gevent import spawn; s = Semaphore(0)' 'spawn(s.release); s.acquire()'
+$PYTHON -mtimeit -r 6 -s'from gevent.lock import Semaphore; from gevent import spawn_raw; s = Semaphore(0)' 'spawn_raw(s.release); s.acquire()'
+$PYTHON -mtimeit -r 6 -s'from gevent.lock import Semaphore; from gevent import spawn_pooled; s = Semaphore(0)' 'spawn_pooled(s.release); s.acquire()'
+$PYTHON -mtimeit -r 6 -s'from gevent import spawn_raw, wait; from gevent.hub import xrange; f = lambda : 5' 'for _ in xrange(100): spawn_raw(f)' 'wait()'
+$PYTHON -mtimeit -r 6 -s'from gevent import spawn_pooled, wait; from gevent.hub import xrange; f = lambda : 5' 'for _ in xrange(100): spawn_pooled(f)' 'wait()'
+$PYTHON -mtimeit -r 6 -s'from gevent import spawn_raw, wait; from gevent.hub import xrange; f = lambda : 5' 'for _ in xrange(10000): spawn_raw(f)' 'wait()'
+$PYTHON -mtimeit -r 6 -s'from gevent import spawn_pooled, wait; from gevent.hub import xrange; f = lambda : 5' 'for _ in xrange(10000): spawn_pooled(f)' 'wait()'
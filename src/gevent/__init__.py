@@ -29,6 +29,7 @@ __all__ = [
     'spawn',
     'spawn_later',
     'spawn_raw',
+    'spawn_pooled',
     'iwait',
     'wait',
     'killall',
@@ -79,7 +80,7 @@ spawn = Greenlet.spawn
 spawn_later = Greenlet.spawn_later
 
 from gevent.timeout import Timeout, with_timeout
-from gevent.hub import getcurrent, GreenletExit, spawn_raw, sleep, idle, kill, reinit
+from gevent.hub import getcurrent, GreenletExit, spawn_raw, spawn_pooled, sleep, idle, kill, reinit
 try:
     from gevent.os import fork
 except ImportError:
@@ -0,0 +1,99 @@
+# Copyright (c) 2018 gevent contributors. See LICENSE for details.
+"""
+Fast parsing of HTTP request lines and headers for :mod:`gevent.pywsgi`.
+
+Each header block is checked and split in one pass with regular
+expressions. Only request lines and header blocks that are
+well-formed are handled; anything else is left to the slower parsing in
+:mod:`gevent.pywsgi` and :mod:`http.client` so that errors are
+reported the same way.
+
+.. versionadded:: 1.3a2
+"""
+from __future__ import absolute_import
+
+import re
+
+try:
+    from http.client import _MAXHEADERS # pylint:disable=import-error
+except ImportError:
+    _MAXHEADERS = 100
+
+__all__ = [
+    'parse_request_line',
+    'parse_header_block',
+]
+
+# A request line of an HTTP/1.0 or HTTP/1.1 request, without its line
+# ending. Such a line splits into the same three words on any
+# whitespace.
+_REQUEST_LINE = re.compile(r'(\S+) (\S+) (HTTP/1\.[01])\Z')
+
+# A block of well-formed header lines (and continuation lines),
+# ending with the empty line. The email feed parser also ends a line
+# at a bare \r, so one is only allowed before \n.
+_HEADER_BLOCK = re.compile(br'(?:[\x21-\x39\x3b-\x7e]+:[^\r\n]*\r?\n(?:[ \t][^\r\n]*\r?\n)*)*\r?\n\Z')
+
+_IGNORED_KEYS = ('CONTENT_TYPE', 'CONTENT_LENGTH')
+
+
+def parse_request_line(line):
+    """
+    Parse *line*, the native string of a request line without its
+    line ending.
+
+    Returns a tuple ``(command, path, request_version)`` if it is a
+    well-formed HTTP/1.0 or HTTP/1.1 request line, or None.
+    """
+    match = _REQUEST_LINE.match(line)
+    if match is None:
+        return None
+    return match.groups()
+
+
+def parse_header_block(block):
+    """
+    Parse *block*, the bytes of the request headers up to and
+    including the empty line that ends them.
+
+    Returns a tuple ``(headers, environ)``, or None if *block* isn't
+    simple enough to parse here.
+
+    *headers* is a list of ``(name, value)`` pairs, with the values
+    the :mod:`email` feed parser would produce, suitable for
+    ``HTTPMessage.set_raw``. *environ* is a list of ``(key, value)``
+    pairs of the ``HTTP_*`` WSGI environment variables, in the order
+    and with the values that
+    :meth:`gevent.pywsgi.WSGIHandler.get_environ` would add them.
+    """
+    if block.count(b'\n') > _MAXHEADERS or not _HEADER_BLOCK.match(block):
+        return None
+
+    headers = []
+    environ = []
+    name = None
+    value = None
+    for line in block.decode('latin-1').split('\n'):
+        if line[:1] in (' ', '\t'):
+            # A continuation line, kept as-is.
+            value += line + '\n'
+            continue
+        if name is not None:
+            _add_header(headers, environ, name, value)
+        if not line or line == '\r':
+            break
+        name, value = line.split(':', 1)
+        value = value.lstrip(' \t') + '\n'
+    return headers, environ
+
+
+def _add_header(headers, environ, name, value):
+    value = value.rstrip('\r\n')
+    headers.append((name, value))
+    if '_' in name:
+        # Like WSGIHandler, drop headers that could be confused
+        # with the ones we add.
+        return
+    key = name.replace('-', '_').upper()
+    if key not in _IGNORED_KEYS:
+        environ.append(('HTTP_' + key, value.strip()))
@@ -115,6 +115,15 @@ class socket(object):
 
     # pylint:disable=too-many-public-methods
 
+    #: The initial value of :attr:`read_ahead` for new sockets,
+    #: including those returned by :meth:`accept` and used by
+    #: :class:`gevent.server.StreamServer`. This is false unless the
+    #: ``GEVENT_SOCKET_READ_AHEAD`` environment variable is set to a
+    #: true value (anything but empty, ``0``, ``false``, ``no`` or ``off``).
+    #:
+    #: .. versionadded:: 1.3a2
+    default_read_ahead = _socketcommon._default_read_ahead
+
     def __init__(self, family=AF_INET, type=SOCK_STREAM, proto=0, _sock=None):
         if _sock is None:
             self._sock = _realsocket(family, type, proto)
@@ -138,6 +147,9 @@ class socket(object):
         io = self.hub.loop.io
         self._read_event = io(fileno, 1)
         self._write_event = io(fileno, 2)
+        self._read_ahead_waiter = None
+        if self.default_read_ahead:
+            self.read_ahead = True
 
     def __repr__(self):
         return '<%s at %s %s>' % (type(self).__name__, hex(id(self)), self._formatinfo())
@@ -174,27 +186,62 @@ class socket(object):
         return self._read_event.ref or self._write_event.ref
 
     def _set_ref(self, value):
-        self._read_event.ref = value
+        if self._read_ahead_waiter is not None:
+            self._read_ahead_waiter.set_ref(value)
+        else:
+            self._read_event.ref = value
         self._write_event.ref = value
 
     ref = property(_get_ref, _set_ref)
 
-    def _wait(self, watcher, timeout_exc=timeout('timed out')):
+    def _get_read_ahead(self):
+        return self._read_ahead_waiter is not None
+
+    def _set_read_ahead(self, value):
+        if value:
+            if self._read_ahead_waiter is None and self._read_event is not None:
+                self._read_ahead_waiter = _socketcommon._ReadAheadWaiter(self.hub, self._read_event)
+        elif self._read_ahead_waiter is not None:
+            self._read_ahead_waiter.stop()
+            self._read_ahead_waiter = None
+
+    read_ahead = property(_get_read_ahead, _set_read_ahead, doc="""
+        Whether reads keep the read watcher started between calls.
+
+        See :attr:`gevent._socket3.socket.read_ahead`.
+
+        .. versionadded:: 1.3a2
+        """)
+
+    def _wait(self, watcher, timeout_exc=timeout('timed out'), timeout=timeout_default):
         """Block the current greenlet until *watcher* has pending events.
 
         If *timeout* is non-negative, then *timeout_exc* is raised after *timeout* second has passed.
         By default *timeout_exc* is ``socket.timeout('timed out')``.
 
         If :func:`cancel_wait` is called, raise ``socket.error(EBADF, 'File descriptor was closed in another greenlet')``.
+
+        *timeout* defaults to the socket's timeout.
         """
+        if timeout is timeout_default:
+            timeout = self.timeout
+        read_ahead_waiter = self._read_ahead_waiter
+        if read_ahead_waiter is not None and watcher is self._read_event:
+            timer = Timeout._start_new_or_dummy(timeout, timeout_exc, ref=False)
+            try:
+                read_ahead_waiter.wait()
+            finally:
+                timer.close()
+            return
+
         if watcher.callback is not None:
             raise _socketcommon.ConcurrentObjectUseError('This socket is already used by another greenlet: %r' % (watcher.callback, ))
 
-        timeout = Timeout._start_new_or_dummy(self.timeout, timeout_exc, ref=False)
+        timer = Timeout._start_new_or_dummy(timeout, timeout_exc, ref=False)
         try:
             self.hub.wait(watcher)
         finally:
-            timeout.close()
+            timer.close()
 
     def accept(self):
         sock = self._sock
@@ -216,6 +263,7 @@ class socket(object):
         if self._read_event is not None:
             self.hub.cancel_wait(self._read_event, cancel_wait_ex, True)
             self._read_event = None
+            self._read_ahead_waiter = None
         if self._write_event is not None:
             self.hub.cancel_wait(self._write_event, cancel_wait_ex, True)
             self._write_event = None
@@ -352,7 +400,7 @@ class socket(object):
             if ex.args[0] not in _socketcommon.GSENDAGAIN or timeout == 0.0:
                 raise
             sys.exc_clear()
-            self._wait(self._write_event)
+            self._wait(self._write_event, timeout=timeout)
             try:
                 return sock.send(data, flags)
             except error as ex2:
@@ -446,6 +494,18 @@ class socket(object):
             timeleft = self.__send_chunk(chunk, flags, timeleft, end)
             data_sent += len(chunk) # Guaranteed it sent the whole thing
 
+    def sendall_vectored(self, buffers, flags=0):
+        """
+        Send all the data in the sequence of *buffers*.
+
+        Python 2 sockets have no ``sendmsg``, so this is simply
+        ``sendall(b''.join(buffers), flags)``. It's provided for
+        compatibility with :meth:`gevent._socket3.socket.sendall_vectored`.
+
+        .. versionadded:: 1.3a2
+        """
+        self.sendall(b''.join(buffers), flags)
+
     def sendto(self, *args):
         sock = self._sock
         try:
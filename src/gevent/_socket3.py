@@ -39,6 +39,31 @@ def _get_memory(data):
     # or something else exotic that supports the buffer interface
     return mv.tobytes()
 
+def _get_byte_memory(data):
+    # A memoryview of *data* that can be sliced by byte offsets.
+    mv = memoryview(data)
+    if mv.format != 'B' or mv.ndim != 1:
+        try:
+            mv = mv.cast('B')
+        except TypeError:
+            # Not contiguous
+            mv = memoryview(mv.tobytes())
+    return mv
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 16 # The smallest POSIX allows
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16
+
+try:
+    _GiveupOnSendfile = __socket__._GiveupOnSendfile # pylint:disable=no-member
+except AttributeError:
+    # Python 3.4
+    class _GiveupOnSendfile(Exception):
+        pass
+
 timeout_default = object()
 
 
@@ -74,6 +99,15 @@ class socket(object):
     # of _wrefsocket. (gevent internal usage only)
     _gevent_sock_class = _wrefsocket
 
+    #: The initial value of :attr:`read_ahead` for new sockets,
+    #: including those returned by :meth:`accept` and used by
+    #: :class:`gevent.server.StreamServer`. This is false unless the
+    #: ``GEVENT_SOCKET_READ_AHEAD`` environment variable is set to a
+    #: true value (anything but empty, ``0``, ``false``, ``no`` or ``off``).
+    #:
+    #: .. versionadded:: 1.3a2
+    default_read_ahead = _socketcommon._default_read_ahead
+
     def __init__(self, family=AF_INET, type=SOCK_STREAM, proto=0, fileno=None):
         # Take the same approach as socket2: wrap a real socket object,
         # don't subclass it. This lets code that needs the raw _sock (not tied to the hub)
@@ -87,6 +121,9 @@ class socket(object):
         io_class = self.hub.loop.io
         self._read_event = io_class(fileno, 1)
         self._write_event = io_class(fileno, 2)
+        self._read_ahead_waiter = None
+        if self.default_read_ahead:
+            self.read_ahead = True
         self.timeout = _socket.getdefaulttimeout()
 
     def __getattr__(self, name):
@@ -133,23 +170,69 @@ class socket(object):
         return self._read_event.ref or self._write_event.ref
 
     def _set_ref(self, value):
-        self._read_event.ref = value
+        if self._read_ahead_waiter is not None:
+            self._read_ahead_waiter.set_ref(value)
+        else:
+            self._read_event.ref = value
         self._write_event.ref = value
 
     ref = property(_get_ref, _set_ref)
 
-    def _wait(self, watcher, timeout_exc=timeout('timed out')):
+    def _get_read_ahead(self):
+        return self._read_ahead_waiter is not None
+
+    def _set_read_ahead(self, value):
+        if value:
+            if self._read_ahead_waiter is None and self._read_event is not None:
+                self._read_ahead_waiter = _socketcommon._ReadAheadWaiter(self.hub, self._read_event)
+        elif self._read_ahead_waiter is not None:
+            self._read_ahead_waiter.stop()
+            self._read_ahead_waiter = None
+
+    read_ahead = property(_get_read_ahead, _set_read_ahead, doc="""
+        Whether reads keep the read watcher started between calls.
+
+        Normally, each read that would block starts the read watcher
+        and stops it again once the socket is readable. When this is
+        true, the watcher is left started after the read resumes, so
+        that connections that do many small reads (for example,
+        request/response protocols) don't pay to start and stop it
+        each time.
+
+        While no greenlet is reading, the started watcher doesn't keep
+        the event loop running, so idle sockets in this mode don't
+        keep :func:`gevent.wait` or the hub from finishing.
+
+        The default comes from :attr:`default_read_ahead`.
+
+        .. versionadded:: 1.3a2
+        """)
+
+    def _wait(self, watcher, timeout_exc=timeout('timed out'), timeout=timeout_default):
         """Block the current greenlet until *watcher* has pending events.
 
         If *timeout* is non-negative, then *timeout_exc* is raised after *timeout* second has passed.
         By default *timeout_exc* is ``socket.timeout('timed out')``.
 
         If :func:`cancel_wait` is called, raise ``socket.error(EBADF, 'File descriptor was closed in another greenlet')``.
+
+        *timeout* defaults to the socket's timeout.
         """
+        if timeout is timeout_default:
+            timeout = self.timeout
+        read_ahead_waiter = self._read_ahead_waiter
+        if read_ahead_waiter is not None and watcher is self._read_event:
+            timer = Timeout._start_new_or_dummy(timeout, timeout_exc, ref=False)
+            try:
+                read_ahead_waiter.wait()
+            finally:
+                timer.close()
+            return
+
         if watcher.callback is not None:
             raise _socketcommon.ConcurrentObjectUseError('This socket is already used by another greenlet: %r' % (watcher.callback, ))
 
-        timer = Timeout._start_new_or_dummy(self.timeout, timeout_exc, ref=False)
+        timer = Timeout._start_new_or_dummy(timeout, timeout_exc, ref=False)
         try:
             self.hub.wait(watcher)
         finally:
@@ -250,6 +333,7 @@ class socket(object):
         if self._read_event is not None:
             self.hub.cancel_wait(self._read_event, cancel_wait_ex, True)
             self._read_event = None
+            self._read_ahead_waiter = None
         if self._write_event is not None:
             self.hub.cancel_wait(self._write_event, cancel_wait_ex, True)
             self._write_event = None
@@ -392,7 +476,7 @@ class socket(object):
         except error as ex:
             if ex.args[0] not in _socketcommon.GSENDAGAIN or timeout == 0.0:
                 raise
-            self._wait(self._write_event)
+            self._wait(self._write_event, timeout=timeout)
             try:
                 return _socket.socket.send(self._sock, data, flags)
             except error as ex2:
@@ -429,6 +513,62 @@ class socket(object):
                 if timeleft <= 0:
                     raise timeout('timed out')
 
+    if hasattr(_socket.socket, 'sendmsg'):
+        # Only on Unix
+
+        def sendall_vectored(self, buffers, flags=0):
+            """
+            Send all the data in the sequence of bytes-like *buffers*.
+
+            This is equivalent to ``sendall(b''.join(buffers), flags)``,
+            but the buffers are not copied: they are written with as few
+            calls to :meth:`sendmsg` as possible, resuming after a
+            partial write where the previous call left off. As with
+            :meth:`sendall`, the socket timeout applies to the operation
+            as a whole.
+
+            .. versionadded:: 1.3a2
+            """
+            memories = [_get_byte_memory(data) for data in buffers]
+            memories = [data for data in memories if len(data)]
+            if not memories:
+                return
+
+            timeleft = self.timeout
+            if timeleft is not None:
+                end = time.time() + timeleft
+            index = 0
+            count = len(memories)
+            while True:
+                try:
+                    sent = _socket.socket.sendmsg(self._sock, memories[index:index + _IOV_MAX], (), flags)
+                except error as ex:
+                    if ex.args[0] not in _socketcommon.GSENDAGAIN or timeleft == 0.0:
+                        raise
+                    # Wait no longer than what's left of the timeout
+                    # for the whole operation.
+                    self._wait(self._write_event, timeout=timeleft)
+                    sent = 0
+                # Skip what has been written entirely, and
+                # slice the rest of the first partially-written buffer
+                while index < count and sent >= len(memories[index]):
+                    sent -= len(memories[index])
+                    index += 1
+                if index >= count:
+                    break
+                if sent:
+                    memories[index] = memories[index][sent:]
+                if timeleft is not None:
+                    timeleft = end - time.time()
+                    if timeleft <= 0:
+                        raise timeout('timed out')
+    else:
+
+        def sendall_vectored(self, buffers, flags=0):
+            # No scatter/gather here; join the buffers and write them
+            # in one go.
+            self.sendall(b''.join(buffers), flags)
+
     def sendto(self, *args):
         try:
             return _socket.socket.sendto(self._sock, *args)
@@ -500,11 +640,65 @@ class socket(object):
         self._sock.shutdown(how)
 
     # sendfile: new in 3.5. But there's no real reason to not
-    # support it everywhere. Note that we can't use os.sendfile()
-    # because it's not cooperative.
-    def _sendfile_use_sendfile(self, file, offset=0, count=None):
-        # This is called directly by tests
-        raise __socket__._GiveupOnSendfile() # pylint:disable=no-member
+    # support it everywhere. os.sendfile() isn't cooperative by itself,
+    # but with our non-blocking file descriptor we can wait for the
+    # write watcher whenever it would block.
+    if hasattr(os, 'sendfile'):
+
+        def _sendfile_use_sendfile(self, file, offset=0, count=None):
+            # This is called directly by tests
+            self._check_sendfile_params(file, offset, count)
+            sockno = self.fileno()
+            try:
+                fileno = file.fileno()
+            except (AttributeError, io.UnsupportedOperation) as err:
+                raise _GiveupOnSendfile(err)  # not a regular file
+            try:
+                fsize = os.fstat(fileno).st_size
+            except OSError as err:
+                raise _GiveupOnSendfile(err)  # not a regular file
+            if not fsize:
+                return 0  # empty file
+            blocksize = fsize if not count else count
+
+            if self.gettimeout() == 0:
+                raise ValueError("non-blocking sockets are not supported")
+
+            total_sent = 0
+            # localize variable access to minimize overhead
+            os_sendfile = os.sendfile
+            try:
+                while True:
+                    if count:
+                        blocksize = count - total_sent
+                        if blocksize <= 0:
+                            break
+                    try:
+                        sent = os_sendfile(sockno, fileno, offset, blocksize)
+                    except BlockingIOError:
+                        self._wait(self._write_event)
+                        continue
+                    except OSError as err:
+                        if total_sent == 0:
+                            # We can get here for different reasons, the main
+                            # one being 'file' is not a regular mmap(2)-like
+                            # file, in which case we'll fall back on using
+                            # plain send().
+                            raise _GiveupOnSendfile(err)
+                        raise err from None
+                    else:
+                        if sent == 0:
+                            break  # EOF
+                        offset += sent
+                        total_sent += sent
+                return total_sent
+            finally:
+                if total_sent > 0 and hasattr(file, 'seek'):
+                    file.seek(offset)
+    else:
+
+        def _sendfile_use_sendfile(self, file, offset=0, count=None):
+            raise _GiveupOnSendfile("os.sendfile() not available on this platform")
 
     def _sendfile_use_send(self, file, offset=0, count=None):
         self._check_sendfile_params(file, offset, count)
@@ -576,8 +770,15 @@ class socket(object):
         .. versionadded:: 1.1rc4
            Added in Python 3.5, but available under all Python 3 versions in
            gevent.
+        .. versionchanged:: 1.3a2
+           Use :func:`os.sendfile` when possible, waiting cooperatively
+           whenever the socket's buffer is full. Previously, the file
+           was always read into memory and written with :meth:`send`.
         """
-        return self._sendfile_use_send(file, offset, count)
+        try:
+            return self._sendfile_use_sendfile(file, offset, count)
+        except _GiveupOnSendfile:
+            return self._sendfile_use_send(file, offset, count)
 
     # get/set_inheritable new in 3.4
     if hasattr(os, 'get_inheritable') or hasattr(os, 'get_handle_inheritable'):
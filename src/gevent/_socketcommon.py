@@ -70,8 +70,12 @@ __imports__.extend(__py3_imports__)
 
 
 import sys
+from gevent.hub import config
 from gevent.hub import get_hub
 from gevent.hub import ConcurrentObjectUseError
+from gevent.hub import InvalidSwitchError
+from gevent.hub import Waiter
+from gevent.hub import getcurrent
 from gevent.timeout import Timeout
 from gevent._compat import string_types, integer_types, PY3
 from gevent._util import copy_globals
@@ -238,6 +242,89 @@ def cancel_wait(watcher, error=cancel_wait_ex):
     get_hub().cancel_wait(watcher, error)
 
 
+def _config_bool(envvar):
+    # Unset, empty, '0', 'false', 'no' and 'off' (in any case) are
+    # false; anything else is true.
+    value = ','.join(config('', envvar)).strip().lower()
+    return value not in ('', '0', 'false', 'no', 'off')
+
+#: The initial value of ``socket.default_read_ahead``. Set the
+#: ``GEVENT_SOCKET_READ_AHEAD`` environment variable to a true value
+#: such as ``1`` to turn read-ahead on for every socket.
+_default_read_ahead = _config_bool('GEVENT_SOCKET_READ_AHEAD')
+
+
+class _ReadAheadWaiter(Waiter):
+    """
+    Waits for a socket's read watcher without stopping it afterwards.
+
+    This is the callback of the read watcher of a socket in read-ahead
+    mode. The watcher is started the first time a read would block and
+    left started when the reading greenlet resumes, so the next read
+    that blocks only has to switch to the hub.
+
+    If the watcher fires while nobody is reading, it is stopped:
+    otherwise, a level-triggered descriptor with unread data would
+    keep the event loop spinning. The next read finds that data
+    without waiting, and the next read that blocks starts the watcher
+    again.
+
+    While nobody is reading, the watcher is not referenced, so that an
+    idle socket doesn't keep the event loop running; while somebody
+    is, it has the socket's :attr:`ref`.
+    """
+
+    __slots__ = ['watcher', 'ref']
+
+    def __init__(self, hub, watcher):
+        Waiter.__init__(self, hub)
+        self.watcher = watcher
+        self.ref = watcher.ref
+        watcher.ref = False
+
+    def set_ref(self, value):
+        self.ref = value
+        if self.greenlet is not None:
+            self.watcher.ref = value
+
+    def switch(self, value=None):
+        if self.greenlet is None:
+            self.watcher.stop()
+        else:
+            Waiter.switch(self, value)
+
+    def throw(self, *throw_args):
+        # Only a waiting greenlet can be cancelled; unlike Waiter,
+        # don't save the exception for the next call to wait().
+        if self.greenlet is None:
+            self.watcher.stop()
+        else:
+            Waiter.throw(self, *throw_args)
+
+    def wait(self):
+        if self.greenlet is not None:
+            raise ConcurrentObjectUseError('This socket is already used by another greenlet: %r' % (self.greenlet, ))
+        watcher = self.watcher
+        watcher.ref = self.ref
+        try:
+            if not watcher.active:
+                watcher.start(self.switch, self)
+            result = self.get()
+        finally:
+            if watcher.active:
+                # Not if the socket was closed. A stopped watcher
+                # gets our ref again when it's started.
+                watcher.ref = False
+        if result is not self:
+            raise InvalidSwitchError('Invalid switch into %s: %r (expected %r)' % (getcurrent(), result, self))
+
+    def stop(self):
+        if self.greenlet is not None:
+            raise ConcurrentObjectUseError('This socket is already used by another greenlet: %r' % (self.greenlet, ))
+        self.watcher.stop()
+        self.watcher.ref = self.ref
+
+
 
 
 def gethostbyname(hostname):
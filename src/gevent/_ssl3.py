@@ -380,8 +380,6 @@ class SSLSocket(socket):
                 return None
             return self._sslobj.version()
 
-        # We inherit sendfile from super(); it always uses `send`
-
     def cipher(self):
         self._checkClosed()
         if not self._sslobj:
@@ -409,11 +407,11 @@ class SSLSocket(socket):
                 except SSLWantReadError:
                     if self.timeout == 0.0:
                         return 0
-                    self._wait(self._read_event)
+                    self._wait(self._read_event, timeout=timeout)
                 except SSLWantWriteError:
                     if self.timeout == 0.0:
                         return 0
-                    self._wait(self._write_event)
+                    self._wait(self._write_event, timeout=timeout)
         else:
             return socket.send(self, data, flags, timeout)
 
@@ -433,6 +431,20 @@ class SSLSocket(socket):
         raise NotImplementedError("sendmsg not allowed on instances of %s" %
                                   self.__class__)
 
+    def sendfile(self, file, offset=0, count=None):
+        """Send a file, possibly by using os.sendfile() if this is a
+        clear-text socket.  Return the total number of bytes sent.
+        """
+        if self._sslobj is None:
+            return socket.sendfile(self, file, offset, count)
+        # os.sendfile() would bypass the encryption.
+        return self._sendfile_use_send(file, offset, count)
+
+    def sendall_vectored(self, buffers, flags=0):
+        # sendmsg() would bypass the encryption, and each write
+        # produces a TLS record anyway, so send the buffers all together.
+        self.sendall(b''.join(buffers), flags)
+
     def sendall(self, data, flags=0):
         self._checkClosed()
         if self._sslobj:
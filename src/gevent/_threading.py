@@ -22,9 +22,33 @@ __all__ = [
 
 
 thread_name = '_thread' if PY3 else 'thread'
-start_new_thread, Lock, = monkey.get_original(thread_name, [
-    'start_new_thread', 'allocate_lock',
+start_new_thread, Lock, get_ident, = monkey.get_original(thread_name, [
+    'start_new_thread', 'allocate_lock', 'get_ident',
 ])
+_sleep, _time, = monkey.get_original('time', ['sleep', 'time'])
+
+
+def acquire_with_timeout(lock, timeout):
+    """
+    Acquire *lock*, waiting no more than *timeout* seconds, or forever
+    if it is None. Return whether the lock was acquired.
+    """
+    if timeout is None:
+        lock.acquire()
+        return True
+    if PY3:
+        return lock.acquire(True, timeout)
+    # Python 2 locks can't time out; poll the way its
+    # threading.Condition.wait does.
+    endtime = _time() + timeout
+    delay = 0.0005
+    while not lock.acquire(0):
+        remaining = endtime - _time()
+        if remaining <= 0:
+            return False
+        delay = min(delay * 2, remaining, .05)
+        _sleep(delay)
+    return True
 
 
 class Condition(object):
@@ -164,6 +188,16 @@ class Queue(object):
             self.unfinished_tasks += 1
             self.not_empty.notify()
 
+    def put_many(self, items):
+        """Put all the *items* into the queue at once.
+        """
+        with self.mutex:
+            count = len(self.queue)
+            self.queue.extend(items)
+            count = len(self.queue) - count
+            self.unfinished_tasks += count
+            self.not_empty.notify(count)
+
     def get(self):
         """Remove and return an item from the queue.
         """
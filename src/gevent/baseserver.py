@@ -1,8 +1,12 @@
 """Base class for implementing servers"""
 # Copyright (c) 2009-2012 Denis Bilenko. See LICENSE for details.
+import os
 import sys
 import _socket
 import errno
+import signal
+import time
+import traceback
 from gevent.greenlet import Greenlet
 from gevent.event import Event
 from gevent.hub import get_hub
@@ -58,14 +62,24 @@ class BaseServer(object):
           While it is full, no new connections are accepted;
         - :func:`gevent.spawn_raw` -- ``handle`` will be executed in a raw
           greenlet which has a little less overhead then :class:`gevent.Greenlet` instances spawned by default;
+        - :func:`gevent.spawn_pooled` -- like :func:`gevent.spawn_raw`, but
+          reusing the greenlets of handlers that have finished;
         - ``None`` -- ``handle`` will be executed right away, in the :class:`Hub` greenlet.
           ``handle`` cannot use any blocking functions as it would mean switching to the :class:`Hub`.
         - an integer -- a shortcut for ``gevent.pool.Pool(integer)``
 
+    :keyword workers: If given and greater than 0, :meth:`start` forks
+        this many worker processes (using
+        :func:`gevent.os.fork_and_watch`) after creating the listening
+        socket, and only the workers accept and handle connections.
+        See :attr:`workers`.
+
     .. versionchanged:: 1.1a1
        When the *handle* function returns from processing a connection,
        the client socket will be closed. This resolves the non-deterministic
        closing of the socket, fixing ResourceWarnings under Python 3 and PyPy.
+    .. versionchanged:: 1.3a2
+       Add the *workers* keyword argument.
 
     """
     # pylint: disable=too-many-instance-attributes,bare-except,broad-except
@@ -82,21 +96,105 @@ class BaseServer(object):
     #: Default is 100. Note, that in case of multiple working processes on the same
     #: listening value, it should be set to a lower value. (pywsgi.WSGIServer sets it
     #: to 1 when environ["wsgi.multiprocess"] is true)
+    #:
+    #: .. versionchanged:: 1.3a2
+    #:    This is the number accepted on a wake up when the listen
+    #:    backlog is shallow. See :attr:`max_accept_growth`.
     max_accept = 100
 
+    #: While the listen backlog stays deeper than the number of
+    #: connections accepted on each wake up, that number doubles, up to
+    #: this many times :attr:`max_accept`; it halves again (but not
+    #: below :attr:`max_accept`) when the backlog turns out to be
+    #: shallow. This helps servers keep up with bursts of
+    #: connections without making established connections wait longer
+    #: the rest of the time. Set this to 1 to always accept at most
+    #: :attr:`max_accept` connections on a wake up (pywsgi.WSGIServer
+    #: does when it sets :attr:`max_accept` to 1).
+    #:
+    #: .. versionadded:: 1.3a2
+    max_accept_growth = 16
+
+    # The current number of connections to accept on a wake up.
+    _accept_limit = 0
+
+    #: If not None, the most connections to handle at once. Once this
+    #: many are being handled, further connections are accepted and
+    #: then shed (see :meth:`do_shed`) instead of being handled or
+    #: left waiting in the listen backlog; when this is set, a full
+    #: pool also makes the server shed connections instead of
+    #: stopping accepting. Use this when clients are better off
+    #: failing fast than waiting for a server that is already busy.
+    #:
+    #: .. versionadded:: 1.3a2
+    max_connections = None
+
+    #: If not None, the most connections per second to handle. Up to
+    #: a second's worth can be handled at once; connections above the
+    #: rate are shed.
+    #:
+    #: .. versionadded:: 1.3a2
+    max_accept_rate = None
+
+    #: The number of connections that have been shed.
+    #:
+    #: .. versionadded:: 1.3a2
+    shed_count = 0
+
+    # The number of connections being handled, counted only while
+    # max_connections is set.
+    _connections = 0
+    # The state of the max_accept_rate token bucket.
+    _rate_tokens = 0.0
+    _rate_time = 0.0
+
     _spawn = Greenlet.spawn
 
     #: the default timeout that we wait for the client connections to close in stop()
     stop_timeout = 1
 
+    #: The number of worker processes to serve with. If this is 0 (the
+    #: default), the server accepts connections in the process (and
+    #: event loop) that started it. Otherwise, :meth:`start` forks
+    #: this many processes after creating the listening socket; each
+    #: of them accepts connections from that socket in its own event
+    #: loop, while the starting process (the *master*) only starts a
+    #: new worker whenever one exits. :meth:`stop` asks the workers to
+    #: stop in the same way (so handlers spawned in a worker's pool,
+    #: or by default, get *timeout* seconds to finish) and waits for
+    #: them to exit, killing any that take too long.
+    #:
+    #: Workers are forked from the greenlet that calls :meth:`start`
+    #: and never return from it; they exit when they are stopped, or
+    #: when the master goes away. Anything else running in the
+    #: master when it forks (including when it replaces a worker) is
+    #: copied into the workers, so servers with workers are best
+    #: started before anything else, and run with
+    #: :meth:`serve_forever`. Workers ignore ``SIGINT``, leaving it to
+    #: the master.
+    #:
+    #: Availability: POSIX.
+    #:
+    #: .. versionadded:: 1.3a2
+    workers = 0
+
+    # If a worker exits within this many seconds of being started, wait
+    # max_delay before replacing it so that a worker that can't start
+    # doesn't make us fork continuously.
+    _worker_min_lifetime = 1
+
     fatal_errors = (errno.EBADF, errno.EINVAL, errno.ENOTSOCK)
 
-    def __init__(self, listener, handle=None, spawn='default'):
+    def __init__(self, listener, handle=None, spawn='default', workers=None):
         self._stop_event = Event()
         self._stop_event.set()
         self._watcher = None
         self._timer = None
         self._handle = None
+        # {pid: [control fd or None, start time]} for the workers in the
+        # master process; None in a worker process.
+        self._workers = {}
+        self._workers_exited = Event()
         # XXX: FIXME: Subclasses rely on the presence or absence of the
         # `socket` attribute to determine whether we are open/should be opened.
         # Instead, have it be None.
@@ -109,6 +207,12 @@ class BaseServer(object):
             self.loop = get_hub().loop
             if self.max_accept < 1:
                 raise ValueError('max_accept must be positive int: %r' % (self.max_accept, ))
+            if workers is not None:
+                if workers < 0:
+                    raise ValueError('workers must be a non-negative int: %r' % (workers, ))
+                self.workers = workers
+            if self.workers and not hasattr(os, 'fork'):
+                raise ValueError('workers requires os.fork')
         except:
             self.close()
             raise
@@ -174,6 +278,9 @@ class BaseServer(object):
         spawn = self._spawn
         handle = self._handle
         close = self.do_close
+        if self.max_connections is not None:
+            self._connections += 1
+            close = self._close_counted
 
         try:
             if spawn is None:
@@ -184,21 +291,88 @@ class BaseServer(object):
             close(*args)
             raise
 
+    def _close_counted(self, *args):
+        # do_close for connections counted against max_connections.
+        self._connections -= 1
+        self.do_close(*args)
+
     def do_close(self, *args):
         pass
 
+    def _admit(self):
+        # Return whether the connection just accepted should be
+        # handled, according to max_connections and max_accept_rate.
+        max_connections = self.max_connections
+        if max_connections is not None:
+            if self._connections >= max_connections or self.full():
+                return False
+        rate = self.max_accept_rate
+        if rate is not None:
+            now = self.loop.now()
+            tokens = min(max(rate, 1.0), self._rate_tokens + (now - self._rate_time) * rate)
+            self._rate_time = now
+            if tokens < 1:
+                self._rate_tokens = tokens
+                return False
+            self._rate_tokens = tokens - 1
+        return True
+
+    def do_shed(self, *args):
+        """
+        Reject a connection that was accepted while the server was over
+        one of its limits (see :attr:`max_connections` and
+        :attr:`max_accept_rate`). This is called in the event loop,
+        so it must not block. By default, this calls :meth:`do_close`.
+
+        .. versionadded:: 1.3a2
+        """
+        self.do_close(*args)
+
     def do_read(self):
         raise NotImplementedError()
 
+    def _shed_or_handle(self, args):
+        # Handle the connection just accepted, or shed it if the server
+        # is over one of its limits. Only errors from handling it
+        # propagate.
+        if self._admit():
+            self.do_handle(*args)
+            return
+        self.shed_count += 1
+        try:
+            self.do_shed(*args)
+        except:
+            self.loop.handle_error((args[1:], self), *sys.exc_info())
+
+    def _clamp_accept_limit(self, limit):
+        max_accept = self.max_accept
+        return min(max(limit, max_accept), max_accept * self.max_accept_growth)
+
+    def _adapt_accept_limit(self, accepted):
+        # Called when a wake up emptied the backlog or used up its
+        # limit, having accepted *accepted* connections.
+        limit = self._accept_limit
+        if accepted >= limit:
+            # There may be more waiting; take more next time.
+            limit *= 2
+        elif accepted * 2 <= limit:
+            # The backlog was shallow.
+            limit //= 2
+        self._accept_limit = self._clamp_accept_limit(limit)
+
     def _do_read(self):
-        for _ in xrange(self.max_accept):
-            if self.full():
+        limit = self._accept_limit = self._clamp_accept_limit(self._accept_limit)
+        accepted = 0
+        for _ in xrange(limit):
+            if self.full() and self.max_connections is None:
                 self.stop_accepting()
                 return
             try:
                 args = self.do_read()
                 self.delay = self.min_delay
                 if not args:
+                    # The backlog is empty.
+                    self._adapt_accept_limit(accepted)
                     return
             except:
                 self.loop.handle_error(self, *sys.exc_info())
@@ -215,7 +389,7 @@ class BaseServer(object):
                 break
             else:
                 try:
-                    self.do_handle(*args)
+                    self._shed_or_handle(args)
                 except:
                     self.loop.handle_error((args[1:], self), *sys.exc_info())
                     if self.delay >= 0:
@@ -224,6 +398,9 @@ class BaseServer(object):
                         self._timer.start(self._start_accepting_if_started)
                         self.delay = min(self.max_delay, self.delay * 2)
                     break
+                accepted += 1
+        else:
+            self._adapt_accept_limit(accepted)
 
     def full(self):
         # copied from self.pool
@@ -306,14 +483,134 @@ class BaseServer(object):
         self.init_socket()
         self._stop_event.clear()
         try:
-            self.start_accepting()
+            if self.workers:
+                for _ in xrange(self.workers):
+                    self._start_worker()
+            else:
+                self.start_accepting()
         except:
             self.close()
             raise
 
+    def _start_worker(self):
+        from gevent.os import fork_and_watch
+        if not self.started or self._workers is None:
+            # Stopped since this was scheduled, or we're in a worker
+            # that inherited it.
+            return
+        control_r, control_w = os.pipe()
+        worker_socket = None
+        try:
+            worker_socket = self._get_worker_socket() # pylint:disable=assignment-from-none
+            # The watcher keeps the loop running while the worker does,
+            # the way that accepting does without workers.
+            pid = fork_and_watch(self._on_worker_exit, ref=True)
+        except:
+            os.close(control_r)
+            os.close(control_w)
+            if worker_socket is not None:
+                worker_socket.close()
+            raise
+        if not pid:
+            os.close(control_w)
+            self._run_worker(control_r, worker_socket)
+        os.close(control_r)
+        if worker_socket is not None:
+            worker_socket.close()
+        self._workers[pid] = [control_w, time.time()]
+
+    def _get_worker_socket(self):
+        # Return a listening socket for the next worker to accept on
+        # instead of self.socket, or None to use self.socket. Called
+        # in the master before forking; the worker passes it to
+        # set_listener and init_socket.
+        return None
+
+    def _run_worker(self, control_fd, worker_socket):
+        # In a newly forked worker. Serve until the master writes
+        # the stop timeout to the control pipe (or closes it, or
+        # exits), then exit the process.
+        # pylint:disable=protected-access
+        from gevent.os import make_nonblocking, nb_read
+        status = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            for fd, _ in self._workers.values():
+                if fd is not None:
+                    os.close(fd)
+            self._workers = None
+            # Don't wake up the master's greenlets (which we have
+            # copies of) waiting for the server to stop.
+            self._stop_event = Event()
+            if self.pool is None and self._spawn == Greenlet.spawn: # pylint:disable=comparison-with-callable
+                # So that stop() can wait for the handlers.
+                from gevent.pool import Pool
+                self.set_spawn(Pool())
+            if worker_socket is not None:
+                # Set up the same way as a socket passed to the
+                # constructor.
+                self.socket.close()
+                self.set_listener(worker_socket)
+                self.init_socket()
+            self.start_accepting()
+
+            make_nonblocking(control_fd)
+            message = b''
+            while not message.endswith(b'\n'):
+                data = nb_read(control_fd, 64)
+                if not data:
+                    break
+                message += data
+            os.close(control_fd)
+            self.stop(float(message) if message.strip() else None)
+        except:
+            traceback.print_exc()
+            status = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(status)
+
+    def _on_worker_exit(self, watcher):
+        # The child watcher for a worker, in the master.
+        workers = self._workers
+        if not workers or watcher.pid not in workers:
+            return
+        control_fd, started_at = workers.pop(watcher.pid)
+        if control_fd is not None:
+            os.close(control_fd)
+        if self.started:
+            # Replace it.
+            delay = 0
+            if time.time() - started_at < self._worker_min_lifetime:
+                delay = self.max_delay
+            Greenlet.spawn_later(delay, self._start_worker)
+        elif not workers:
+            self._workers_exited.set()
+
+    def _stop_workers(self, timeout):
+        # Ask any workers that we haven't already asked to stop, with
+        # *timeout* to finish their handlers.
+        for worker in self._workers.values():
+            control_fd = worker[0]
+            if control_fd is None:
+                continue
+            worker[0] = None
+            try:
+                os.write(control_fd, ('%r\n' % (timeout, )).encode('ascii'))
+            except OSError:
+                # It already exited.
+                pass
+            finally:
+                os.close(control_fd)
+
     def close(self):
         """Close the listener socket and stop accepting."""
         self._stop_event.set()
+        if self._workers:
+            self._stop_workers(self.stop_timeout)
         try:
             self.stop_accepting()
         finally:
@@ -347,10 +644,27 @@ class BaseServer(object):
         If the server does not use a pool, then this merely stops accepting connections;
         any spawned greenlets that are handling requests continue running until
         they naturally complete.
+
+        If the server has :attr:`workers`, this asks each of them to
+        stop (with the same *timeout*) and waits for them to exit.
+        Workers still running a second after *timeout* are killed.
+
+        .. versionchanged:: 1.3a2
+           Stop the worker processes.
         """
-        self.close()
         if timeout is None:
             timeout = self.stop_timeout
+        if self._workers:
+            self._workers_exited.clear()
+            self._stop_workers(timeout)
+        self.close()
+        if self._workers and not self._workers_exited.wait(timeout + 1):
+            for pid in list(self._workers):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            self._workers_exited.wait(1)
         if self.pool:
             self.pool.join(timeout=timeout)
             self.pool.kill(block=True, timeout=1)
@@ -36,6 +36,7 @@ Classes
 from __future__ import absolute_import
 
 import functools
+import io
 import sys
 import os
 
@@ -84,10 +85,12 @@ class FileObjectThread(FileObjectBase):
     .. versionchanged:: 1.1b1
        The file object is closed using the threadpool. Note that whether or
        not this action is synchronous or asynchronous is not documented.
-
+    .. versionchanged:: 1.3a2
+       Added the *block_size* argument.
     """
 
-    def __init__(self, fobj, mode=None, bufsize=-1, close=True, threadpool=None, lock=True):
+    def __init__(self, fobj, mode=None, bufsize=-1, close=True, threadpool=None, lock=True,
+                 block_size=None):
         """
         :param fobj: The underlying file-like object to wrap, or an integer fileno
            that will be pass to :func:`os.fdopen` along with *mode* and *bufsize*.
@@ -99,6 +102,15 @@ class FileObjectThread(FileObjectBase):
            file operations with an external resource.
         :keyword bool close: If True (the default) then when this object is closed,
            the underlying object is closed as well.
+        :keyword int block_size: If given, buffer a binary file here, in
+           blocks of this many bytes, instead of going to the threadpool
+           for every call. While the data read so far is being used, the
+           next block is read in the background, so :meth:`readline`
+           and iterating over lines mostly don't have to wait. Writes
+           are collected and written a block at a time in the
+           background; an error writing one is raised by a later
+           ``write``, ``flush`` or ``close``. This is meant for regular
+           files read or written from start to end.
         """
         closefd = close
         self.threadpool = threadpool or get_hub().threadpool
@@ -118,6 +130,14 @@ class FileObjectThread(FileObjectBase):
                 fobj = os.fdopen(fobj)
             else:
                 fobj = os.fdopen(fobj, mode, bufsize)
+        if block_size is not None:
+            if block_size < 1:
+                raise ValueError('block_size must be positive: %r' % (block_size, ))
+            if isinstance(fobj, io.TextIOBase):
+                raise ValueError('block_size can only be used with a binary file')
+        self._block_size = block_size
+        self.__buffer = None
+        self.__buffer_holder = [None] # for _wrap_method
 
         self.__io_holder = [fobj] # signal for _wrap_method
         super(FileObjectThread, self).__init__(fobj, closefd)
@@ -125,6 +145,8 @@ class FileObjectThread(FileObjectBase):
     def _do_close(self, fobj, closefd):
         self.__io_holder[0] = None # for _wrap_method
         try:
+            if self.__buffer is not None:
+                self.__buffer.close()
             with self.lock:
                 self.threadpool.apply(fobj.flush)
         finally:
@@ -150,10 +172,29 @@ class FileObjectThread(FileObjectBase):
         if not hasattr(self, 'read1') and 'r' in getattr(self._io, 'mode', ''):
             self.read1 = self.read
         self.__io_holder[0] = self._io
+        if self._block_size is not None:
+            # The buffer's methods don't refer to us, for the same
+            # reason as _wrap_method.
+            self.__buffer = _ThreadBuffer(self._io, self.threadpool, self.lock, self._block_size)
+            self.__buffer_holder[0] = self.__buffer
+            for name in _ThreadBuffer.methods:
+                if hasattr(self._io, name) or (name in ('read1', 'readinto1')
+                                               and hasattr(self._io, 'read')):
+                    setattr(self, name, getattr(self.__buffer, name))
 
     def _extra_repr(self):
         return ' threadpool=%r' % (self.threadpool,)
 
+    def __getattr__(self, name):
+        value = super(FileObjectThread, self).__getattr__(name)
+        if (self.__dict__.get('_block_size') is not None
+                and callable(value) and not name.startswith('_')):
+            # Say, readall on a FileIO. It doesn't know about our
+            # buffer, so it has to be synced first, and like the
+            # delegated methods, it blocks.
+            value = self._wrap_method(value)
+        return value
+
     def __iter__(self):
         return self
 
@@ -168,6 +209,7 @@ class FileObjectThread(FileObjectBase):
         # NOTE: We are careful to avoid introducing a refcycle
         # within self. Our wrapper cannot refer to self.
         io_holder = self.__io_holder
+        buffer_holder = self.__buffer_holder
         lock = self.lock
         threadpool = self.threadpool
 
@@ -178,12 +220,305 @@ class FileObjectThread(FileObjectBase):
                 # because we want to save the expensive trip through
                 # the threadpool.
                 raise FileObjectClosed()
+            if buffer_holder[0] is not None:
+                buffer_holder[0].sync()
             with lock:
                 return threadpool.apply(method, args, kwargs)
 
         return thread_method
 
 
+def _capture(func, args):
+    # Like in FileObjectThread._do_close, keep the pool from
+    # reporting errors we raise ourself, possibly later.
+    try:
+        return True, func(*args)
+    except: # pylint:disable=bare-except
+        return False, sys.exc_info()
+
+
+class _ThreadBuffer(object):
+    # The buffers of a FileObjectThread with a block_size. At most one
+    # read or write of the underlying file is running in the
+    # threadpool in the background at a time, holding the lock.
+
+    methods = ('read', 'read1', 'readinto', 'readinto1', 'peek',
+               'readline', 'readlines',
+               'write', 'writelines', 'flush',
+               'seek', 'tell', 'truncate')
+
+    def __init__(self, fobj, threadpool, lock, block_size):
+        self._io = fobj
+        self._threadpool = threadpool
+        self._lock = lock
+        self._block_size = block_size
+        # Data read, and how much of it has been used.
+        self._rbuf = b''
+        self._rpos = 0
+        # The read of the next block, running in the background.
+        self._ahead = None
+        # Data written but not yet handed to the threadpool.
+        self._wbuf = []
+        self._wlen = 0
+        # The write running in the background.
+        self._behind = None
+
+    def _check(self):
+        if self._io is None:
+            raise FileObjectClosed()
+
+    def _apply(self, func, args=()):
+        with self._lock:
+            return self._threadpool.apply(func, args)
+
+    def _spawn(self, func, *args):
+        lock = self._lock
+        lock.acquire()
+        try:
+            result = self._threadpool.spawn(_capture, func, args)
+        except:
+            lock.release()
+            raise
+        result.rawlink(lambda _: lock.release())
+        return result
+
+    # Reading
+
+    def _before_read(self):
+        self._check()
+        self._flush_writes()
+
+    def _add(self, data):
+        if self._rpos < len(self._rbuf):
+            data = self._rbuf[self._rpos:] + data
+        self._rbuf = data
+        self._rpos = 0
+
+    def _wait_ahead(self):
+        # Add the block read in the background, if any, to the buffer
+        # and return it. The read stays pending until it's done, so
+        # that if waiting for it is interrupted (say, by a Timeout),
+        # the block isn't lost. Return None if there was none, or if
+        # another greenlet took it.
+        ahead = self._ahead
+        if ahead is None:
+            return None
+        ok, value = ahead.get()
+        if self._ahead is not ahead:
+            return None
+        self._ahead = None
+        if not ok:
+            reraise(*value)
+        self._add(value)
+        return value
+
+    def _fill(self):
+        # Add the next block to the buffer, and start reading the one
+        # after. Return false at the end of the file.
+        if self._ahead is None:
+            self._ahead = self._spawn(self._io.read, self._block_size)
+        data = self._wait_ahead()
+        if data is None:
+            return True
+        if not data:
+            return False
+        self._ahead = self._spawn(self._io.read, self._block_size)
+        return True
+
+    def _consume(self, size):
+        data = self._rbuf[self._rpos:self._rpos + size]
+        self._rpos += len(data)
+        return data
+
+    def _unread(self):
+        # Throw away what was read but not used, and return how much
+        # that was.
+        self._wait_ahead()
+        unread = len(self._rbuf) - self._rpos
+        self._rbuf = b''
+        self._rpos = 0
+        return unread
+
+    def read(self, size=-1):
+        self._before_read()
+        if size is None or size < 0:
+            self._wait_ahead()
+            data = self._consume(len(self._rbuf))
+            return data + self._apply(self._io.read)
+        while len(self._rbuf) - self._rpos < size:
+            if not self._fill():
+                break
+        return self._consume(size)
+
+    def read1(self, size=-1):
+        self._before_read()
+        if self._rpos == len(self._rbuf):
+            self._fill()
+        if size is None or size < 0:
+            size = len(self._rbuf)
+        return self._consume(size)
+
+    def _readinto(self, read, b):
+        view = memoryview(b)
+        if view.itemsize != 1:
+            view = view.cast('B')
+        data = read(len(view))
+        view[:len(data)] = data
+        return len(data)
+
+    def readinto(self, b):
+        return self._readinto(self.read, b)
+
+    def readinto1(self, b):
+        return self._readinto(self.read1, b)
+
+    def peek(self, size=0): # pylint:disable=unused-argument
+        # Like io.BufferedReader.peek, this returns what's buffered,
+        # whatever the size.
+        self._before_read()
+        if self._rpos == len(self._rbuf):
+            self._fill()
+        return self._rbuf[self._rpos:]
+
+    def readline(self, size=-1):
+        if size is None:
+            size = -1
+        rbuf, rpos = self._rbuf, self._rpos
+        i = rbuf.find(b'\n', rpos)
+        if i >= 0 and (size < 0 or i < rpos + size) and self._io is not None:
+            # The whole line is here (so nothing was written since).
+            self._rpos = i + 1
+            return rbuf[rpos:i + 1]
+        self._before_read()
+        searched = 0
+        while True:
+            rbuf, rpos = self._rbuf, self._rpos
+            i = rbuf.find(b'\n', rpos + searched)
+            if i >= 0:
+                length = i + 1 - rpos
+                break
+            length = len(rbuf) - rpos
+            if 0 <= size <= length:
+                break
+            searched = length
+            if not self._fill():
+                break
+        if 0 <= size < length:
+            length = size
+        return self._consume(length)
+
+    def readlines(self, hint=-1):
+        if hint is None:
+            hint = -1
+        lines = []
+        total = 0
+        while True:
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line)
+            total += len(line)
+            if 0 < hint <= total:
+                break
+        return lines
+
+    # Writing
+
+    def _wait_behind(self):
+        # Like _wait_ahead, if this is interrupted, the write stays
+        # pending, and so does its error.
+        behind = self._behind
+        if behind is not None:
+            ok, value = behind.get()
+            if self._behind is behind:
+                self._behind = None
+                if not ok:
+                    reraise(*value)
+
+    def _write_behind(self):
+        self._wait_behind()
+        data = b''.join(self._wbuf)
+        del self._wbuf[:]
+        self._wlen = 0
+        self._behind = self._spawn(self._io.write, data)
+
+    def _flush_writes(self):
+        if self._wbuf:
+            self._write_behind()
+        self._wait_behind()
+
+    def write(self, data):
+        self._check()
+        if self._ahead is not None or self._rpos < len(self._rbuf):
+            unread = self._unread()
+            if unread:
+                self._apply(self._io.seek, (-unread, 1))
+        if isinstance(data, (bytearray, memoryview)):
+            # The caller may change it before we write it.
+            data = memoryview(data).tobytes()
+        self._wbuf.append(data)
+        self._wlen += len(data)
+        if self._wlen >= self._block_size:
+            self._write_behind()
+        return len(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self._check()
+        self._flush_writes()
+        return self._apply(self._io.flush)
+
+    # Positioning
+
+    def seek(self, offset, whence=0):
+        self._check()
+        self._flush_writes()
+        unread = self._unread()
+        if whence == 1:
+            offset -= unread
+        return self._apply(self._io.seek, (offset, whence))
+
+    def tell(self):
+        self._check()
+        self._flush_writes()
+        self._wait_ahead()
+        return self._apply(self._io.tell) - (len(self._rbuf) - self._rpos)
+
+    def sync(self):
+        # Before the file is used other than through us: write what's
+        # waiting to be written, and put the file's position back
+        # where ours is, throwing away what was read ahead.
+        self._check()
+        self._flush_writes()
+        unread = self._unread()
+        if unread:
+            self._apply(self._io.seek, (-unread, 1))
+
+    def truncate(self, size=None):
+        self.sync()
+        if size is None:
+            return self._apply(self._io.truncate)
+        return self._apply(self._io.truncate, (size,))
+
+    def close(self):
+        if self._io is None:
+            return
+        try:
+            self._flush_writes()
+        finally:
+            ahead, self._ahead = self._ahead, None
+            if ahead is not None:
+                # What it read, or failed to read, doesn't matter now.
+                ahead.wait()
+            self._io = None
+            self._rbuf = b''
+            self._rpos = 0
+            del self._wbuf[:]
+
+
 try:
     FileObject = FileObjectPosix
 except NameError:
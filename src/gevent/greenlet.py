@@ -95,6 +95,10 @@ class Greenlet(greenlet):
     value = None
     _exc_info = ()
     _notifier = None
+    # The first link. Most greenlets only ever have one link at a time
+    # (from join() or a Pool), which we keep here without creating
+    # the _links deque; later links go in the deque.
+    _link = None
 
     #: An event, such as a timer or a callback that fires. It is established in
     #: start() and start_later() as those two objects, respectively.
@@ -153,7 +157,7 @@ class Greenlet(greenlet):
         return deque()
 
     def _has_links(self):
-        return '_links' in self.__dict__ and self._links
+        return self._link is not None or ('_links' in self.__dict__ and self._links)
 
     def _raise_exception(self):
         reraise(*self.exc_info)
@@ -182,7 +186,17 @@ class Greenlet(greenlet):
     else:
         @property
         def dead(self):
-            return self.__start_cancelled_by_kill or self.__started_but_aborted or greenlet.dead.__get__(self)
+            # Like __start_cancelled_by_kill or __started_but_aborted
+            # or greenlet.dead, but cheap to check for a greenlet that
+            # is running, which is when rawlink() is usually called.
+            if greenlet.dead.__get__(self):
+                return True
+            start_event = self._start_event
+            if start_event is None or start_event is _start_completed_event:
+                return False
+            if start_event is _cancelled_start_event:
+                return True
+            return not (start_event.pending or getattr(start_event, 'active', False))
 
     @property
     def __never_started_or_killed(self):
@@ -511,7 +525,7 @@ class Greenlet(greenlet):
         self._exc_info = (None, None, None)
         self.value = result
         if self._has_links() and not self._notifier:
-            self._notifier = self.parent.loop.run_callback(self._notify_links)
+            self._schedule_notify()
 
     def _report_error(self, exc_info):
         if isinstance(exc_info[1], GreenletExit):
@@ -521,7 +535,7 @@ class Greenlet(greenlet):
         self._exc_info = exc_info[0], exc_info[1], dump_traceback(exc_info[2])
 
         if self._has_links() and not self._notifier:
-            self._notifier = self.parent.loop.run_callback(self._notify_links)
+            self._schedule_notify()
 
         try:
             self.parent.handle_error(self, *exc_info)
@@ -564,9 +578,12 @@ class Greenlet(greenlet):
         """
         if not callable(callback):
             raise TypeError('Expected callable: %r' % (callback, ))
-        self._links.append(callback) # pylint:disable=no-member
-        if self.ready() and self._links and not self._notifier:
-            self._notifier = self.parent.loop.run_callback(self._notify_links)
+        if self._link is None and not ('_links' in self.__dict__ and self._links):
+            self._link = callback
+        else:
+            self._links.append(callback) # pylint:disable=no-member
+        if not self._notifier and self.ready():
+            self._schedule_notify()
 
     def link(self, callback, SpawnedLink=SpawnedLink):
         """
@@ -584,10 +601,14 @@ class Greenlet(greenlet):
 
     def unlink(self, callback):
         """Remove the callback set by :meth:`link` or :meth:`rawlink`"""
-        try:
-            self._links.remove(callback) # pylint:disable=no-member
-        except ValueError:
-            pass
+        if self._link is not None and self._link == callback:
+            self._link = None
+            return
+        if '_links' in self.__dict__:
+            try:
+                self._links.remove(callback) # pylint:disable=no-member
+            except ValueError:
+                pass
 
     def link_value(self, callback, SpawnedLink=SuccessSpawnedLink):
         """
@@ -602,15 +623,56 @@ class Greenlet(greenlet):
         # pylint:disable=redefined-outer-name
         self.link(callback, SpawnedLink=SpawnedLink)
 
+    def _schedule_notify(self):
+        hub = self.parent
+        notifier = hub._greenlet_link_notifier
+        if notifier is None:
+            notifier = hub._greenlet_link_notifier = _LinkNotifier(hub.loop)
+        self._notifier = notifier
+        notifier.add(self)
+
     def _notify_links(self):
-        while self._links:
-            link = self._links.popleft() # pylint:disable=no-member
+        while 1:
+            link = self._link
+            if link is not None:
+                self._link = None
+            elif '_links' in self.__dict__ and self._links:
+                link = self._links.popleft() # pylint:disable=no-member
+            else:
+                break
             try:
                 link(self)
             except: # pylint:disable=bare-except
                 self.parent.handle_error((link, self), *sys.exc_info())
 
 
+class _LinkNotifier(object):
+    # Notifies the links of all the greenlets that finish in one
+    # iteration of a loop from a single callback, instead of one
+    # callback for each greenlet.
+    __slots__ = ('loop', 'greenlets', 'callback')
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.greenlets = []
+        self.callback = None
+
+    def add(self, glet):
+        self.greenlets.append(glet)
+        if self.callback is None:
+            self.callback = self.loop.run_callback(self.run)
+
+    def run(self):
+        greenlets = self.greenlets
+        self.greenlets = []
+        self.callback = None
+        for glet in greenlets:
+            # If it gets more links after this, it needs notifying
+            # again.
+            glet._notifier = None
+            glet._notify_links()
+
+
 class _dummy_event(object):
     pending = False
     active = False
@@ -17,6 +17,7 @@ __all__ = [
     'getcurrent',
     'GreenletExit',
     'spawn_raw',
+    'spawn_pooled',
     'sleep',
     'kill',
     'signal',
@@ -138,6 +139,82 @@ def spawn_raw(function, *args, **kwargs):
     return g
 
 
+def spawn_pooled(function, *args, **kwargs):
+    """
+    Schedule ``function(*args, **kwargs)`` to run in a raw greenlet,
+    reusing an idle one left over from a previous call if there is
+    one.
+
+    This is an optimization for many short-lived tasks, such as the
+    handlers of a server (this can be passed as the *spawn* argument
+    of :class:`gevent.server.StreamServer`): it avoids creating a new
+    greenlet (and its stack) for each task. Unlike :func:`spawn_raw`,
+    this doesn't return the greenlet, because it may go on to run
+    other tasks; for the same reason, tasks must not rely on the
+    identity of the current greenlet. The :class:`gevent.local.local`
+    values (and other attributes) of the greenlet are cleared before
+    it runs another task. Exceptions raised by *function* are
+    reported to the hub's
+    :meth:`~Hub.handle_error`. Up to :attr:`Hub.max_pooled_greenlets`
+    idle greenlets are kept.
+
+    .. versionadded:: 1.3a2
+    """
+    if not callable(function):
+        raise TypeError("function must be callable")
+    hub = get_hub()
+    parked = hub._pooled_greenlets
+    g = parked.pop() if parked else RawGreenlet(_run_pooled, hub)
+    hub.loop.run_callback(g.switch, _pooled_task, function, args, kwargs)
+
+# Marks the value switched into a pooled greenlet as a task, and not
+# something left over from its previous task.
+_pooled_task = object()
+
+def _run_pooled(_, function, args, kwargs):
+    from gevent.local import _clear_greenlet_locals
+    hub = get_hub()
+    parked = hub._pooled_greenlets
+    max_parked = hub.max_pooled_greenlets
+    current = getcurrent()
+    # Switch straight back to the loop: nothing we run here has a
+    # switch_out method for Hub.switch to call.
+    hub_switch = RawGreenlet.switch
+    while 1:
+        try:
+            if kwargs:
+                function(*args, **kwargs)
+            else:
+                function(*args)
+        except GreenletExit:
+            # Killed; don't reuse it.
+            return
+        except: # pylint:disable=bare-except
+            hub.handle_error(function, *sys.exc_info())
+        function = args = kwargs = None
+        if current.__dict__:
+            _clear_greenlet_locals(current)
+        if len(parked) >= max_parked:
+            return
+        parked.append(current)
+        while 1:
+            try:
+                task = hub_switch(hub)
+            except GreenletExit:
+                # Killed while idle.
+                if current in parked:
+                    parked.remove(current)
+                raise
+            except: # pylint:disable=bare-except
+                # Thrown in by something the previous task left
+                # behind, such as a Timeout it didn't cancel.
+                continue
+            if isinstance(task, tuple) and len(task) == 4 and task[0] is _pooled_task:
+                break
+            # Likewise, a switch meant for the previous task.
+        _, function, args, kwargs = task
+
+
 def sleep(seconds=0, ref=True):
     """
     Put the current greenlet to sleep for at least *seconds*.
@@ -511,6 +588,11 @@ class Hub(RawGreenlet):
     backend = config(None, 'GEVENT_BACKEND')
     threadpool_size = 10
 
+    #: The most idle greenlets to keep for :func:`spawn_pooled`.
+    #:
+    #: .. versionadded:: 1.3a2
+    max_pooled_greenlets = 100
+
     # using pprint.pformat can override custom __repr__ methods on dict/list
     # subclasses, which can be a security concern
     format_context = 'pprint.saferepr'
@@ -536,6 +618,13 @@ class Hub(RawGreenlet):
             self.loop = loop_class(flags=loop, default=default)
         self._resolver = None
         self._threadpool = None
+        # Idle greenlets for spawn_pooled
+        self._pooled_greenlets = []
+        # Created when first needed: the gevent.greenlet._LinkNotifier
+        # for the greenlets of this hub, and the
+        # gevent.threadpool._Completions for its ThreadResults.
+        self._greenlet_link_notifier = None
+        self._thread_result_completions = None
         self.format_context = _import(self.format_context)
 
     def __repr__(self):
@@ -672,6 +761,75 @@ class Hub(RawGreenlet):
         finally:
             watcher.stop()
 
+    def wait_any(self, watchers, timeout=None, pass_events=False):
+        """
+        Wait until at least one of the *watchers* (none of which may be
+        started) is ready, or until *timeout* seconds have elapsed.
+
+        This is like calling :meth:`wait` for each watcher
+        simultaneously, except that all the watchers share a single
+        waiter and the current greenlet is only switched to once,
+        after every watcher that became ready in the same event loop
+        iteration has had a chance to report.
+
+        :keyword bool pass_events: If true, the *watchers* must all
+            be io watchers; each is started with ``pass_events=True``
+            and the result contains ``(watcher, events)`` pairs.
+        :return: A list of the watchers that became ready, in the order
+            they became ready. This is empty if the *timeout* expired first.
+            The watchers are stopped, but not closed, when this returns.
+
+        .. versionadded:: 1.3a2
+        """
+        return self._wait_watchers(watchers, timeout, pass_events, False)
+
+    def wait_all(self, watchers, timeout=None, pass_events=False):
+        """
+        Wait until all of the *watchers* (none of which may be
+        started) are ready, or until *timeout* seconds have elapsed.
+
+        Each watcher is stopped as soon as it becomes ready, so it is
+        reported only once. The arguments and return value are as for
+        :meth:`wait_any`; if the *timeout* expires first, the result
+        contains only the watchers that were ready by then.
+
+        .. versionadded:: 1.3a2
+        """
+        return self._wait_watchers(watchers, timeout, pass_events, True)
+
+    def _wait_watchers(self, watchers, timeout, pass_events, stop_ready):
+        watchers = list(watchers)
+        if not watchers and stop_ready:
+            return []
+        waiter = _BatchWaiter(self, len(watchers) if stop_ready else 1)
+
+        if pass_events:
+            callback = waiter.add_events_and_stop if stop_ready else waiter.add_events
+        else:
+            callback = waiter.add_and_stop if stop_ready else waiter.add
+
+        timer = None
+        try:
+            for watcher in watchers:
+                if pass_events:
+                    watcher.start(callback, watcher, pass_events=True)
+                else:
+                    watcher.start(callback, watcher)
+            if timeout is not None:
+                timer = self.loop.timer(timeout)
+                timer.start(waiter.switch, waiter)
+            result = waiter.get()
+            if result is not waiter:
+                raise InvalidSwitchError('Invalid switch into %s: %r (expected %r)'
+                                         % (getcurrent(), result, waiter))
+            return waiter.ready
+        finally:
+            waiter.cancel()
+            if timer is not None:
+                timer.close()
+            for watcher in watchers:
+                watcher.stop()
+
     def cancel_wait(self, watcher, error, close_watcher=False):
         """
         Cancel an in-progress call to :meth:`wait` by throwing the given *error*
@@ -771,6 +929,12 @@ class Hub(RawGreenlet):
         if self._threadpool is not None:
             self._threadpool.kill()
             del self._threadpool
+        del self._pooled_greenlets[:]
+        self._greenlet_link_notifier = None
+        completions = self._thread_result_completions
+        self._thread_result_completions = None
+        if completions is not None:
+            completions.close()
         if destroy_loop is None:
             destroy_loop = not self.loop.default
         if destroy_loop:
@@ -981,6 +1145,48 @@ class _MultipleWaiter(Waiter):
         return self._values.pop(0)
 
 
+class _BatchWaiter(Waiter):
+    """
+    An internal extension of Waiter that many sources (watchers or
+    objects implementing the wait protocol) can report to at once.
+
+    Reporting only records the source in :attr:`ready`. Once *count*
+    sources have reported, a single loop callback switches to the
+    waiting greenlet, so everything else that becomes ready in the
+    same loop iteration is collected too.
+
+    This does not handle exceptions or throw methods.
+    """
+    __slots__ = ['ready', 'count', '_wakeup']
+
+    def __init__(self, hub, count):
+        Waiter.__init__(self, hub)
+        self.ready = []
+        self.count = count
+        self._wakeup = None
+
+    def add(self, source):
+        ready = self.ready
+        ready.append(source)
+        if self._wakeup is None and len(ready) >= self.count:
+            self._wakeup = self.hub.loop.run_callback(self.switch, self)
+
+    def add_and_stop(self, watcher):
+        watcher.stop()
+        self.add(watcher)
+
+    def add_events(self, events, watcher):
+        self.add((watcher, events))
+
+    def add_events_and_stop(self, events, watcher):
+        watcher.stop()
+        self.add((watcher, events))
+
+    def cancel(self):
+        if self._wakeup is not None:
+            self._wakeup.stop()
+
+
 def iwait(objects, timeout=None, count=None):
     """
     Iteratively yield *objects* as they are ready, until all (or *count*) are ready
@@ -1074,7 +1280,39 @@ def wait(objects=None, timeout=None, count=None):
     """
     if objects is None:
         return get_hub().join(timeout=timeout)
-    return list(iwait(objects, timeout, count))
+
+    count = len(objects) if count is None else min(count, len(objects))
+    if not count:
+        return []
+
+    # Unlike iwait(), we don't need to resume the caller for each
+    # object, so they can all share one waiter that switches just once.
+    hub = get_hub()
+    waiter = _BatchWaiter(hub, count)
+    add = waiter.add
+    timer = None
+
+    try:
+        for obj in objects:
+            obj.rawlink(add)
+
+        if timeout is not None:
+            timer = hub.loop.timer(timeout, priority=-1)
+            timer.start(waiter.switch, waiter)
+
+        waiter.get()
+        return waiter.ready[:count]
+    finally:
+        waiter.cancel()
+        if timer is not None:
+            timer.close()
+        for aobj in objects:
+            unlink = getattr(aobj, 'unlink', None)
+            if unlink:
+                try:
+                    unlink(add)
+                except: # pylint:disable=bare-except
+                    traceback.print_exc()
 
 
 class linkproxy(object):
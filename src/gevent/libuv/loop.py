@@ -463,7 +463,10 @@ class loop(AbstractLoop):
             io_watchers[fd] = io_watcher
             io_watcher._no_more_watchers = lambda: delitem(io_watchers, fd)
 
-        return io_watcher.multiplex(events)
+        watcher = io_watcher.multiplex(events)
+        if not ref:
+            watcher.ref = False
+        return watcher
 
     def timer(self, after, repeat=0.0, ref=True, priority=None):
         if after <= 0 and repeat <= 0:
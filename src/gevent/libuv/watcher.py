@@ -297,7 +297,7 @@ class io(_base.IoMixin, watcher):
         callback = None
         args = ()
         pass_events = False
-        ref = True
+        _ref = True
 
         def __init__(self, events, watcher):
             self._events = events
@@ -309,9 +309,28 @@ class io(_base.IoMixin, watcher):
             # calls to close(); see _multiplex_closed.
             self._watcher_ref = watcher
 
+        def _set_events(self, events):
+            self._events = events
+            watcher = self._watcher_ref
+            if watcher is not None:
+                # The native watcher polls for the union of what
+                # all its multiplexed watchers want.
+                watcher._calc_and_update_events()
+
         events = property(
             lambda self: self._events,
-            _base.not_while_active(lambda self, nv: setattr(self, '_events', nv)))
+            _base.not_while_active(_set_events))
+
+        def _get_ref(self):
+            return self._ref
+
+        def _set_ref(self, value):
+            self._ref = value
+            watcher = self._watcher_ref
+            if watcher is not None:
+                watcher._calc_and_update_ref()
+
+        ref = property(_get_ref, _set_ref)
 
         def start(self, callback, *args, **kwargs):
             _dbg("Starting IO multiplex watcher for", self.fd,
@@ -322,8 +341,10 @@ class io(_base.IoMixin, watcher):
             self.args = args
 
             watcher = self._watcher_ref
-            if watcher is not None and not watcher.active:
-                watcher._io_start()
+            if watcher is not None:
+                if not watcher.active:
+                    watcher._io_start()
+                watcher._calc_and_update_ref()
 
         def stop(self):
             _dbg("Stopping IO multiplex watcher for", self.fd,
@@ -335,6 +356,7 @@ class io(_base.IoMixin, watcher):
             watcher = self._watcher_ref
             if watcher is not None:
                 watcher._io_maybe_stop()
+                watcher._calc_and_update_ref()
 
         def close(self):
             if self._watcher_ref is not None:
@@ -375,6 +397,19 @@ class io(_base.IoMixin, watcher):
             events |= watcher.events
         self._set_events(events)
 
+    def _calc_and_update_ref(self):
+        # The native watcher keeps the loop running if any of the
+        # started multiplexed watchers wants to.
+        ref = True
+        for watcher in self._multiplex_watchers:
+            if watcher.callback is not None:
+                if watcher.ref:
+                    ref = True
+                    break
+                ref = False
+        if self._watcher is not None and self.ref != ref:
+            self.ref = ref
+
 
     def multiplex(self, events):
         watcher = self._multiplexwatcher(events, self)
@@ -405,6 +440,7 @@ class io(_base.IoMixin, watcher):
             self.close()
         else:
             self._calc_and_update_events()
+            self._calc_and_update_ref()
             _dbg("IO Watcher", self, "has remaining multiplex:",
                  self._multiplex_watchers)
 
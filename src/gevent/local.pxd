@@ -32,6 +32,7 @@ cdef class _localimpl:
 
 cdef dict _localimpl_create_dict(_localimpl self)
 cdef inline dict _localimpl_get_dict(_localimpl self)
+cdef _localimpl_forget(_localimpl self, idt)
 
 
 cdef class local:
@@ -439,6 +439,24 @@ def _local__copy_dict_from(self, impl, duplicate):
     new_impl.dicts[currentId] = (tpl[0], duplicate)
 
 
+def _localimpl_forget(self, idt):
+    self.dicts.pop(idt, None)
+
+def _clear_greenlet_locals(greenlet):
+    """
+    Forget the values of every local in *greenlet* (and any other
+    attribute set on it), as if it had ended. Used by
+    :func:`gevent.spawn_pooled` before a greenlet runs another task.
+    """
+    dct = greenlet.__dict__
+    idt = id(greenlet)
+    for key, value in list(dct.items()):
+        if key.startswith('_threading_local._localimpl.'):
+            impl = value()
+            if impl is not None:
+                _localimpl_forget(impl, idt)
+    dct.clear()
+
 
 # Cython doesn't let us use __new__, it requires
 # __cinit__. But we need __new__ if we're not compiled
@@ -494,26 +494,40 @@ def patch_select(aggressive=True):
     Replace :func:`select.select` with :func:`gevent.select.select`
     and :func:`select.poll` with :class:`gevent.select.poll` (where available).
 
-    If ``aggressive`` is true (the default), also remove other
-    blocking functions from :mod:`select` and (on Python 3.4 and
-    above) :mod:`selectors`:
+    Where available, :func:`select.epoll` is replaced with
+    :class:`gevent.select.epoll`, and (on Python 3.4 and above)
+    :class:`selectors.EpollSelector` uses it.
 
-    - :func:`select.epoll`
+    If ``aggressive`` is true (the default), also replace
+    :class:`selectors.DefaultSelector` with
+    :class:`gevent.selectors.GeventSelector` (on Python 3.4 and
+    above), and remove other blocking functions from :mod:`select`
+    and :mod:`selectors`:
+
+    - :func:`select.epoll` (only if gevent does not provide it)
     - :func:`select.kqueue`
     - :func:`select.kevent`
     - :func:`select.devpoll` (Python 3.5+)
-    - :class:`selectors.EpollSelector`
+    - :class:`selectors.EpollSelector` (only if gevent does not provide epoll)
     - :class:`selectors.KqueueSelector`
     - :class:`selectors.DevpollSelector` (Python 3.5+)
+
+    .. versionchanged:: 1.3a2
+       Patch :func:`select.epoll` instead of removing it.
+    .. versionchanged:: 1.3a2
+       Patch :class:`selectors.DefaultSelector` if ``aggressive`` is true.
     """
 
     patch_module('select')
+    gevent_select = __import__('gevent.select').select
+    has_epoll = 'epoll' in gevent_select.__implements__
     if aggressive:
         select = __import__('select')
         # since these are blocking we're removing them here. This makes some other
         # modules (e.g. asyncore)  non-blocking, as they use select that we provide
         # when none of these are available.
-        remove_item(select, 'epoll')
+        if not has_epoll:
+            remove_item(select, 'epoll')
         remove_item(select, 'kqueue')
         remove_item(select, 'kevent')
         remove_item(select, 'devpoll')
@@ -544,15 +558,20 @@ def patch_select(aggressive=True):
         # so we need to clean that up.
         if hasattr(selectors, 'PollSelector') and hasattr(selectors.PollSelector, '_selector_cls'):
             selectors.PollSelector._selector_cls = select.poll
+        if has_epoll and hasattr(selectors, 'EpollSelector') \
+           and hasattr(selectors.EpollSelector, '_selector_cls'):
+            selectors.EpollSelector._selector_cls = select.epoll
 
         if aggressive:
             # If `selectors` had already been imported before we removed
             # select.epoll|kqueue|devpoll, these may have been defined in terms
             # of those functions. They'll fail at runtime.
-            remove_item(selectors, 'EpollSelector')
+            if not has_epoll:
+                remove_item(selectors, 'EpollSelector')
             remove_item(selectors, 'KqueueSelector')
             remove_item(selectors, 'DevpollSelector')
-            selectors.DefaultSelector = selectors.SelectSelector
+
+            patch_module('selectors')
 
 
 def patch_subprocess():
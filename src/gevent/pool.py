@@ -12,6 +12,9 @@ The :class:`Pool` class, which is a subclass of :class:`Group`,
 provides a way to limit concurrency: its :meth:`spawn <Pool.spawn>`
 method blocks if the number of greenlets in the pool has already
 reached the limit, until there is a free slot.
+
+The :class:`TaskGroup` class, another subclass of :class:`Group`,
+ties the lifetime of the greenlets it spawns to a ``with`` block.
 """
 
 from bisect import insort_right
@@ -21,14 +24,15 @@ except ImportError:
     # Python 3
     izip = zip
 
-from gevent.hub import GreenletExit, getcurrent, kill as _kill
-from gevent.greenlet import joinall, Greenlet
+from gevent.hub import GreenletExit, getcurrent, get_hub, kill as _kill
+from gevent.greenlet import joinall, killall, Greenlet
+from gevent.greenlet import _killall
 from gevent.queue import Full as QueueFull
 from gevent.timeout import Timeout
 from gevent.event import Event
 from gevent.lock import Semaphore, DummySemaphore
 
-__all__ = ['Group', 'Pool', 'PoolFull']
+__all__ = ['Group', 'Pool', 'PoolFull', 'TaskGroup']
 
 
 class IMapUnordered(Greenlet):
@@ -43,14 +47,17 @@ class IMapUnordered(Greenlet):
         An iterator that.
 
         :keyword int maxsize: If given and not-None, specifies the maximum number of
-            finished results that will be allowed to accumulated awaiting the reader;
-            more than that number of results will cause map function greenlets to begin
-            to block. This is most useful is there is a great disparity in the speed of
+            results, finished or still being computed, that will be allowed to accumulate
+            awaiting the reader; no more items are taken from *iterable* until the
+            reader catches up. This is most useful is there is a great disparity in the speed of
             the mapping code and the consumer and the results consume a great deal of resources.
             Using a bound is more computationally expensive than not using a bound.
 
         .. versionchanged:: 1.1b3
             Added the *maxsize* parameter.
+        .. versionchanged:: 1.3a2
+            *maxsize* is a strict bound, and *iterable* is only advanced
+            when there is room for another result.
         """
         from gevent.queue import Queue
         Greenlet.__init__(self)
@@ -77,6 +84,11 @@ class IMapUnordered(Greenlet):
             # redundant, and that lets us avoid having to use self.link() instead
             # of self.rawlink() to avoid having blocking methods called in the
             # hub greenlet.
+            #
+            # The semaphore counts the results that have been started
+            # but not yet taken by the reader, and we acquire it before
+            # taking the next item from the iterable, so a slow reader
+            # stops us reading the iterable too.
             factory = Semaphore
         else:
             factory = DummySemaphore
@@ -99,8 +111,8 @@ class IMapUnordered(Greenlet):
         return self
 
     def next(self):
-        self._result_semaphore.release()
         value = self._inext()
+        self._result_semaphore.release()
         if isinstance(value, Failure):
             raise value.exc
         return value
@@ -110,7 +122,6 @@ class IMapUnordered(Greenlet):
         return self.queue.get()
 
     def _ispawn(self, func, item):
-        self._result_semaphore.acquire()
         self.count += 1
         g = self.spawn(func, item) if not self._zipped else self.spawn(func, *item)
         g.rawlink(self._on_result)
@@ -119,7 +130,14 @@ class IMapUnordered(Greenlet):
     def _run(self): # pylint:disable=method-hidden
         try:
             func = self.func
-            for item in self.iterable:
+            iterator = iter(self.iterable)
+            acquire = self._result_semaphore.acquire
+            while True:
+                acquire()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
                 self._ispawn(func, item)
         finally:
             self.__dict__.pop('spawn', None)
@@ -371,9 +389,11 @@ class GroupMappingMixin(object):
         in parallel.
 
         :keyword int maxsize: If given and not-None, specifies the maximum number of
-            finished results that will be allowed to accumulate awaiting the reader;
-            more than that number of results will cause map function greenlets to begin
-            to block. This is most useful if there is a great disparity in the speed of
+            results, finished or still running, that will be allowed to accumulate
+            awaiting the reader; once there are that many, no more items are taken
+            from *iterables* (and no more tasks are started) until the reader takes
+            a result. This keeps memory use flat even for very long (or infinite)
+            *iterables*, and is most useful if there is a great disparity in the speed of
             the mapping code and the consumer and the results consume a great deal of resources.
 
             .. note:: This is separate from any bound on the number of active parallel
@@ -393,6 +413,9 @@ class GroupMappingMixin(object):
             Added the *maxsize* keyword parameter.
         .. versionchanged:: 1.1a1
             Accept multiple *iterables* to iterate in parallel.
+        .. versionchanged:: 1.3a2
+            *maxsize* is a strict bound, and also limits how far ahead
+            of the reader *iterables* are consumed.
         """
         return self.__imap(IMap, func, *iterables, **kwargs)
 
@@ -637,6 +660,84 @@ class Group(GroupMappingMixin):
         return self.full()
 
 
+class TaskGroup(Group):
+    """
+    A group whose greenlets live no longer than the ``with`` block
+    that uses it::
+
+        with TaskGroup(timeout=5) as group:
+            for host in hosts:
+                group.spawn(fetch, host)
+        # All the greenlets are finished here.
+
+    As soon as one of the greenlets in the group fails (raises an
+    exception other than :exc:`GreenletExit`), all the others are
+    killed at once, as are any greenlets added to the group after
+    that. The greenlet running the ``with`` block isn't interrupted,
+    but when it reaches the end of the block, the exception of the
+    greenlet that failed first is raised there.
+
+    At the end of the block, the group waits for its greenlets to
+    finish. If the block itself raises an exception, the greenlets
+    still running are killed instead, and the exception propagates.
+
+    :keyword float timeout: If given, a deadline (in seconds from
+        entering the ``with`` block) for the block and all the
+        greenlets of the group. When it expires, a
+        :class:`gevent.Timeout` is raised in the greenlet running the
+        block (wherever it is, including waiting at the end of the
+        block), the greenlets still running are killed, and the
+        timeout propagates.
+
+    .. versionadded:: 1.3a2
+    """
+
+    def __init__(self, timeout=None):
+        Group.__init__(self)
+        self.timeout = timeout
+        #: The first greenlet of the group that failed, if any.
+        self.failed = None
+        self._timer = None
+
+    def __enter__(self):
+        self._timer = Timeout._start_new_or_dummy(self.timeout)
+        return self
+
+    def __exit__(self, t, v, tb):
+        try:
+            try:
+                if t is None:
+                    self.join()
+            finally:
+                # If the block raised or the deadline passed while we were
+                # joining, reclaim everything that is left at once.
+                if self.greenlets:
+                    killall(list(self.greenlets))
+                    self.join()
+        finally:
+            self._timer.cancel()
+        if t is None and self.failed is not None:
+            self.failed._raise_exception()
+
+    def add(self, greenlet):
+        Group.add(self, greenlet)
+        if self.failed is not None:
+            greenlet.kill(block=False)
+
+    def _discard(self, greenlet):
+        Group._discard(self, greenlet)
+        if self.failed is None and getattr(greenlet, 'exception', None) is not None:
+            self.failed = greenlet
+            self._cancel()
+
+    def _cancel(self):
+        greenlets = [g for g in self.greenlets if g not in self.dying]
+        if greenlets:
+            self.dying.update(greenlets)
+            # Throw into all of them from one callback in the hub.
+            get_hub().loop.run_callback(_killall, greenlets, GreenletExit)
+
+
 class Failure(object):
     __slots__ = ['exc', '_raise_exception']
 
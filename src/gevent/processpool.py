@@ -0,0 +1,428 @@
+# Copyright (c) 2018 gevent contributors. See LICENSE for details.
+"""
+A pool of worker processes, for CPU-bound Python code that would
+otherwise be serialized by the GIL.
+
+The workers are forked when the pool is created, and they exchange
+tasks and results with it over pipes. The hub watches the pool's end
+of the pipes, so waiting for a result blocks only the greenlet that
+waits; no threads are involved.
+
+Functions, arguments and results are sent with :mod:`pickle`, so
+they must be picklable (functions are pickled by name). With the
+pickle protocol 5 of Python 3.8 and later, objects that support it,
+such as :class:`pickle.PickleBuffer` and NumPy arrays, are sent out
+of band, without being copied into the pickle.
+
+The functions run in a forked copy of the process that doesn't run
+the event loop; they should not expect to cooperate with gevent.
+
+Availability: POSIX.
+
+.. versionadded:: 1.3a2
+"""
+from __future__ import absolute_import
+
+import os
+import struct
+import sys
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from gevent._compat import xrange
+from gevent._tblib import dump_traceback
+from gevent._tblib import load_traceback
+from gevent.event import AsyncResult
+from gevent.event import Event
+from gevent.hub import get_hub
+from gevent.hub import spawn_pooled
+from gevent.lock import Semaphore
+from gevent.os import fork_and_watch
+from gevent.os import make_nonblocking
+from gevent.os import nb_read
+from gevent.os import nb_write
+from gevent.pool import GroupMappingMixin
+
+__all__ = [
+    'ProcessPool',
+]
+
+_os_read = os.read
+_os_write = os.write
+
+# A message is a header giving the size of the pickle and the number
+# of out-of-band buffers, then the pickle, then each buffer preceded
+# by its size.
+_HEADER = struct.Struct('!QI')
+_SIZE = struct.Struct('!Q')
+# Read no more than this at a time; os.read allocates what it's asked
+# for.
+_MAX_READ = 1 << 20
+# Pickles smaller than this are sent in the same write as the header.
+_SMALL = 1 << 16
+
+try:
+    _MAXFD = os.sysconf('SC_OPEN_MAX')
+except (AttributeError, ValueError, OSError):
+    _MAXFD = 256
+
+# Set in the worker processes.
+_in_worker = False
+
+if pickle.HIGHEST_PROTOCOL >= 5:
+    def _dumps(obj):
+        buffers = []
+        data = pickle.dumps(obj, 5, buffer_callback=buffers.append)
+        chunks = _frame(data, len(buffers))
+        for buf in buffers:
+            try:
+                view = buf.raw()
+            except BufferError:
+                # Not contiguous
+                view = memoryview(memoryview(buf).tobytes())
+            chunks.append(_SIZE.pack(view.nbytes))
+            chunks.append(view)
+        return chunks
+
+    def _loads(data, buffers):
+        return pickle.loads(data, buffers=buffers)
+else:
+    def _dumps(obj):
+        return _frame(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL), 0)
+
+    def _loads(data, buffers): # pylint:disable=unused-argument
+        return pickle.loads(data)
+
+
+def _frame(data, buffer_count):
+    header = _HEADER.pack(len(data), buffer_count)
+    if len(data) < _SMALL:
+        return [header + data]
+    return [header, data]
+
+
+def _write_all(write, fd, chunks):
+    for chunk in chunks:
+        view = memoryview(chunk)
+        while view:
+            view = view[write(fd, view):]
+
+
+def _read_exactly(read, fd, size):
+    chunks = []
+    while size:
+        data = read(fd, min(size, _MAX_READ))
+        if not data:
+            raise EOFError()
+        chunks.append(data)
+        size -= len(data)
+    return b''.join(chunks)
+
+
+def _read_into(read, fd, buf):
+    view = memoryview(buf)
+    while view:
+        data = read(fd, min(len(view), _MAX_READ))
+        if not data:
+            raise EOFError()
+        view[:len(data)] = data
+        view = view[len(data):]
+
+
+def _recv(read, fd):
+    size, buffer_count = _HEADER.unpack(_read_exactly(read, fd, _HEADER.size))
+    data = _read_exactly(read, fd, size)
+    buffers = []
+    for _ in xrange(buffer_count):
+        size, = _SIZE.unpack(_read_exactly(read, fd, _SIZE.size))
+        buf = bytearray(size)
+        _read_into(read, fd, buf)
+        buffers.append(buf)
+    # Only now that the whole message is read can this fail.
+    return _loads(data, buffers)
+
+
+def _error_reply():
+    exc_info = sys.exc_info()
+    return False, (exc_info[1], dump_traceback(exc_info[2]))
+
+
+def _close_fds(keep):
+    # Close the file descriptors of the process except the standard
+    # ones and those in *keep*, like subprocess's close_fds. Where the
+    # open descriptors can be listed, don't try to close them all.
+    for fd_dir in ('/proc/self/fd', '/dev/fd'):
+        try:
+            fds = [int(name) for name in os.listdir(fd_dir)]
+        except (OSError, ValueError):
+            continue
+        for fd in fds:
+            if fd > 2 and fd not in keep:
+                try:
+                    os.close(fd)
+                except OSError:
+                    # Such as the one that listed the directory.
+                    pass
+        return
+    last = 2
+    for fd in sorted(keep):
+        os.closerange(last + 1, fd)
+        last = fd
+    os.closerange(last + 1, _MAXFD)
+
+
+def _serve(task_fd, result_fd):
+    # The loop of a worker process. This doesn't use gevent: the
+    # process has nothing to do but block until the next task comes.
+    while True:
+        try:
+            func, args, kwargs = _recv(_os_read, task_fd)
+        except EOFError:
+            # The pool is done with us.
+            return
+        except: # pylint:disable=bare-except
+            reply = _error_reply()
+        else:
+            try:
+                reply = True, func(*args, **kwargs)
+            except: # pylint:disable=bare-except
+                reply = _error_reply()
+            del func, args, kwargs
+        try:
+            chunks = _dumps(reply)
+        except: # pylint:disable=bare-except
+            # The result (or the exception) can't be pickled;
+            # send that error instead.
+            chunks = _dumps(_error_reply())
+        del reply
+        _write_all(_os_write, result_fd, chunks)
+        del chunks
+
+
+class _Worker(object):
+    # The pool's end of a worker process.
+
+    __slots__ = ('pid', 'task_fd', 'result_fd', 'tasks', 'retired')
+
+    def __init__(self, pid, task_fd, result_fd):
+        self.pid = pid
+        self.task_fd = task_fd
+        self.result_fd = result_fd
+        self.tasks = 0
+        self.retired = False
+
+    def close(self):
+        # The worker process exits when it reads the end of the file.
+        os.close(self.task_fd)
+        os.close(self.result_fd)
+
+
+class ProcessPool(GroupMappingMixin):
+    """
+    A pool of *maxsize* worker processes, with the same mapping
+    methods as :class:`gevent.threadpool.ThreadPool`.
+
+    All the workers are forked when the pool is created. When all of
+    them are busy, :meth:`spawn` waits for one to be free. The worker
+    processes close the file descriptors they inherit, other than
+    standard input, output and error.
+
+    If the process that created the pool forks, the pool in the child
+    process starts worker processes of its own when it is next used.
+    In a worker process, :meth:`apply` and :meth:`map` run the
+    function in that process.
+
+    :keyword int maxtasksperchild: If given, each worker process is
+        replaced by a new one after it has run this many tasks, so
+        that any memory it holds on to is given back.
+
+    .. versionadded:: 1.3a2
+    """
+
+    def __init__(self, maxsize, maxtasksperchild=None, hub=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1: %r' % (maxsize, ))
+        if maxtasksperchild is not None and maxtasksperchild < 1:
+            raise ValueError('maxtasksperchild must be at least 1: %r' % (maxtasksperchild, ))
+        if hub is None:
+            hub = get_hub()
+        self.hub = hub
+        self.pid = os.getpid()
+        self._maxsize = maxsize
+        self.maxtasksperchild = maxtasksperchild
+        self._semaphore = Semaphore(maxsize)
+        self._empty_event = Event()
+        self._empty_event.set()
+        # All the worker processes, busy or not.
+        self._workers = set()
+        self._idle = []
+        try:
+            for _ in xrange(maxsize):
+                self._idle.append(self._start_worker())
+        except:
+            self.kill()
+            raise
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def size(self):
+        """The number of worker processes."""
+        self._check_fork()
+        return len(self._workers)
+
+    def __repr__(self):
+        return '<%s at 0x%x %s/%s/%s>' % (self.__class__.__name__, id(self), len(self), self.size, self.maxsize)
+
+    def __len__(self):
+        return self._maxsize - self._semaphore.counter
+
+    def _start_worker(self):
+        task_r, task_w = os.pipe()
+        result_r, result_w = os.pipe()
+        try:
+            pid = fork_and_watch(loop=self.hub.loop)
+        except:
+            for fd in (task_r, task_w, result_r, result_w):
+                os.close(fd)
+            raise
+        if not pid:
+            global _in_worker # pylint:disable=global-statement
+            _in_worker = True
+            status = 1
+            try:
+                # Including the pipes of the other workers, and
+                # whatever sockets the parent is listening on.
+                _close_fds((task_r, result_w))
+                _serve(task_r, result_w)
+                status = 0
+            finally:
+                os._exit(status) # pylint:disable=protected-access
+        os.close(task_r)
+        os.close(result_w)
+        make_nonblocking(task_w)
+        make_nonblocking(result_r)
+        worker = _Worker(pid, task_w, result_r)
+        self._workers.add(worker)
+        return worker
+
+    def _stop_worker(self, worker):
+        self._workers.discard(worker)
+        worker.close()
+
+    def _check_fork(self):
+        # The workers belong to the process that forked them.
+        pid = os.getpid()
+        if pid != self.pid:
+            self.pid = pid
+            for worker in self._workers:
+                worker.close()
+            self._workers = set()
+            self._idle = []
+
+    def spawn(self, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` in a worker process, waiting
+        first if they are all busy.
+
+        Errors pickling the task are raised here.
+
+        :return: A :class:`gevent.event.AsyncResult`. If the worker
+            process exits while running the task, it will hold an
+            :exc:`EOFError`.
+        """
+        self._check_fork()
+        task = _dumps((func, args, kwargs))
+        self._semaphore.acquire()
+        self._empty_event.clear()
+        result = AsyncResult()
+        spawn_pooled(self._run, task, result)
+        return result
+
+    def _run(self, task, result):
+        try:
+            worker = self._idle.pop() if self._idle else self._start_worker()
+        except: # pylint:disable=bare-except
+            self._finish(None)
+            result.set_exception(sys.exc_info()[1], sys.exc_info())
+            return
+        try:
+            _write_all(nb_write, worker.task_fd, task)
+            del task
+            ok, value = _recv(nb_read, worker.result_fd)
+        except (EOFError, OSError, IOError):
+            # The worker process is gone.
+            self._stop_worker(worker)
+            self._finish(None)
+            result.set_exception(EOFError('Worker process %s exited' % (worker.pid, )))
+            return
+        except: # pylint:disable=bare-except
+            # The reply was read, but can't be unpickled here.
+            self._finish(worker)
+            result.set_exception(sys.exc_info()[1], sys.exc_info())
+            return
+        worker.tasks += 1
+        self._finish(worker)
+        if ok:
+            result.set(value)
+        else:
+            exception, tb = value
+            result.set_exception(exception, (type(exception), exception, load_traceback(tb)))
+
+    def _finish(self, worker):
+        if worker is not None:
+            recycle = self.maxtasksperchild and worker.tasks >= self.maxtasksperchild
+            if worker.retired or recycle:
+                self._stop_worker(worker)
+            else:
+                self._idle.append(worker)
+            if recycle and not worker.retired:
+                try:
+                    self._idle.append(self._start_worker())
+                except OSError:
+                    # The next task tries again, and reports the error.
+                    pass
+        self._semaphore.release()
+        if not self:
+            self._empty_event.set()
+
+    def join(self):
+        """Waits until all outstanding tasks have been completed."""
+        self._empty_event.wait()
+
+    def kill(self):
+        """
+        Stop the worker processes: the idle ones now, and the busy
+        ones when they finish their task. New worker processes are
+        forked if the pool is used again.
+        """
+        self._check_fork()
+        for worker in self._workers:
+            worker.retired = True
+        while self._idle:
+            self._stop_worker(self._idle.pop())
+
+    def map(self, func, iterable):
+        if self._apply_immediately():
+            return [func(item) for item in iterable]
+        return GroupMappingMixin.map(self, func, iterable)
+
+    def _apply_immediately(self):
+        # In a worker process, there's nothing to hand the task to.
+        # Any other process gets workers of its own, as spawn() does.
+        if _in_worker:
+            return True
+        self._check_fork()
+        return False
+
+    def _apply_async_cb_spawn(self, callback, result):
+        callback(result)
+
+    def _apply_async_use_greenlet(self):
+        # Our self.spawn blocks when all the workers are busy.
+        return True
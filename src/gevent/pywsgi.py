@@ -14,6 +14,9 @@ different subclasses of :class:`WSGIHandler`.
 
 import errno
 from io import BytesIO
+import mmap
+import os
+from stat import S_ISREG
 import string
 import sys
 import time
@@ -30,6 +33,8 @@ import gevent
 from gevent.server import StreamServer
 from gevent.hub import GreenletExit
 from gevent._compat import PY3, reraise
+from gevent._pywsgi_headers import parse_header_block
+from gevent._pywsgi_headers import parse_request_line
 
 from functools import partial
 if PY3:
@@ -42,6 +47,7 @@ _no_undoc_members = True # Don't put undocumented things into sphinx
 __all__ = [
     'WSGIServer',
     'WSGIHandler',
+    'FileWrapper',
     'LoggingLogAdapter',
     'Environ',
     'SecureEnviron',
@@ -60,6 +66,12 @@ _MONTHNAME = [None,  # Dummy so we can use 1-based month numbers
 # in byte form for comparing to the network.
 _HEX = string.hexdigits.encode('ascii')
 
+# How many entries each of WSGIServer's caches of encoded status
+# strings, status lines and header names can have. Applications
+# usually use only a handful of these, but in case one generates
+# them, the caches stop growing.
+_MAX_CACHED = 512
+
 # Errors
 _ERRORS = dict()
 _INTERNAL_ERROR_STATUS = '500 Internal Server Error'
@@ -79,6 +91,7 @@ _ERRORS[400] = (_BAD_REQUEST_STATUS, _BAD_REQUEST_HEADERS, _BAD_REQUEST_BODY)
 _REQUEST_TOO_LONG_RESPONSE = b"HTTP/1.1 414 Request URI Too Long\r\nConnection: close\r\nContent-length: 0\r\n\r\n"
 _BAD_REQUEST_RESPONSE = b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-length: 0\r\n\r\n"
 _CONTINUE_RESPONSE = b"HTTP/1.1 100 Continue\r\n\r\n"
+_SERVICE_UNAVAILABLE_RESPONSE = b"HTTP/1.1 503 Service Unavailable\r\nConnection: close\r\nContent-length: 0\r\n\r\n"
 
 
 def format_date_time(timestamp):
@@ -92,6 +105,19 @@ def format_date_time(timestamp):
     return value
 
 
+def _nbytes(data):
+    # The length in bytes of *data*; for a memoryview, len() counts
+    # items, which may be bigger than a byte.
+    if isinstance(data, bytes):
+        return len(data)
+    view = memoryview(data)
+    nbytes = getattr(view, 'nbytes', None)
+    if nbytes is None:
+        # Python 2
+        nbytes = len(view) * view.itemsize
+    return nbytes
+
+
 class _InvalidClientInput(IOError):
     # Internal exception raised by Input indicating that the client
     # sent invalid data at the lowest level of the stream. The result
@@ -107,6 +133,59 @@ class _InvalidClientRequest(ValueError):
     pass
 
 
+class FileWrapper(object):
+    """
+    The ``wsgi.file_wrapper`` provided by :class:`WSGIServer`.
+
+    Applications can return ``environ['wsgi.file_wrapper'](filelike,
+    blksize)`` as their response (see :pep:`3333`). If *filelike* is a
+    regular file, :class:`WSGIHandler` sends it from its current
+    position without reading it into Python, using
+    :meth:`gevent.socket.socket.sendfile`, or a memory map on TLS
+    connections. If the application didn't provide a
+    ``Content-Length``, it is set from the size of the file.
+
+    Otherwise (or on Python 2), the wrapper is iterated, reading
+    *blksize* bytes at a time.
+
+    .. versionadded:: 1.3a2
+    """
+
+    def __init__(self, filelike, blksize=8192):
+        self.filelike = filelike
+        self.blksize = blksize
+        close = getattr(filelike, 'close', None)
+        if close is not None:
+            self.close = close
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        data = self.filelike.read(self.blksize)
+        if data:
+            return data
+        raise StopIteration
+
+    next = __next__
+
+    def _span(self):
+        # Returns ``(fileno, offset, count)`` describing what remains
+        # to be read from a regular file, or None if we're not wrapping
+        # a regular file.
+        try:
+            fileno = self.filelike.fileno()
+            offset = self.filelike.tell()
+            st = os.fstat(fileno)
+        except (AttributeError, ValueError, EnvironmentError):
+            # Not a file, closed, or an io.UnsupportedOperation
+            # (a subclass of both ValueError and OSError).
+            return None
+        if not S_ISREG(st.st_mode):
+            return None
+        return fileno, offset, max(st.st_size - offset, 0)
+
+
 class Input(object):
 
     __slots__ = ('rfile', 'content_length', 'socket', 'position',
@@ -337,6 +416,8 @@ class Input(object):
 try:
     import mimetools
     headers_factory = mimetools.Message
+    # Only Python 3 uses parse_header_block.
+    _message_from_headers = None
 except ImportError:
     # adapt Python 3 HTTP headers to old API
     from http import client # pylint:disable=import-error
@@ -366,6 +447,30 @@ except ImportError:
             ret.status = 'Line too long'
         return ret
 
+    def _message_from_headers(headers):
+        # Build an OldMessage from the (name, value) pairs of
+        # parse_header_block.
+        msg = OldMessage()
+        for name, value in headers:
+            msg.set_raw(name, value)
+        return msg
+
+
+def _header_block_end(buffered):
+    # The length of the header block at the start of *buffered*,
+    # including the empty line that ends it, or -1 if that isn't
+    # all there. Accept either line ending, as the feed parser does.
+    if buffered[:1] == b'\n':
+        return 1
+    if buffered[:2] == b'\r\n':
+        return 2
+    end = buffered.find(b'\n\r\n')
+    end = end + 3 if end != -1 else end
+    end_lf = buffered.find(b'\n\n')
+    if end_lf != -1 and (end == -1 or end_lf + 2 < end):
+        end = end_lf + 2
+    return end
+
 
 class WSGIHandler(object):
     """
@@ -422,6 +527,9 @@ class WSGIHandler(object):
     request_version = None # str: 'HTTP 1.1'
     command = None # str: 'GET'
     path = None # str: '/'
+    # (headers, environ items) from parse_header_block, if
+    # read_request used it.
+    _parsed_headers = None
 
     def __init__(self, sock, address, server, rfile=None):
         # Deprecation: The rfile kwarg was introduced in 1.0a1 as part
@@ -510,25 +618,33 @@ class WSGIHandler(object):
         .. versionchanged:: 1.1b6
            Raise the previously documented :exc:`ValueError` in more cases instead of returning a
            false value; this allows subclasses more opportunity to customize behaviour.
+        .. versionchanged:: 1.3a2
+           If all of the headers are already buffered in ``self.rfile``,
+           as they usually are when requests are pipelined, read them
+           in one call instead of a line at a time.
         """
         # pylint:disable=too-many-branches
         self.requestline = raw_requestline.rstrip()
-        words = self.requestline.split()
-        if len(words) == 3:
-            self.command, self.path, self.request_version = words
-            if not self._check_http_version():
-                raise _InvalidClientRequest('Invalid http version: %r' % (raw_requestline,))
-        elif len(words) == 2:
-            self.command, self.path = words
-            if self.command != "GET":
-                raise _InvalidClientRequest('Expected GET method: %r' % (raw_requestline,))
-            self.request_version = "HTTP/0.9"
-            # QQQ I'm pretty sure we can drop support for HTTP/0.9
+        parsed = parse_request_line(self.requestline)
+        if parsed is not None:
+            # The usual case: a well-formed HTTP/1.0 or HTTP/1.1 request.
+            self.command, self.path, self.request_version = parsed
         else:
-            raise _InvalidClientRequest('Invalid HTTP method: %r' % (raw_requestline,))
-
-        self.headers = self.MessageClass(self.rfile, 0)
+            words = self.requestline.split()
+            if len(words) == 3:
+                self.command, self.path, self.request_version = words
+                if not self._check_http_version():
+                    raise _InvalidClientRequest('Invalid http version: %r' % (raw_requestline,))
+            elif len(words) == 2:
+                self.command, self.path = words
+                if self.command != "GET":
+                    raise _InvalidClientRequest('Expected GET method: %r' % (raw_requestline,))
+                self.request_version = "HTTP/0.9"
+                # QQQ I'm pretty sure we can drop support for HTTP/0.9
+            else:
+                raise _InvalidClientRequest('Invalid HTTP method: %r' % (raw_requestline,))
 
+        self._read_headers()
         if self.headers.status:
             raise _InvalidClientRequest('Invalid headers status: %r' % (self.headers.status,))
 
@@ -557,6 +673,27 @@ class WSGIHandler(object):
 
         return True
 
+    def _read_headers(self):
+        # Set self.headers from rfile. If all of the headers are
+        # already buffered, as they usually are when requests are
+        # pipelined, read them in one call, and on Python 3 parse
+        # simple ones directly.
+        rfile = self.rfile
+        peek = getattr(rfile, 'peek', None)
+        end = _header_block_end(peek(MAX_REQUEST_LINE)) if peek is not None else -1
+        if end == -1:
+            self.headers = self.MessageClass(rfile, 0)
+            return
+        header_block = rfile.read(end)
+        parsed = None
+        if PY3 and type(self).MessageClass is WSGIHandler.MessageClass:
+            parsed = parse_header_block(header_block)
+        if parsed is None:
+            self.headers = self.MessageClass(BytesIO(header_block), 0)
+        else:
+            self.headers = _message_from_headers(parsed[0])
+            self._parsed_headers = (self.headers, parsed[1])
+
     def log_error(self, msg, *args):
         try:
             message = msg % args
@@ -680,7 +817,10 @@ class WSGIHandler(object):
 
     def finalize_headers(self):
         if self.provided_date is None:
-            self.response_headers.append((b'Date', format_date_time(time.time())))
+            # Servers other than WSGIServer may not cache the date.
+            get_date = getattr(self.server, '_get_date', None)
+            date = get_date() if get_date is not None else format_date_time(time.time())
+            self.response_headers.append((b'Date', date))
 
         if self.code not in (304, 204):
             # the reply will include message-body; make sure we have either Content-Length or chunked
@@ -704,7 +844,22 @@ class WSGIHandler(object):
             if self.code > 0:
                 self.code = -self.code
             raise
-        self.response_length += len(data)
+        self.response_length += _nbytes(data)
+
+    def _sendall_vectored(self, buffers):
+        sendall_vectored = getattr(self.socket, 'sendall_vectored', None)
+        try:
+            if sendall_vectored is not None:
+                sendall_vectored(buffers)
+            else:
+                # Not a gevent socket.
+                self.socket.sendall(b''.join(buffers))
+        except socket.error as ex:
+            self.status = 'socket error: %s' % ex
+            if self.code > 0:
+                self.code = -self.code
+            raise
+        self.response_length += sum(_nbytes(data) for data in buffers)
 
     def _write(self, data):
         if not data:
@@ -714,14 +869,10 @@ class WSGIHandler(object):
 
         if self.response_use_chunked:
             ## Write the chunked encoding
-            header = ("%x\r\n" % len(data)).encode('ascii')
-            # socket.sendall will slice these small strings, as [0:],
-            # but that's special cased to return the original string.
-            # They're small enough we probably expect them to go down to the network
-            # buffers in one go anyway.
-            self._sendall(header)
-            self._sendall(data)
-            self._sendall(b'\r\n') # trailer
+            header = ("%x\r\n" % _nbytes(data)).encode('ascii')
+            # Send the chunk header, the data and the trailer with one
+            # (vectored) write, without copying the data.
+            self._sendall_vectored((header, data, b'\r\n'))
         else:
             self._sendall(data)
 
@@ -741,26 +892,65 @@ class WSGIHandler(object):
             self._write_with_headers(data)
 
     def _write_with_headers(self, data):
-        towrite = bytearray()
         self.headers_sent = True
         self.finalize_headers()
 
         # self.response_headers and self.status are already in latin-1, as encoded by self.start_response
-        towrite.extend(b'HTTP/1.1 ')
-        towrite.extend(self.status)
-        towrite.extend(b'\r\n')
+        status = self.status
+        status_lines = getattr(self.server, '_status_lines', None)
+        if status_lines is None:
+            # Servers other than WSGIServer may not have the caches.
+            status_lines = {}
+        status_line = status_lines.get(status)
+        if status_line is None:
+            status_line = b'HTTP/1.1 ' + status + b'\r\n'
+            if len(status_lines) < _MAX_CACHED:
+                status_lines[status] = status_line
+        towrite = [status_line]
         for header, value in self.response_headers:
-            towrite.extend(header)
-            towrite.extend(b': ')
-            towrite.extend(value)
-            towrite.extend(b"\r\n")
-
-        towrite.extend(b'\r\n')
-        self._sendall(towrite)
-        # No need to copy the data into towrite; we may make an extra syscall
-        # but the copy time could be substantial too, and it reduces the chances
-        # of sendall being able to send everything in one go
-        self._write(data)
+            towrite.append(header)
+            towrite.append(b': ')
+            towrite.append(value)
+            towrite.append(b'\r\n')
+        towrite.append(b'\r\n')
+        towrite = b''.join(towrite)
+        # No need to copy the data into towrite; a vectored write sends
+        # both in one syscall anyway.
+        if not data:
+            self._sendall(towrite)
+        elif self.response_use_chunked:
+            header = ("%x\r\n" % _nbytes(data)).encode('ascii')
+            self._sendall_vectored((towrite, header, data, b'\r\n'))
+        else:
+            self._sendall_vectored((towrite, data))
+
+    def _header_name(self, header):
+        # Check the native string *header* and return its encoded and
+        # lower case forms. Servers other than WSGIServer may not
+        # remember them.
+        header_names = getattr(self.server, '_header_names', None)
+        name = header_names.get(header) if header_names is not None else None
+        if name is None:
+            if '\r' in header or '\n' in header:
+                raise ValueError('carriage return or newline in header name', header)
+            name = (header if not PY3 else header.encode("latin-1"), header.lower())
+            if header_names is not None and len(header_names) < _MAX_CACHED:
+                header_names[header] = name
+        return name
+
+    def _status_line(self, status):
+        # Check the native string *status* and return its code and
+        # encoded form, remembered like header names.
+        status_cache = getattr(self.server, '_status_cache', None)
+        cached_status = status_cache.get(status) if status_cache is not None else None
+        if cached_status is None:
+            if '\r' in status or '\n' in status:
+                raise ValueError("carriage return or newline in status", status)
+            cached_status = (int(status.split(' ', 1)[0]),
+                             status if not PY3 else status.encode("latin-1"))
+            if status_cache is not None and len(status_cache) < _MAX_CACHED:
+                status_cache[status] = cached_status
+        return cached_status
 
     def start_response(self, status, headers, exc_info=None):
         """
@@ -772,6 +962,10 @@ class WSGIHandler(object):
             Pro-actively handle checking the encoding of the status line
             and headers during this method. On Python 2, avoid some
             extra encodings.
+         .. versionchanged:: 1.3a2
+            Remember the encoded forms of status strings and header names
+            that have been seen before instead of checking and encoding
+            them again.
         """
         # pylint:disable=too-many-branches,too-many-statements
         if exc_info:
@@ -797,14 +991,16 @@ class WSGIHandler(object):
         response_headers = []
         header = None
         value = None
+        provided_connection = None
+        provided_date = None
+        provided_content_length = None
         try:
             for header, value in headers:
                 if not isinstance(header, str):
                     raise UnicodeError("The header must be a native string", header, value)
                 if not isinstance(value, str):
                     raise UnicodeError("The value must be a native string", header, value)
-                if '\r' in header or '\n' in header:
-                    raise ValueError('carriage return or newline in header name', header)
+                name = self._header_name(header)
                 if '\r' in value or '\n' in value:
                     raise ValueError('carriage return or newline in header value', value)
                 # Either we're on Python 2, in which case bytes is correct, or
@@ -819,8 +1015,15 @@ class WSGIHandler(object):
                 # Note: Some Python 2 implementations, like Jython, may allow non-octet (above 255) values
                 # in their str implementation; this is mentioned in the WSGI spec, but we don't
                 # run on any platform like that so we can assume that a str value is pure bytes.
-                response_headers.append((header if not PY3 else header.encode("latin-1"),
+                response_headers.append((name[0],
                                          value if not PY3 else value.encode("latin-1")))
+                lower_name = name[1]
+                if lower_name == 'connection':
+                    provided_connection = value
+                elif lower_name == 'date':
+                    provided_date = value
+                elif lower_name == 'content-length':
+                    provided_content_length = value
         except UnicodeEncodeError:
             # If we get here, we're guaranteed to have a header and value
             raise UnicodeError("Non-latin1 header", repr(header), repr(value))
@@ -828,29 +1031,13 @@ class WSGIHandler(object):
         # Same as above
         if not isinstance(status, str):
             raise UnicodeError("The status string must be a native string")
-        if '\r' in status or '\n' in status:
-            raise ValueError("carriage return or newline in status", status)
         # don't assign to anything until the validation is complete, including parsing the
         # code
-        code = int(status.split(' ', 1)[0])
-
-        self.status = status if not PY3 else status.encode("latin-1")
+        self.code, self.status = self._status_line(status)
         self._orig_status = status # Preserve the native string for logging
         self.response_headers = response_headers
-        self.code = code
-
-        provided_connection = None
-        self.provided_date = None
-        self.provided_content_length = None
-
-        for header, value in headers:
-            header = header.lower()
-            if header == 'connection':
-                provided_connection = value
-            elif header == 'date':
-                self.provided_date = value
-            elif header == 'content-length':
-                self.provided_content_length = value
+        self.provided_date = provided_date
+        self.provided_content_length = provided_content_length
 
         if self.request_version == 'HTTP/1.0' and provided_connection is None:
             response_headers.append((b'Connection', b'close'))
@@ -889,7 +1076,69 @@ class WSGIHandler(object):
             length,
             delta)
 
+    def _write_file(self, wrapper):
+        # Send a FileWrapper without reading it into Python, if we can.
+        # Returns whether it was sent.
+        if not PY3 or self.headers_sent or not self.status or self.code in (304, 204):
+            # Python 2 sockets have no sendfile and can't send a
+            # memoryview of a mmap; if the application already
+            # started writing, let the iteration continue the same way.
+            return False
+
+        span = wrapper._span()
+        if span is None or any(name.lower() == b'transfer-encoding'
+                               for name, _ in self.response_headers):
+            # We can't add a Content-Length to a response the
+            # application chose to encode.
+            return False
+        fileno, offset, count = span
+        if self.provided_content_length is not None:
+            try:
+                count = min(count, int(self.provided_content_length))
+            except ValueError:
+                return False
+        else:
+            self.provided_content_length = str(count)
+            self.response_headers.append((b'Content-Length', str(count).encode('latin-1')))
+
+        if not count:
+            self.write(b'')
+            return True
+        if self.server.ssl_enabled:
+            return self._write_file_mapped(fileno, offset, count)
+        return self._write_file_sendfile(wrapper.filelike, offset, count)
+
+    def _write_file_mapped(self, fileno, offset, count):
+        # sendfile() can't encrypt; instead of reading the file
+        # in blocks, let the SSL socket write from a memory map.
+        try:
+            mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            return False
+        try:
+            self.write(b'')
+            with memoryview(mapped) as view:
+                with view[offset:offset + count] as data:
+                    self._sendall(data)
+        finally:
+            mapped.close()
+        return True
+
+    def _write_file_sendfile(self, filelike, offset, count):
+        self.write(b'')
+        try:
+            sent = self.socket.sendfile(filelike, offset, count)
+        except socket.error as ex:
+            self.status = 'socket error: %s' % ex
+            if self.code > 0:
+                self.code = -self.code
+            raise
+        self.response_length += sent
+        return True
+
     def process_result(self):
+        if isinstance(self.result, FileWrapper) and self._write_file(self.result):
+            return
         for data in self.result:
             if data:
                 self.write(data)
@@ -1050,6 +1299,24 @@ class WSGIHandler(object):
         if key not in IGNORED_KEYS:
             yield 'HTTP_' + key, value.strip()
 
+    def _header_environ(self, env):
+        # Add the HTTP_* variables for the request headers to *env*,
+        # using what parse_header_block made of them if it parsed
+        # these headers.
+        parsed = self._parsed_headers
+        if parsed is not None and parsed[0] is self.headers:
+            header_items = parsed[1]
+        else:
+            header_items = self._headers()
+        for key, value in header_items:
+            if key in env:
+                if 'COOKIE' in key:
+                    env[key] += '; ' + value
+                else:
+                    env[key] += ',' + value
+            else:
+                env[key] = value
+
     def get_environ(self):
         """
         Construct and return a new WSGI environment dictionary for a specific request.
@@ -1087,14 +1354,7 @@ class WSGIHandler(object):
             env['REMOTE_ADDR'] = str(client_address[0])
             env['REMOTE_PORT'] = str(client_address[1])
 
-        for key, value in self._headers():
-            if key in env:
-                if 'COOKIE' in key:
-                    env[key] += '; ' + value
-                else:
-                    env[key] += ',' + value
-            else:
-                env[key] = value
+        self._header_environ(env)
 
         if env.get('HTTP_EXPECT') == '100-continue':
             sock = self.socket
@@ -1377,6 +1637,11 @@ class WSGIServer(StreamServer):
     .. versionchanged:: 1.1a3
         Add support for passing :class:`logging.Logger` objects to the ``log`` and
         ``error_log`` arguments.
+    .. versionchanged:: 1.3a2
+        Add the ``workers`` parameter (see :attr:`~gevent.baseserver.BaseServer.workers`).
+        With workers, ``wsgi.multiprocess`` is true in the WSGI environment.
+    .. versionchanged:: 1.3a2
+        Add the ``reuse_port`` parameter (see :attr:`~gevent.server.StreamServer.reuse_port`).
     """
 
     #: A callable taking three arguments: (socket, address, server) and returning
@@ -1412,19 +1677,25 @@ class WSGIServer(StreamServer):
     # will cast to before passing to the loop.
     secure_environ_class = WSGISecureEnviron
 
+    # The cached Date header value, and the timer that clears it.
+    _date = None
+    _date_timer = None
+
     base_env = {'GATEWAY_INTERFACE': 'CGI/1.1',
                 'SERVER_SOFTWARE': 'gevent/%d.%d Python/%d.%d' % (gevent.version_info[:2] + sys.version_info[:2]),
                 'SCRIPT_NAME': '',
                 'wsgi.version': (1, 0),
                 'wsgi.multithread': False, # XXX: Aren't we really, though?
                 'wsgi.multiprocess': False,
-                'wsgi.run_once': False}
+                'wsgi.run_once': False,
+                'wsgi.file_wrapper': FileWrapper}
 
     def __init__(self, listener, application=None, backlog=None, spawn='default',
                  log='default', error_log='default',
                  handler_class=None,
-                 environ=None, **ssl_args):
-        StreamServer.__init__(self, listener, backlog=backlog, spawn=spawn, **ssl_args)
+                 environ=None, workers=None, reuse_port=None, **ssl_args):
+        StreamServer.__init__(self, listener, backlog=backlog, spawn=spawn,
+                              workers=workers, reuse_port=reuse_port, **ssl_args)
         if application is not None:
             self.application = application
         if handler_class is not None:
@@ -1443,6 +1714,13 @@ class WSGIServer(StreamServer):
         self.log = _make_log(log)
         self.error_log = _make_log(error_log, 40) # logging.ERROR
 
+        # The encoded forms of the status strings and header names
+        # that the application passes to start_response, and of the
+        # status lines sent for them; see _MAX_CACHED.
+        self._status_cache = {} # '200 OK' -> (200, b'200 OK')
+        self._status_lines = {} # b'200 OK' -> b'HTTP/1.1 200 OK\r\n'
+        self._header_names = {} # 'Content-Type' -> (b'Content-Type', 'content-type')
+
         self.set_environ(environ)
         self.set_max_accept()
 
@@ -1456,14 +1734,21 @@ class WSGIServer(StreamServer):
             self.environ['wsgi.url_scheme'] = 'https'
         else:
             self.environ['wsgi.url_scheme'] = 'http'
+        if self.workers:
+            self.environ['wsgi.multiprocess'] = True
         if environ_update is not None:
             self.environ.update(environ_update)
         if self.environ.get('wsgi.errors') is None:
             self.environ['wsgi.errors'] = self.error_log
 
     def set_max_accept(self):
-        if self.environ.get('wsgi.multiprocess'):
+        # Processes sharing a listening socket should each take only
+        # one connection at a time, however deep the backlog gets, so
+        # that the connections are shared out between them; that
+        # doesn't apply to processes with sockets of their own.
+        if self.environ.get('wsgi.multiprocess') and not self.reuse_port:
             self.max_accept = 1
+            self.max_accept_growth = 1
 
     def get_environ(self):
         return self.environ_class(self.environ)
@@ -1493,6 +1778,58 @@ class WSGIServer(StreamServer):
             self.environ.setdefault('SERVER_NAME', '')
             self.environ.setdefault('SERVER_PORT', '')
 
+    def _get_date(self):
+        # The value of the Date header for responses sent now. Most
+        # servers send many responses each second, so format it only
+        # once per second: a timer forgets it at the start of the
+        # next second. The timer doesn't keep the loop running.
+        date = self._date
+        if date is None:
+            now = time.time()
+            date = self._date = format_date_time(now)
+            self._date_timer = self.loop.timer(1.0 - now % 1.0, ref=False)
+            self._date_timer.start(self._expire_date)
+        return date
+
+    def _expire_date(self):
+        self._date_timer.close()
+        self._date_timer = None
+        self._date = None
+
+    def close(self):
+        if self._date_timer is not None:
+            self._date_timer.close()
+            self._date_timer = None
+        self._date = None
+        super(WSGIServer, self).close()
+
+    def do_shed(self, sock, *args):
+        # pylint:disable=arguments-differ
+        """
+        Send a ``503 Service Unavailable`` response to a client that
+        connected while the server was over its limits, if that can
+        be done without waiting (and without TLS), and close the
+        connection.
+
+        .. versionadded:: 1.3a2
+        """
+        if not self.ssl_enabled:
+            # The underlying non-blocking socket: we mustn't wait.
+            raw = sock._sock
+            try:
+                # Closing with unread data would reset the connection,
+                # likely before the client reads the response, so
+                # discard whatever part of the request has arrived.
+                raw.recv(65536)
+            except socket.error:
+                pass
+            try:
+                raw.send(_SERVICE_UNAVAILABLE_RESPONSE)
+                raw.shutdown(socket.SHUT_WR)
+            except socket.error:
+                pass
+        StreamServer.do_shed(self, sock, *args)
+
     def handle(self, sock, address):
         """
         Create an instance of :attr:`handler_class` to handle the request.
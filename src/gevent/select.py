@@ -6,8 +6,9 @@ from __future__ import absolute_import
 
 import sys
 
-from gevent.event import Event
 from gevent.hub import get_hub
+from gevent.hub import ConcurrentObjectUseError
+from gevent.hub import _BatchWaiter
 from gevent.hub import sleep as _g_sleep
 from gevent._compat import integer_types
 from gevent._compat import iteritems
@@ -16,6 +17,13 @@ from gevent._util import copy_globals
 from gevent._util import _NONE
 
 from errno import EINTR
+from errno import EEXIST
+from errno import ENOENT
+from errno import EPERM
+from os import fstat
+from os import strerror
+from stat import S_ISREG
+from stat import S_ISDIR
 from select import select as _real_original_select
 if sys.platform.startswith('win32'):
     def _original_select(r, w, x, t):
@@ -30,12 +38,19 @@ else:
 
 try:
     from select import poll as original_poll
-    from select import POLLIN, POLLOUT, POLLNVAL
+    from select import POLLIN, POLLOUT, POLLPRI, POLLNVAL
     __implements__ = ['select', 'poll']
 except ImportError:
     original_poll = None
     __implements__ = ['select']
 
+try:
+    from select import epoll as original_epoll
+    from select import EPOLLIN, EPOLLOUT, EPOLLPRI, EPOLLERR, EPOLLONESHOT
+    __implements__.append('epoll')
+except ImportError:
+    original_epoll = None
+
 __all__ = ['error'] + __implements__
 
 import select as __select__
@@ -61,54 +76,62 @@ def get_fileno(obj):
 
 
 class SelectResult(object):
-    __slots__ = ('read', 'write', 'event')
+    __slots__ = ('read', 'write')
 
     def __init__(self):
         self.read = []
         self.write = []
-        self.event = Event()
-
-    def add_read(self, socket):
-        self.read.append(socket)
-        self.event.set()
-
-    add_read.event = _EV_READ
-
-    def add_write(self, socket):
-        self.write.append(socket)
-        self.event.set()
-
-    add_write.event = _EV_WRITE
 
-    def __add_watchers(self, watchers, fdlist, callback, io, pri):
-        for fd in fdlist:
-            watcher = io(get_fileno(fd), callback.event)
-            watcher.priority = pri
-            watchers.append(watcher)
-            watcher.start(callback, fd)
-
-    def _make_watchers(self, watchers, rlist, wlist):
+    @staticmethod
+    def _entries_by_fileno(rlist, wlist):
+        # Map each distinct file descriptor to ``[events, robjs, wobjs]``:
+        # all the events we're interested in on it, and the objects to
+        # report for each kind of event.
+        by_fileno = {}
+        for objs, event, index in ((rlist, _EV_READ, 1), (wlist, _EV_WRITE, 2)):
+            for obj in objs:
+                fileno = get_fileno(obj)
+                entry = by_fileno.get(fileno)
+                if entry is None:
+                    entry = by_fileno[fileno] = [0, [], []]
+                entry[0] |= event
+                entry[index].append(obj)
+        return by_fileno
+
+    @staticmethod
+    def _make_watchers(watchers, rlist, wlist):
+        # Use one watcher per distinct file descriptor. *watchers*
+        # maps each watcher to its entry from _entries_by_fileno.
         loop = get_hub().loop
         io = loop.io
         MAXPRI = loop.MAXPRI
-
+        by_fileno = SelectResult._entries_by_fileno(rlist, wlist)
         try:
-            self.__add_watchers(watchers, rlist, self.add_read, io, MAXPRI)
-            self.__add_watchers(watchers, wlist, self.add_write, io, MAXPRI)
+            for fileno, entry in iteritems(by_fileno):
+                watcher = io(fileno, entry[0])
+                watcher.priority = MAXPRI
+                watchers[watcher] = entry
         except IOError as ex:
             raise error(*ex.args)
 
     def _closeall(self, watchers):
         for watcher in watchers:
-            watcher.stop()
             watcher.close()
-        del watchers[:]
+        watchers.clear()
 
     def select(self, rlist, wlist, timeout):
-        watchers = []
+        watchers = {}
         try:
             self._make_watchers(watchers, rlist, wlist)
-            self.event.wait(timeout=timeout)
+            for watcher, events in get_hub().wait_any(watchers, timeout, pass_events=True):
+                requested, robjs, wobjs = watchers[watcher]
+                # Closed descriptors are reported with an error status
+                # rather than an event mask.
+                events = events & requested if events >= 0 else requested
+                if events & _EV_READ:
+                    self.read.extend(robjs)
+                if events & _EV_WRITE:
+                    self.write.extend(wobjs)
             return self.read, self.write, []
         finally:
             self._closeall(watchers)
@@ -170,27 +193,10 @@ def select(rlist, wlist, xlist, timeout=None): # pylint:disable=unused-argument
     return result.select(rlist, wlist, timeout)
 
 
-if original_poll is not None:
-    class PollResult(object):
-        __slots__ = ('events', 'event')
-
-        def __init__(self):
-            self.events = set()
-            self.event = Event()
-
-        def add_event(self, events, fd):
-            if events < 0:
-                result_flags = POLLNVAL
-            else:
-                result_flags = 0
-                if events & _EV_READ:
-                    result_flags = POLLIN
-                if events & _EV_WRITE:
-                    result_flags |= POLLOUT
-
-            self.events.add((fd, result_flags))
-            self.event.set()
+# For epoll._urgent()
+_original_poll = original_poll
 
+if original_poll is not None:
     class poll(object):
         """
         An implementation of :class:`select.poll` that blocks only the current greenlet.
@@ -233,17 +239,21 @@ if original_poll is not None:
             .. versionchanged:: 1.2a1
                File descriptors that are closed are reported with POLLNVAL.
             """
-            result = PollResult()
-            try:
-                for fd, watcher in iteritems(self.fds):
-                    watcher.start(result.add_event, fd, pass_events=True)
-                if timeout is not None and timeout > -1:
-                    timeout /= 1000.0
-                result.event.wait(timeout=timeout)
-                return list(result.events)
-            finally:
-                for awatcher in itervalues(self.fds):
-                    awatcher.stop()
+            if timeout is not None:
+                timeout = timeout / 1000.0 if timeout > -1 else None
+            result = []
+            for watcher, events in get_hub().wait_any(itervalues(self.fds), timeout,
+                                                      pass_events=True):
+                if events < 0:
+                    result_flags = POLLNVAL
+                else:
+                    result_flags = 0
+                    if events & _EV_READ:
+                        result_flags = POLLIN
+                    if events & _EV_WRITE:
+                        result_flags |= POLLOUT
+                result.append((watcher.fd, result_flags))
+            return result
 
         def unregister(self, fd):
             """
@@ -259,3 +269,320 @@ if original_poll is not None:
             del self.fds[fileno]
 
 del original_poll
+
+
+class _WatcherPoller(object):
+    """
+    The machinery shared by :class:`epoll` and
+    :class:`gevent.selectors.GeventSelector`.
+
+    Each file descriptor added keeps a single io watcher until it is
+    removed. Watchers are not restarted for every call to
+    :meth:`wait`: a watcher is only stopped (to be restarted by the
+    next :meth:`wait`) when its descriptor becomes ready while no
+    greenlet is waiting. This makes the cost of :meth:`wait`
+    proportional to the number of active descriptors, not the number
+    of registered descriptors.
+
+    The watchers are never referenced, so that registered descriptors
+    don't keep the event loop running. While a greenlet is waiting, a
+    single referenced watcher keeps it running instead.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.watchers = {} # {int -> watcher}
+        self._rearm = set() # filenos whose watcher must be started by wait()
+        self._waiter = None
+
+    def add(self, fileno, flags):
+        watcher = self.loop.io(fileno, flags, ref=False)
+        watcher.priority = self.loop.MAXPRI
+        self.watchers[fileno] = watcher
+        if flags:
+            self._arm(fileno, watcher)
+
+    def modify(self, fileno, flags):
+        watcher = self.watchers[fileno]
+        watcher.stop()
+        self._rearm.discard(fileno)
+        if watcher.events != flags:
+            watcher.events = flags
+            # Re-initializing a libev watcher resets its priority
+            watcher.priority = self.loop.MAXPRI
+        if flags:
+            self._arm(fileno, watcher)
+
+    def disable(self, fileno):
+        self.watchers[fileno].stop()
+        self._rearm.discard(fileno)
+
+    def remove(self, fileno):
+        self.watchers.pop(fileno).close()
+        self._rearm.discard(fileno)
+
+    def close(self):
+        for watcher in itervalues(self.watchers):
+            watcher.close()
+        self.watchers.clear()
+        self._rearm.clear()
+
+    def _arm(self, fileno, watcher):
+        if self._waiter is not None:
+            # Someone is waiting right now, so don't make them
+            # wait for the next call to notice this descriptor.
+            watcher.start(self._on_event, fileno, pass_events=True)
+        else:
+            self._rearm.add(fileno)
+
+    def _on_event(self, events, fileno):
+        waiter = self._waiter
+        if waiter is None:
+            # Nobody is waiting. Level-triggered descriptors would
+            # keep firing, so stop until the next wait().
+            self.watchers[fileno].stop()
+            self._rearm.add(fileno)
+        else:
+            waiter.add((fileno, events))
+
+    def wait(self, timeout):
+        """
+        Wait for at least one descriptor to become ready, or for
+        *timeout* seconds (forever if ``None``). With a *timeout* of 0,
+        this runs one iteration of the event loop without blocking.
+
+        Returns a list of ``(fileno, events)`` pairs, where *events*
+        is as passed to an io watcher callback: negative for an error.
+        A fileno may appear more than once.
+        """
+        if self._waiter is not None:
+            raise ConcurrentObjectUseError('This object is already used by %r'
+                                           % (self._waiter.greenlet, ))
+
+        hub = get_hub()
+        if timeout == 0:
+            # Collect everything the watchers report in one loop
+            # iteration. Only the zero-duration timer, which runs
+            # after them, ends it.
+            waiter = _BatchWaiter(hub, float('inf'))
+        else:
+            waiter = _BatchWaiter(hub, 1)
+        self._waiter = waiter
+        if timeout is not None:
+            keepalive = hub.loop.timer(timeout)
+        else:
+            # Never sent; it just keeps the loop running until one
+            # of the (unreferenced) io watchers fires.
+            keepalive = hub.loop.async_()
+        try:
+            rearm = self._rearm
+            if rearm:
+                watchers = self.watchers
+                on_event = self._on_event
+                for fileno in rearm:
+                    watchers[fileno].start(on_event, fileno, pass_events=True)
+                rearm.clear()
+            keepalive.start(waiter.switch, waiter)
+            waiter.get()
+        finally:
+            self._waiter = None
+            waiter.cancel()
+            keepalive.close()
+        return waiter.ready
+
+
+if original_epoll is not None:
+    class epoll(object):
+        """
+        An implementation of :class:`select.epoll` that blocks only the current greenlet.
+
+        Each registered file descriptor keeps a single io watcher for
+        as long as it is registered, so the cost of :meth:`poll` is
+        proportional to the number of active descriptors, not the
+        number of registered descriptors.
+
+        .. caution:: ``EPOLLET`` is ignored; all descriptors are
+           level-triggered. The event loop can't wait for urgent
+           data alone, so a descriptor registered for ``EPOLLPRI``
+           wakes :meth:`poll` when it's readable, and ``EPOLLPRI`` is
+           reported if urgent data is then pending.
+           The registrations are kept in the event loop; a kernel epoll
+           object is created only if :meth:`fileno` is called, and is
+           then kept up to date, so that its file descriptor is
+           readable when a registered descriptor is ready.
+
+        .. versionadded:: 1.3a2
+        """
+
+        def __init__(self, sizehint=-1, flags=0): # pylint:disable=unused-argument
+            self._poller = _WatcherPoller(get_hub().loop)
+            self.fds = self._poller.watchers # {int -> watcher}
+            self._masks = {} # {int -> eventmask}
+            # The kernel epoll object mirroring our registrations,
+            # once fileno() was called.
+            self._kernel = None
+
+        @property
+        def closed(self):
+            return self._poller is None
+
+        def close(self):
+            if self._poller is None:
+                return
+            self._poller.close()
+            self._poller = self.fds = self._masks = None
+            if self._kernel is not None:
+                self._kernel.close()
+                self._kernel = None
+
+        def __enter__(self):
+            self._check_closed()
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+        def fileno(self):
+            """
+            Return the file descriptor of a kernel epoll object with
+            the same registrations, creating it the first time.
+            """
+            self._check_closed()
+            if self._kernel is None:
+                kernel = original_epoll()
+                try:
+                    for fileno, eventmask in iteritems(self._masks):
+                        kernel.register(fileno, eventmask)
+                except:
+                    kernel.close()
+                    raise
+                self._kernel = kernel
+            return self._kernel.fileno()
+
+        def _check_closed(self):
+            if self._poller is None:
+                raise ValueError("I/O operation on closed epoll object")
+
+        @staticmethod
+        def _flags(eventmask):
+            flags = 0
+            if eventmask & (EPOLLIN | EPOLLPRI):
+                flags = _EV_READ
+            if eventmask & EPOLLOUT:
+                flags |= _EV_WRITE
+            return flags
+
+        @staticmethod
+        def _urgent(filenos):
+            # Which of the (readable) filenos have urgent data.
+            poller = _original_poll()
+            for fileno in filenos:
+                poller.register(fileno, POLLPRI)
+            return set(fileno for fileno, mask in poller.poll(0) if mask & POLLPRI)
+
+        def register(self, fd, eventmask=EPOLLIN | EPOLLOUT | EPOLLPRI):
+            self._check_closed()
+            fileno = get_fileno(fd)
+            if fileno in self._masks:
+                raise IOError(EEXIST, strerror(EEXIST))
+            # Like the kernel, refuse descriptors that are invalid or
+            # can't be polled (they would always be reported as ready).
+            mode = fstat(fileno).st_mode
+            if S_ISREG(mode) or S_ISDIR(mode):
+                raise IOError(EPERM, strerror(EPERM))
+            if self._kernel is not None:
+                self._kernel.register(fileno, eventmask)
+            self._poller.add(fileno, self._flags(eventmask))
+            self._masks[fileno] = eventmask
+
+        def modify(self, fd, eventmask):
+            """
+            Change the *eventmask* of a registered *fd*. The existing
+            watcher is reused.
+            """
+            self._check_closed()
+            fileno = get_fileno(fd)
+            if fileno not in self._masks:
+                raise IOError(ENOENT, strerror(ENOENT))
+            if self._kernel is not None:
+                self._kernel.modify(fileno, eventmask)
+            self._poller.modify(fileno, self._flags(eventmask))
+            self._masks[fileno] = eventmask
+
+        def unregister(self, fd):
+            self._check_closed()
+            fileno = get_fileno(fd)
+            if fileno not in self._masks:
+                raise IOError(ENOENT, strerror(ENOENT))
+            if self._kernel is not None:
+                try:
+                    self._kernel.unregister(fileno)
+                except (IOError, OSError):
+                    # Closed already, which the kernel took as
+                    # unregistering it.
+                    pass
+            self._poller.remove(fileno)
+            del self._masks[fileno]
+
+        @staticmethod
+        def _result_flags(mask, events, urgent):
+            # The epoll flags to report for a descriptor registered
+            # with *mask*, given the *events* from its watcher.
+            if events < 0:
+                return EPOLLERR
+            flags = 0
+            if events & _EV_READ:
+                flags = mask & EPOLLIN
+                if urgent:
+                    flags |= EPOLLPRI
+            if events & _EV_WRITE:
+                flags |= mask & EPOLLOUT
+            return flags
+
+        def poll(self, timeout=-1, maxevents=-1):
+            """
+            Wait for events on the registered descriptors.
+
+            :param float timeout: The maximum number of seconds to wait. ``None``
+                or a negative number means to wait forever.
+            :return: A list of ``(fd, eventmask)`` tuples.
+            """
+            self._check_closed()
+            if timeout is not None and timeout < 0:
+                timeout = None
+            ready = self._poller.wait(timeout)
+            if self._poller is None:
+                # Closed while we were waiting
+                return []
+
+            masks = self._masks
+            result = {}
+            order = []
+            urgent = [fileno for fileno, events in ready
+                      if events > 0 and events & _EV_READ and masks.get(fileno, 0) & EPOLLPRI]
+            if urgent:
+                urgent = self._urgent(urgent)
+            for fileno, events in ready:
+                mask = masks.get(fileno)
+                if mask is None:
+                    # Unregistered while we were waiting
+                    continue
+                flags = self._result_flags(mask, events, fileno in urgent)
+                if not flags:
+                    continue
+                if fileno in result:
+                    result[fileno] |= flags
+                else:
+                    result[fileno] = flags
+                    order.append(fileno)
+
+            if maxevents > 0:
+                # Whatever we leave out is still ready, so its watcher
+                # will fire again and it will be reported next time.
+                del order[maxevents:]
+
+            for fileno in order:
+                if masks[fileno] & EPOLLONESHOT:
+                    # Disabled until modified.
+                    self._poller.disable(fileno)
+            return [(fileno, result[fileno]) for fileno in order]
@@ -0,0 +1,152 @@
+# Copyright (c) 2018 gevent contributors. See LICENSE for details.
+"""
+A cooperative implementation of the standard :mod:`selectors` module.
+
+:class:`GeventSelector` waits using the gevent event loop, and
+:func:`gevent.monkey.patch_select` (with ``aggressive=True``, the
+default) makes it the :class:`selectors.DefaultSelector`.
+
+On Python 2, this module is only available if the ``selectors2``
+backport is installed.
+
+.. versionadded:: 1.3a2
+"""
+from __future__ import absolute_import
+
+try:
+    import selectors as __selectors__
+except ImportError:
+    # Probably on Python 2. Do we have the backport?
+    import selectors2 as __selectors__ # pylint:disable=import-error
+    __target__ = 'selectors2'
+
+from gevent.hub import get_hub
+from gevent.select import _WatcherPoller
+from gevent.select import _EV_READ
+from gevent.select import _EV_WRITE
+from gevent._util import copy_globals
+
+__implements__ = [
+    'DefaultSelector',
+]
+
+__extensions__ = [
+    'GeventSelector',
+]
+
+__imports__ = copy_globals(__selectors__, globals(),
+                           names_to_ignore=__implements__ + __extensions__,
+                           dunder_names_to_keep=())
+
+__all__ = __implements__ + __extensions__ + __imports__
+
+EVENT_READ = __selectors__.EVENT_READ
+EVENT_WRITE = __selectors__.EVENT_WRITE
+_BaseSelectorImpl = __selectors__._BaseSelectorImpl
+
+
+def _flags(events):
+    # The io watcher flags for selector *events*.
+    flags = 0
+    if events & EVENT_READ:
+        flags |= _EV_READ
+    if events & EVENT_WRITE:
+        flags |= _EV_WRITE
+    return flags
+
+
+def _events(flags):
+    # The selector events for io watcher *flags*.
+    events = 0
+    if flags & _EV_READ:
+        events |= EVENT_READ
+    if flags & _EV_WRITE:
+        events |= EVENT_WRITE
+    return events
+
+
+class GeventSelector(_BaseSelectorImpl):
+    """
+    A :class:`selectors.BaseSelector` that blocks only the current greenlet.
+
+    Each registered file object keeps a single io watcher for as long
+    as it is registered, and :meth:`modify` only changes the events of
+    that watcher. As with :class:`gevent.select.epoll`, the cost of
+    :meth:`select` is proportional to the number of active file
+    objects, not the number of registered file objects.
+
+    Only one greenlet at a time may call :meth:`select`. With a
+    *timeout* of zero or less, it returns what is ready now without
+    switching greenlets, like the standard selectors.
+    """
+
+    def __init__(self, hub=None):
+        super(GeventSelector, self).__init__()
+        if hub is None:
+            hub = get_hub()
+        self._poller = _WatcherPoller(hub.loop)
+
+    def register(self, fileobj, events, data=None):
+        key = super(GeventSelector, self).register(fileobj, events, data)
+        try:
+            self._poller.add(key.fd, _flags(events))
+        except:
+            super(GeventSelector, self).unregister(fileobj)
+            raise
+        return key
+
+    def unregister(self, fileobj):
+        key = super(GeventSelector, self).unregister(fileobj)
+        self._poller.remove(key.fd)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        try:
+            key = self._fd_to_key[self._fileobj_lookup(fileobj)]
+        except KeyError:
+            raise KeyError("{!r} is not registered".format(fileobj))
+
+        if events != key.events:
+            if (not events) or (events & ~(EVENT_READ | EVENT_WRITE)):
+                raise ValueError("Invalid events: {!r}".format(events))
+            self._poller.modify(key.fd, _flags(events))
+        elif data == key.data:
+            return key
+
+        key = key._replace(events=events, data=data)
+        self._fd_to_key[key.fd] = key
+        return key
+
+    def select(self, timeout=None):
+        if timeout is not None and timeout < 0:
+            # Like the standard selectors, just poll.
+            timeout = 0
+        ready = self._poller.wait(timeout)
+
+        result = {}
+        order = []
+        for fileno, events in ready:
+            key = self._key_from_fd(fileno)
+            if key is None:
+                # Unregistered while we were waiting
+                continue
+            if events < 0:
+                # An error; let the caller find out what it is.
+                events = key.events
+            else:
+                events = _events(events) & key.events
+                if not events:
+                    continue
+            if fileno in result:
+                result[fileno][1] |= events
+            else:
+                result[fileno] = entry = [key, events]
+                order.append(entry)
+        return [tuple(entry) for entry in order]
+
+    def close(self):
+        self._poller.close()
+        super(GeventSelector, self).close()
+
+
+DefaultSelector = GeventSelector
@@ -5,13 +5,17 @@ import sys
 from _socket import error as SocketError
 from _socket import SOL_SOCKET
 from _socket import SO_REUSEADDR
+try:
+    from _socket import SO_REUSEPORT
+except ImportError:
+    SO_REUSEPORT = None
 from _socket import AF_INET
 from _socket import SOCK_DGRAM
 
 from gevent.baseserver import BaseServer
 from gevent.socket import EWOULDBLOCK
 from gevent.socket import socket as GeventSocket
-from gevent._compat import PYPY, PY3
+from gevent._compat import PYPY, PY3, xrange
 
 __all__ = ['StreamServer', 'DatagramServer']
 
@@ -86,6 +90,10 @@ class StreamServer(BaseServer):
 
     .. versionchanged:: 1.2a2
        Add support for the *ssl_context* keyword argument.
+    .. versionchanged:: 1.3a2
+       Add the *workers* keyword argument.
+    .. versionchanged:: 1.3a2
+       Add the *reuse_port* keyword argument.
 
     """
     # the default backlog to use if none was provided in __init__
@@ -93,8 +101,28 @@ class StreamServer(BaseServer):
 
     reuse_addr = DEFAULT_REUSE_ADDR
 
-    def __init__(self, listener, handle=None, backlog=None, spawn='default', **ssl_args):
-        BaseServer.__init__(self, listener, handle=handle, spawn=spawn)
+    #: Whether to set ``SO_REUSEPORT`` on the listening socket the
+    #: server creates, so that other sockets (in this or other
+    #: processes) that also set it can listen on the same address.
+    #: The kernel then spreads incoming connections across all of
+    #: them. Can be set with the *reuse_port* constructor argument.
+    #:
+    #: With :attr:`~gevent.baseserver.BaseServer.workers`, this gives
+    #: each worker a listening socket of its own (created by the
+    #: master just before forking the worker; the master itself only
+    #: binds a socket to reserve the address), instead of every
+    #: worker waiting on the same socket and waking up for the same
+    #: connections.
+    #:
+    #: Availability: Platforms with ``SO_REUSEPORT``, such as Linux
+    #: 3.9 and later, and BSD.
+    #:
+    #: .. versionadded:: 1.3a2
+    reuse_port = False
+
+    def __init__(self, listener, handle=None, backlog=None, spawn='default', workers=None,
+                 reuse_port=None, **ssl_args):
+        BaseServer.__init__(self, listener, handle=handle, spawn=spawn, workers=workers)
         try:
             if ssl_args:
                 ssl_args.setdefault('server_side', True)
@@ -112,6 +140,12 @@ class StreamServer(BaseServer):
                 if hasattr(self, 'socket'):
                     raise TypeError('backlog must be None when a socket instance is passed')
                 self.backlog = backlog
+            if reuse_port is not None:
+                if hasattr(self, 'socket'):
+                    raise TypeError('reuse_port must be None when a socket instance is passed')
+                if reuse_port and SO_REUSEPORT is None:
+                    raise ValueError('SO_REUSEPORT is not supported on this platform')
+                self.reuse_port = reuse_port
         except:
             self.close()
             raise
@@ -131,18 +165,38 @@ class StreamServer(BaseServer):
         if not hasattr(self, 'socket'):
             # FIXME: clean up the socket lifetime
             # pylint:disable=attribute-defined-outside-init
-            self.socket = self.get_listener(self.address, self.backlog, self.family)
+            if not self.reuse_port:
+                self.socket = self.get_listener(self.address, self.backlog, self.family)
+            elif self.workers:
+                # Each worker will listen on a socket of its own.
+                self.socket = _tcp_socket(self.address, reuse_addr=self.reuse_addr,
+                                          family=self.family, reuse_port=True)
+            else:
+                self.socket = self.get_listener(self.address, self.backlog, self.family,
+                                                reuse_port=True)
             self.address = self.socket.getsockname()
         if self.ssl_args:
             self._handle = self.wrap_socket_and_handle
         else:
             self._handle = self.handle
 
+    def _get_worker_socket(self):
+        if self.reuse_port:
+            return self.get_listener(self.address, self.backlog, self.family,
+                                     reuse_port=True)
+
     @classmethod
-    def get_listener(cls, address, backlog=None, family=None):
+    def get_listener(cls, address, backlog=None, family=None, reuse_port=False):
+        """
+        Create, bind and return the listening socket for *address*.
+
+        .. versionchanged:: 1.3a2
+           Add the *reuse_port* argument.
+        """
         if backlog is None:
             backlog = cls.backlog
-        return _tcp_listener(address, backlog=backlog, reuse_addr=cls.reuse_addr, family=family)
+        return _tcp_listener(address, backlog=backlog, reuse_addr=cls.reuse_addr, family=family,
+                             reuse_port=reuse_port)
 
     if PY3:
 
@@ -194,14 +248,80 @@ class StreamServer(BaseServer):
 
 
 class DatagramServer(BaseServer):
-    """A UDP server"""
+    """A UDP server
+
+    .. versionchanged:: 1.3a2
+       Added the *batch_size*, *max_datagram_size* and
+       *receive_buffers* keyword arguments and :meth:`sendto_many`.
+    """
 
     reuse_addr = DEFAULT_REUSE_ADDR
 
+    #: If not None, the most datagrams to read each time the socket
+    #: becomes readable. They are passed to a single call of the
+    #: handler, as a list of ``(data, address)`` pairs, instead of
+    #: spawning a handler for each datagram. At high packet rates this
+    #: saves most of the cost of spawning. This can also be given to
+    #: the constructor as the *batch_size* keyword argument.
+    #:
+    #: .. versionadded:: 1.3a2
+    batch_size = None
+
+    #: The largest datagram that can be received; longer datagrams are
+    #: truncated. This can also be given to the constructor as the
+    #: *max_datagram_size* keyword argument.
+    #:
+    #: .. versionadded:: 1.3a2
+    max_datagram_size = 8192
+
+    #: If not None, the number of buffers of :attr:`max_datagram_size`
+    #: bytes to keep for receiving into, instead of allocating a new
+    #: string for each datagram. The handler is then given a
+    #: :class:`memoryview` of a buffer instead of a string; the buffer
+    #: is reused as soon as the handler returns, so a handler that
+    #: needs the data later must copy it (e.g., with ``bytes(data)``).
+    #: On Python 3, the view is released when the handler returns, so
+    #: using it afterwards raises :exc:`ValueError`; if the handler
+    #: kept a slice of it or another view of the buffer, the buffer
+    #: is not reused.
+    #: If more datagrams are being handled at once than there are
+    #: buffers, extra buffers are allocated, and discarded when they
+    #: are no longer in use. This can also be given to the constructor
+    #: as the *receive_buffers* keyword argument.
+    #:
+    #: .. versionadded:: 1.3a2
+    receive_buffers = None
+
     def __init__(self, *args, **kwargs):
+        batch_size = kwargs.pop('batch_size', None)
+        max_datagram_size = kwargs.pop('max_datagram_size', None)
+        receive_buffers = kwargs.pop('receive_buffers', None)
         # The raw (non-gevent) socket, if possible
         self._socket = None
+        # The free receive buffers, and the leased ones (with the view
+        # given to the handler) by the id of that view.
+        self._free_buffers = []
+        self._leased_buffers = {}
         BaseServer.__init__(self, *args, **kwargs)
+        try:
+            if batch_size is not None:
+                if batch_size < 1:
+                    raise ValueError('batch_size must be positive int: %r' % (batch_size, ))
+                self.batch_size = batch_size
+            if max_datagram_size is not None:
+                if max_datagram_size < 1:
+                    raise ValueError('max_datagram_size must be positive int: %r' % (max_datagram_size, ))
+                self.max_datagram_size = max_datagram_size
+            if receive_buffers is not None:
+                if receive_buffers < 0:
+                    raise ValueError('receive_buffers must be a non-negative int: %r' % (receive_buffers, ))
+                self.receive_buffers = receive_buffers
+        except:
+            self.close()
+            raise
+        if self.receive_buffers is not None:
+            self._free_buffers = [bytearray(self.max_datagram_size)
+                                  for _ in xrange(self.receive_buffers)]
         from gevent.lock import Semaphore
         self._writelock = Semaphore()
 
@@ -222,14 +342,78 @@ class DatagramServer(BaseServer):
         return _udp_socket(address, reuse_addr=cls.reuse_addr, family=family)
 
     def do_read(self):
+        if self.batch_size is not None:
+            return self._read_batch()
         try:
-            data, address = self._socket.recvfrom(8192)
+            data, address = self._recvfrom()
         except SocketError as err:
             if err.args[0] == EWOULDBLOCK:
                 return
             raise
         return data, address
 
+    def _recvfrom(self):
+        if self.receive_buffers is None:
+            return self._socket.recvfrom(self.max_datagram_size)
+        free = self._free_buffers
+        buf = free.pop() if free else bytearray(self.max_datagram_size)
+        try:
+            nbytes, address = self._socket.recvfrom_into(buf)
+        except:
+            if len(free) < self.receive_buffers:
+                free.append(buf)
+            raise
+        # Slices of this view share its export of the buffer, so
+        # _release can tell when the handler kept one.
+        data = memoryview(buf)[:nbytes]
+        self._leased_buffers[id(data)] = data, buf
+        return data, address
+
+    def _release(self, data):
+        lease = self._leased_buffers.pop(id(data), None)
+        if lease is None:
+            return
+        data, buf = lease
+        release = getattr(data, 'release', None)
+        if release is not None:
+            # Python 3: the handler can't use the data any more.
+            try:
+                release()
+            except BufferError:
+                # Something still uses the buffer; let it keep it.
+                return
+            if _exported(buf):
+                # The handler kept a slice of the data; reusing the
+                # buffer would change what it sees.
+                return
+        if len(self._free_buffers) < self.receive_buffers:
+            self._free_buffers.append(buf)
+
+    def do_close(self, data, *args):
+        # pylint:disable=arguments-differ
+        if self._leased_buffers:
+            if self.batch_size is not None:
+                for item in data:
+                    self._release(item[0])
+            else:
+                self._release(data)
+
+    def _read_batch(self):
+        recvfrom = self._recvfrom
+        batch = []
+        for _ in xrange(self.batch_size):
+            try:
+                batch.append(recvfrom())
+            except SocketError as err:
+                if err.args[0] == EWOULDBLOCK:
+                    break
+                if batch:
+                    # Report it next time, after handling what we have.
+                    break
+                raise
+        if batch:
+            return (batch,)
+
     def sendto(self, *args):
         self._writelock.acquire()
         try:
@@ -237,19 +421,52 @@ class DatagramServer(BaseServer):
         finally:
             self._writelock.release()
 
+    def sendto_many(self, datagrams):
+        """
+        Send each ``(data, address)`` pair from the iterable *datagrams*.
 
-def _tcp_listener(address, backlog=50, reuse_addr=None, family=AF_INET):
-    """A shortcut to create a TCP socket, bind it and put it into listening state."""
+        This takes the write lock only once, and sends without going
+        through the event loop for as long as the socket buffer has
+        room, so it's cheaper than calling :meth:`sendto` for each.
+
+        .. versionadded:: 1.3a2
+        """
+        raw_sendto = self._socket.sendto
+        self._writelock.acquire()
+        try:
+            for data, address in datagrams:
+                try:
+                    raw_sendto(data, address)
+                except SocketError as err:
+                    if err.args[0] != EWOULDBLOCK:
+                        raise
+                    # Wait until we can write.
+                    self.socket.sendto(data, address)
+        finally:
+            self._writelock.release()
+
+
+def _tcp_socket(address, reuse_addr=None, family=AF_INET, reuse_port=False):
+    """A shortcut to create a TCP socket and bind it."""
     sock = GeventSocket(family=family)
     if reuse_addr is not None:
         sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, reuse_addr)
+    if reuse_port:
+        sock.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
     try:
         sock.bind(address)
     except SocketError as ex:
+        sock.close()
         strerror = getattr(ex, 'strerror', None)
         if strerror is not None:
             ex.strerror = strerror + ': ' + repr(address)
         raise
+    return sock
+
+
+def _tcp_listener(address, backlog=50, reuse_addr=None, family=AF_INET, reuse_port=False):
+    """A shortcut to create a TCP socket, bind it and put it into listening state."""
+    sock = _tcp_socket(address, reuse_addr=reuse_addr, family=family, reuse_port=reuse_port)
     sock.listen(backlog)
     sock.setblocking(0)
     return sock
@@ -271,3 +488,14 @@ def _udp_socket(address, backlog=50, reuse_addr=None, family=AF_INET):
             ex.strerror = strerror + ': ' + repr(address)
         raise
     return sock
+
+
+def _exported(buf):
+    # Whether some view of the bytearray *buf* is still alive. Only
+    # a bytearray that isn't exported can be resized.
+    try:
+        buf.append(0)
+    except BufferError:
+        return True
+    del buf[-1]
+    return False
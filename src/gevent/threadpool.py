@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 import sys
 import os
+from collections import deque
 from gevent._compat import integer_types
 from gevent.hub import get_hub, getcurrent, sleep, _get_hub
 from gevent.event import AsyncResult
@@ -9,9 +10,11 @@ from gevent.greenlet import Greenlet
 from gevent.pool import GroupMappingMixin
 from gevent.lock import Semaphore
 from gevent._threading import Lock, Queue, start_new_thread
+from gevent._threading import acquire_with_timeout, get_ident
 
 
 __all__ = ['ThreadPool',
+           'WorkStealingThreadPool',
            'ThreadResult']
 
 
@@ -90,9 +93,12 @@ class ThreadPool(GroupMappingMixin):
         self._size = 0
         self._semaphore = Semaphore(1)
         self._lock = Lock()
-        self.task_queue = Queue()
+        self.task_queue = self._make_task_queue()
         self._set_maxsize(maxsize)
 
+    def _make_task_queue(self):
+        return Queue()
+
     def _on_fork(self):
         # fork() only leaves one thread; also screws up locks;
         # let's re-create locks and threads.
@@ -154,6 +160,16 @@ class ThreadPool(GroupMappingMixin):
                 self._size -= 1
             raise
 
+    def _acquire_slot(self, blocking=True):
+        # Return the semaphore we acquired, or None if *blocking* is
+        # false and there's no free slot.
+        while True:
+            semaphore = self._semaphore
+            if not semaphore.acquire(blocking=blocking):
+                return None
+            if semaphore is self._semaphore:
+                return semaphore
+
     def spawn(self, func, *args, **kwargs):
         """
         Add a new task to the threadpool that will run ``func(*args, **kwargs)``.
@@ -162,11 +178,7 @@ class ThreadPool(GroupMappingMixin):
 
         :return: A :class:`gevent.event.AsyncResult`.
         """
-        while True:
-            semaphore = self._semaphore
-            semaphore.acquire()
-            if semaphore is self._semaphore:
-                break
+        semaphore = self._acquire_slot()
 
         thread_result = None
         try:
@@ -186,6 +198,60 @@ class ThreadPool(GroupMappingMixin):
             raise
         return result
 
+    def spawn_many(self, func, iterable):
+        """
+        Add a task to the threadpool for each item of *iterable* that
+        will run ``func(item)``.
+
+        This is like calling :meth:`spawn` for each item, but cheaper
+        for many small tasks: they are added to the queue of the
+        threads in batches, as many at a time as there are free slots.
+        Waits whenever no slot is available.
+
+        :return: A list of :class:`gevent.event.AsyncResult`, one for
+            each item of *iterable*, in the same order.
+
+        .. versionadded:: 1.3a2
+        """
+        results = []
+        batch = []
+        try:
+            for item in iterable:
+                semaphore = self._acquire_slot(blocking=False)
+                if semaphore is None:
+                    self._put_many(batch)
+                    batch = []
+                    semaphore = self._acquire_slot()
+                result = AsyncResult()
+                try:
+                    thread_result = ThreadResult(result, hub=self.hub,
+                                                 call_when_ready=semaphore.release)
+                except:
+                    semaphore.release()
+                    raise
+                batch.append((func, (item,), {}, thread_result))
+                results.append(result)
+        finally:
+            self._put_many(batch)
+        return results
+
+    def _put_many(self, batch):
+        if batch:
+            self.task_queue.put_many(batch)
+            self.adjust()
+
+    def map(self, func, iterable):
+        """
+        Return a list made by applying the *func* to each element of
+        the iterable, using :meth:`spawn_many`.
+
+        .. versionchanged:: 1.3a2
+           Submit the tasks in bulk instead of one at a time.
+        """
+        if self._apply_immediately():
+            return [func(item) for item in iterable]
+        return [result.get() for result in self.spawn_many(func, iterable)]
+
     def _decrease_size(self):
         if sys is None:
             return
@@ -269,10 +335,305 @@ class ThreadPool(GroupMappingMixin):
         return True
 
 
+class WorkStealingThreadPool(ThreadPool):
+    """
+    A :class:`ThreadPool` where each worker thread has its own queue
+    of tasks, and takes tasks from the others when its own is empty.
+
+    This is meant for CPU-heavy work in C extensions that release the
+    GIL, such as compression or cryptography, submitted from many hubs
+    at once. The worker threads find their next task without taking a
+    lock shared with all the other workers and submitters; only
+    submitting a task and waking or parking an idle worker do.
+
+    :keyword float keepalive: How long, in seconds, an idle worker
+        thread waits for a new task before it exits. New threads are
+        started as tasks arrive, up to *maxsize*. The default, None,
+        keeps idle threads until the pool is made smaller, as
+        :class:`ThreadPool` does.
+    :keyword affinity: If true, pin each worker thread to one CPU,
+        going round the CPUs this process is allowed to run on. This
+        can also be a sequence of CPU numbers to go round instead.
+        Ignored where :func:`os.sched_setaffinity` isn't available.
+
+    .. versionadded:: 1.3a2
+    """
+
+    def __init__(self, maxsize, hub=None, keepalive=None, affinity=None):
+        if keepalive is not None and keepalive < 0:
+            raise ValueError('keepalive must not be negative: %r' % (keepalive, ))
+        self.keepalive = keepalive
+        self._cpus = None
+        if affinity and hasattr(os, 'sched_setaffinity'):
+            if affinity is True:
+                affinity = sorted(os.sched_getaffinity(0)) # pylint:disable=no-member
+            self._cpus = list(affinity)
+        ThreadPool.__init__(self, maxsize, hub)
+
+    def _make_task_queue(self):
+        return _StealingQueue(self.keepalive, self._cpus)
+
+    def _decrease_size(self):
+        # Called in a worker thread that is leaving. A task put after
+        # it left the queue, while no other worker was there, is
+        # orphaned; and the adjust() when it was spawned may have
+        # counted this thread, and not started one. Start one now.
+        if sys is None:
+            return
+        _lock = getattr(self, '_lock', None)
+        if _lock is None:
+            return
+        with _lock:
+            self._size -= 1
+            start = self.task_queue.orphaned and self._size < self._maxsize
+            if start:
+                self._size += 1
+        if start:
+            try:
+                start_new_thread(self._worker, ())
+            except:
+                with _lock:
+                    self._size -= 1
+                raise
+
+
+class _Worker(object):
+    __slots__ = ('tasks', 'wakeup')
+
+    def __init__(self):
+        self.tasks = deque()
+        # Held except while waking the worker up from being idle.
+        self.wakeup = Lock()
+        self.wakeup.acquire()
+
+_EMPTY = object()
+_RETIRED = object()
+
+
+class _StealingQueue(object):
+    # The task queue of a WorkStealingThreadPool, with the parts of
+    # the interface of gevent._threading.Queue that ThreadPool uses.
+    #
+    # Each worker thread has a deque of its own. A task put by a worker
+    # goes in its own deque; other tasks go to an idle worker if there
+    # is one, or else round the workers. A worker takes tasks from the
+    # front of its deque, or else from the back of the others'. That
+    # doesn't need the lock: single deque operations are atomic. Only
+    # putting tasks, and idle workers parking and being woken, do.
+
+    def __init__(self, keepalive=None, cpus=None):
+        self._lock = Lock()
+        self._done_lock = Lock()
+        self._put_count = 0 # guarded by _lock
+        self._done_count = 0 # guarded by _done_lock
+        self._keepalive = keepalive
+        self._cpus = cpus
+        self._started = 0
+        self._workers = []
+        self._by_thread = {}
+        self._idle = []
+        self._next = 0
+        # Tasks put while there were no workers.
+        self._orphans = deque()
+
+    @property
+    def unfinished_tasks(self):
+        return self._put_count - self._done_count
+
+    def task_done(self):
+        with self._done_lock:
+            self._done_count += 1
+
+    def put(self, item):
+        self.put_many((item,))
+
+    def put_many(self, items):
+        with self._lock:
+            for item in items:
+                self._put_count += 1
+                self._push(item)
+
+    def _push(self, item):
+        # Must hold the lock.
+        if self._idle:
+            worker = self._idle.pop()
+            worker.tasks.append(item)
+            worker.wakeup.release()
+            return
+        worker = self._by_thread.get(get_ident())
+        if worker is None and self._workers:
+            self._next = (self._next + 1) % len(self._workers)
+            worker = self._workers[self._next]
+        if worker is None:
+            self._orphans.append(item)
+        else:
+            worker.tasks.append(item)
+
+    @property
+    def orphaned(self):
+        # Are there tasks that no worker will take?
+        return bool(self._orphans) and not self._workers
+
+    def get(self):
+        worker = self._by_thread.get(get_ident())
+        if worker is None:
+            worker = self._register()
+        while True:
+            task = self._take(worker)
+            if task is _EMPTY:
+                task = self._park(worker)
+            if task is _RETIRED:
+                return None
+            if task is not _EMPTY:
+                if task is None:
+                    # The worker exits.
+                    self._unregister(worker)
+                return task
+
+    def _take(self, worker):
+        try:
+            return worker.tasks.popleft()
+        except IndexError:
+            pass
+        try:
+            return self._orphans.popleft()
+        except IndexError:
+            pass
+        for other in self._workers:
+            if other is not worker:
+                try:
+                    return other.tasks.pop()
+                except IndexError:
+                    pass
+        return _EMPTY
+
+    def _park(self, worker):
+        # Wait until woken up, and return _EMPTY to look for a task
+        # again. Return a task if one turns up before we wait, or
+        # _RETIRED if we wait longer than the keepalive.
+        with self._lock:
+            self._idle.append(worker)
+        # Nothing put before we were idle woke us up.
+        task = self._take(worker)
+        if task is _EMPTY and acquire_with_timeout(worker.wakeup, self._keepalive):
+            return _EMPTY
+        with self._lock:
+            if worker in self._idle:
+                self._idle.remove(worker)
+                if task is _EMPTY:
+                    if worker.tasks or self._orphans:
+                        # Something came in after all.
+                        return _EMPTY
+                    # Retire as if we had been given None, which
+                    # the pool will count as done. Nothing can be
+                    # put in our deque from now on.
+                    self._remove(worker)
+                    self._put_count += 1
+                    return _RETIRED
+            else:
+                # We were woken up at the same time; don't leave the
+                # wakeup for next time.
+                worker.wakeup.acquire()
+        return task
+
+    def _register(self):
+        worker = _Worker()
+        with self._lock:
+            self._workers.append(worker)
+            self._by_thread[get_ident()] = worker
+            started = self._started
+            self._started += 1
+        if self._cpus:
+            try:
+                os.sched_setaffinity(0, (self._cpus[started % len(self._cpus)],)) # pylint:disable=no-member
+            except OSError:
+                # The CPU may have gone offline; the thread can
+                # still run anywhere.
+                pass
+        return worker
+
+    def _unregister(self, worker):
+        with self._lock:
+            self._remove(worker)
+
+    def _remove(self, worker):
+        # Must hold the lock, in the worker's thread.
+        self._workers.remove(worker)
+        del self._by_thread[get_ident()]
+        # Hand on anything still in our deque.
+        while True:
+            try:
+                item = worker.tasks.popleft()
+            except IndexError:
+                break
+            self._push(item)
+
+
+class _Completions(object):
+    # Delivers ThreadResults that are ready to the hub using one async
+    # watcher, so that any number of them that become ready in
+    # other threads between two iterations of the loop are handled
+    # with a single wakeup, and no native watcher has to be created
+    # for each one. There is one of these per hub.
+
+    def __init__(self, hub):
+        self.hub = hub
+        self._ready = deque()
+        self._pending = 0
+        # The watcher stays started; while nothing is pending it
+        # doesn't keep the loop alive.
+        self._watcher = hub.loop.async_(ref=False)
+        self._watcher.start(self._on_async)
+
+    def expect(self):
+        # Called in the hub's thread for each ThreadResult using us.
+        self._pending += 1
+        if self._pending == 1:
+            self._watcher.ref = True
+
+    def cancel(self):
+        self._pending -= 1
+        if not self._pending:
+            self._watcher.ref = False
+
+    def put(self, thread_result):
+        # Called in any thread. deque.append is atomic.
+        self._ready.append(thread_result)
+        self._watcher.send()
+
+    def close(self):
+        self._ready.clear()
+        self._pending = 0
+        self._watcher.stop()
+        self._watcher.close()
+
+    def _on_async(self):
+        ready = self._ready
+        while ready:
+            thread_result = ready.popleft()
+            if thread_result._completions is not self:
+                # Destroyed after it was queued; it's no longer
+                # pending.
+                continue
+            self.cancel()
+            try:
+                thread_result._on_async()
+            except: # pylint:disable=bare-except
+                # Don't leave the rest waiting for another wakeup.
+                self.hub.handle_error(thread_result, *sys.exc_info())
+
+
+def _get_completions(hub):
+    completions = hub._thread_result_completions
+    if completions is None:
+        completions = hub._thread_result_completions = _Completions(hub)
+    return completions
+
+
 class ThreadResult(object):
 
     # Using slots here helps to debug reference cycles/leaks
-    __slots__ = ('exc_info', 'async_watcher', '_call_when_ready', 'value',
+    __slots__ = ('exc_info', '_completions', '_call_when_ready', 'value',
                  'context', 'hub', 'receiver')
 
     def __init__(self, receiver, hub=None, call_when_ready=None):
@@ -283,17 +644,16 @@ class ThreadResult(object):
         self.context = None
         self.value = None
         self.exc_info = ()
-        self.async_watcher = hub.loop.async_()
         self._call_when_ready = call_when_ready
-        self.async_watcher.start(self._on_async)
+        self._completions = _get_completions(hub)
+        self._completions.expect()
 
     @property
     def exception(self):
         return self.exc_info[1] if self.exc_info else None
 
     def _on_async(self):
-        self.async_watcher.stop()
-        self.async_watcher.close()
+        self._completions = None
         if self._call_when_ready:
             # Typically this is pool.semaphore.release and we have to
             # call this in the Hub; if we don't we get the dreaded
@@ -303,7 +663,6 @@ class ThreadResult(object):
             if self.exc_info:
                 self.hub.handle_error(self.context, *self.exc_info)
             self.context = None
-            self.async_watcher = None
             self.hub = None
             self._call_when_ready = None
             if self.receiver is not None:
@@ -315,18 +674,20 @@ class ThreadResult(object):
                 self.exc_info = (self.exc_info[0], self.exc_info[1], None)
 
     def destroy(self):
-        if self.async_watcher is not None:
-            self.async_watcher.stop()
-            self.async_watcher.close()
-        self.async_watcher = None
+        completions = self._completions
+        self._completions = None
+        if completions is not None:
+            completions.cancel()
         self.context = None
         self.hub = None
         self._call_when_ready = None
         self.receiver = None
 
     def _ready(self):
-        if self.async_watcher is not None:
-            self.async_watcher.send()
+        # Called in the worker thread.
+        completions = self._completions
+        if completions is not None:
+            completions.put(self)
 
     def set(self, value):
         self.value = value
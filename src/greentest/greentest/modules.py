@@ -26,7 +26,7 @@ import gevent
 from greentest import sysinfo
 from greentest import six
 
-OPTIONAL_MODULES = ['resolver_ares']
+OPTIONAL_MODULES = ['resolver_ares', 'selectors']
 
 
 def walk_modules(basedir=None, modpath=None, include_so=False, recursive=False):
@@ -874,9 +874,6 @@ if PY35:
         # XXX: Hangs
         'test_ssl.ThreadedTests.test_nonblocking_send',
         'test_ssl.ThreadedTests.test_socketserver',
-        # Uses direct sendfile, doesn't properly check for it being enabled
-        'test_socket.GeneralModuleTests.test__sendfile_use_sendfile',
-
 
         # Relies on the regex of the repr having the locked state (TODO: it'd be nice if
         # we did that).
@@ -929,26 +926,6 @@ if PY36:
         'test_threading.MiscTestCase.test__all__',
     ]
 
-    # We don't actually implement socket._sendfile_use_sendfile,
-    # so these tests, which think they're using that and os.sendfile,
-    # fail.
-    disabled_tests += [
-        'test_socket.SendfileUsingSendfileTest.testCount',
-        'test_socket.SendfileUsingSendfileTest.testCountSmall',
-        'test_socket.SendfileUsingSendfileTest.testCountWithOffset',
-        'test_socket.SendfileUsingSendfileTest.testOffset',
-        'test_socket.SendfileUsingSendfileTest.testRegularFile',
-        'test_socket.SendfileUsingSendfileTest.testWithTimeout',
-        'test_socket.SendfileUsingSendfileTest.testEmptyFileSend',
-        'test_socket.SendfileUsingSendfileTest.testNonBlocking',
-        'test_socket.SendfileUsingSendfileTest.test_errors',
-    ]
-
-    # Ditto
-    disabled_tests += [
-        'test_socket.GeneralModuleTests.test__sendfile_use_sendfile',
-    ]
-
     disabled_tests += [
         # This test requires Linux >= 4.3. When we were running 'dist:
         # trusty' on the 4.4 kernel, it passed (~July 2017). But when
@@ -19,6 +19,7 @@ MAPPING = {
     'gevent.threading': 'threading',
     'gevent.builtins': 'builtins' if six.PY3 else '__builtin__',
     'gevent.signal': 'signal',
+    'gevent.selectors': 'selectors',
 }
 
 
@@ -1,11 +1,14 @@
 from __future__ import print_function
+import io
 import os
 import sys
 import tempfile
+import time
 import gc
 
 import gevent
 from gevent.fileobject import FileObject, FileObjectThread
+from gevent._fileobjectcommon import FileObjectClosed
 
 import greentest
 from greentest.sysinfo import PY3
@@ -150,6 +153,153 @@ class Test(greentest.TestCase):
         b = x.read(1)
         self.assertEqual(b, b'2')
 
+class TestThreadBlocks(greentest.TestCase):
+
+    block_size = 16
+
+    def _file(self, data=b''):
+        fileno, path = tempfile.mkstemp('.gevent.test__fileobject.TestThreadBlocks')
+        self.addCleanup(os.remove, path)
+        os.write(fileno, data)
+        os.close(fileno)
+        return path
+
+    def _open(self, path, mode='rb'):
+        f = FileObjectThread(open(path, mode), block_size=self.block_size)
+        self._close_on_teardown(f)
+        return f
+
+    def test_readline(self):
+        lines = [b'%d %s\n' % (i, b'x' * i) for i in range(40)] + [b'last']
+        f = self._open(self._file(b''.join(lines)))
+        self.assertEqual(f.readline(), lines[0])
+        self.assertEqual(f.readline(3), lines[1][:3])
+        self.assertEqual(f.readline(), lines[1][3:])
+        self.assertEqual(list(f), lines[2:])
+        self.assertEqual(f.readline(), b'')
+
+    def test_read(self):
+        data = os.urandom(1000)
+        f = self._open(self._file(data))
+        self.assertEqual(f.read(10), data[:10])
+        # What's left of the first block
+        self.assertEqual(f.read1(), data[10:self.block_size])
+        self.assertEqual(f.read(100), data[self.block_size:100 + self.block_size])
+        self.assertEqual(f.read(), data[100 + self.block_size:])
+        self.assertEqual(f.read(), b'')
+
+    def test_tell_seek(self):
+        data = b''.join(b'line %d\n' % i for i in range(20))
+        f = self._open(self._file(data))
+        f.readline()
+        self.assertEqual(f.tell(), len(b'line 0\n'))
+        f.seek(2, 1)
+        self.assertEqual(f.read(4), data[9:13])
+        f.seek(0)
+        self.assertEqual(f.readlines(), data.splitlines(True))
+
+    def test_seek_after_read(self):
+        data = os.urandom(100)
+        f = self._open(self._file(data))
+        self.assertEqual(f.read(3), data[:3])
+        f.seek(2, 1)
+        self.assertEqual(f.read(4), data[5:9])
+        f.seek(-4, 2)
+        self.assertEqual(f.read(), data[-4:])
+        # The underlying file was left where we are.
+        self.assertEqual(os.lseek(f.fileno(), 0, os.SEEK_CUR), len(data))
+
+    def test_readall(self):
+        data = os.urandom(100)
+        f = FileObjectThread(io.FileIO(self._file(data), 'rb'), block_size=self.block_size)
+        self._close_on_teardown(f)
+        self.assertEqual(f.read(5), data[:5])
+        self.assertEqual(f.readall(), data[5:])
+        self.assertEqual(f.read(), b'')
+
+    def test_unbuffered_after_write(self):
+        path = self._file()
+        f = FileObjectThread(io.FileIO(path, 'w+b'), block_size=self.block_size)
+        self._close_on_teardown(f)
+        f.write(b'abc')
+        # The write is still waiting in the buffer; fileno() syncs it.
+        with open(path, 'rb') as raw:
+            self.assertEqual(raw.read(), b'')
+        self.assertEqual(os.lseek(f.fileno(), 0, os.SEEK_CUR), 3)
+        with open(path, 'rb') as raw:
+            self.assertEqual(raw.read(), b'abc')
+
+    def test_write(self):
+        path = self._file()
+        f = self._open(path, 'wb')
+        buf = bytearray(b'abc')
+        f.write(buf)
+        buf[:] = b'XYZ'
+        f.writelines([b'x' * 10] * 10)
+        self.assertEqual(f.tell(), 103)
+        f.close()
+        with open(path, 'rb') as raw:
+            self.assertEqual(raw.read(), b'abc' + b'x' * 100)
+
+    def test_read_write(self):
+        path = self._file(b'0123456789' * 10)
+        f = self._open(path, 'r+b')
+        self.assertEqual(f.read(5), b'01234')
+        f.write(b'-----')
+        f.seek(0)
+        self.assertEqual(f.read(12), b'01234-----01')
+        f.close()
+        with open(path, 'rb') as raw:
+            self.assertEqual(raw.read(15), b'01234-----01234')
+
+    def test_write_error(self):
+        f = self._open(self._file(), 'rb')
+        # The error comes from the background write.
+        f.write(b'x' * self.block_size)
+        with self.assertRaises((IOError, OSError)):
+            f.flush()
+
+    def test_readinto_peek(self):
+        data = os.urandom(100)
+        f = self._open(self._file(data))
+        self.assertEqual(f.read(5), data[:5])
+        buf = bytearray(4)
+        self.assertEqual(f.readinto(buf), 4)
+        self.assertEqual(buf, data[5:9])
+        self.assertEqual(f.peek(1)[:1], data[9:10])
+        buf = bytearray(100)
+        n = f.readinto1(buf)
+        self.assertEqual(buf[:n], data[9:9 + n])
+        self.assertEqual(f.read(), data[9 + n:])
+
+    def test_read_interrupted(self):
+        lines = [b'line %03d\n' % i for i in range(10)]
+
+        class Slow(io.BytesIO):
+            def read(self, *args):
+                time.sleep(0.05)
+                return io.BytesIO.read(self, *args)
+
+        f = FileObjectThread(Slow(b''.join(lines)), block_size=self.block_size)
+        self._close_on_teardown(f)
+        with self.assertRaises(gevent.Timeout):
+            with gevent.Timeout(0.01):
+                f.readline()
+        # The block being read when the Timeout came isn't lost.
+        self.assertEqual(f.readline(), lines[0])
+        self.assertEqual(list(f), lines[1:])
+
+    def test_closed(self):
+        f = self._open(self._file(b'abc'))
+        f.close()
+        self.assertRaises(FileObjectClosed, f.readline)
+        self.assertRaises(FileObjectClosed, f.write, b'x')
+
+    def test_bad_arguments(self):
+        self.assertRaises(ValueError, FileObjectThread, io.BytesIO(), block_size=0)
+        self.assertRaises(ValueError, FileObjectThread, io.StringIO(), block_size=16)
+
+
 def writer(fobj, line):
     for character in line:
         fobj.write(character)
@@ -94,20 +94,61 @@ class TestLink(greentest.TestCase):
         results = [q.get().get(), q.get().get(), q.get().get()]
         assert sorted(results) == [101, 102, 103], results
 
+    def test_rawlink_order(self):
+        p = gevent.spawn(lambda: 100)
+        calls = []
+        first = lambda _: calls.append('first')
+        p.rawlink(first)
+        p.rawlink(lambda _: calls.append('second'))
+        p.unlink(first)
+        p.rawlink(lambda _: calls.append('third'))
+        p.join()
+        self.assertEqual(calls, ['second', 'third'])
+
+    def test_rawlink_while_notifying(self):
+        p = gevent.spawn(lambda: 100)
+        calls = []
+
+        def link(_):
+            calls.append('link')
+            p.rawlink(lambda _: calls.append('added'))
+
+        p.rawlink(link)
+        p.join()
+        gevent.sleep(0)
+        self.assertEqual(calls, ['link', 'added'])
+
+    def test_links_notified_together(self):
+        # Greenlets that finish in the same loop iteration are
+        # notified by the same callback.
+        greenlets = [gevent.spawn(lambda: None) for _ in range(3)]
+        notifiers = []
+        greenlets[0].rawlink(lambda _: notifiers.extend(g._notifier for g in greenlets))
+        for g in greenlets[1:]:
+            g.rawlink(lambda _: None)
+        gevent.joinall(greenlets)
+        self.assertIsNone(notifiers[0])
+        self.assertIsNotNone(notifiers[1])
+        self.assertIs(notifiers[1], notifiers[2])
+
 
 class TestUnlink(greentest.TestCase):
     switch_expected = False
 
     def _test_func(self, p, link):
         link(dummy_test_func)
-        assert len(p._links) == 1, p._links
+        assert p._link == dummy_test_func, p._link
         p.unlink(dummy_test_func)
-        assert not p._links, p._links
+        assert not p._has_links(), p._link
 
         link(self.setUp)
+        link(dummy_test_func)
+        assert p._link == self.setUp, p._link
         assert len(p._links) == 1, p._links
         p.unlink(self.setUp)
-        assert not p._links, p._links
+        assert p._link is None, p._link
+        p.unlink(dummy_test_func)
+        assert not p._has_links(), p._links
         p.kill()
 
     def test_func_link(self):
@@ -170,6 +211,7 @@ class TestReturn_link(LinksTestCase):
     link_method = 'link'
 
     def cleanup(self):
+        self.p._link = None
         while self.p._links:
             self.p._links.pop()
 
@@ -705,6 +747,130 @@ class TestRef(greentest.TestCase):
             g.kill()
 
 
+class TestSpawnPooled(greentest.TestCase):
+
+    def _run(self, function, *args, **kwargs):
+        gevent.spawn_pooled(function, *args, **kwargs)
+        gevent.sleep(0.001)
+
+    def test_non_callable(self):
+        self.assertRaises(TypeError, gevent.spawn_pooled, 1)
+
+    def test_args(self):
+        value = []
+        self._run(lambda *args, **kwargs: value.append((args, kwargs)), 1, name='value')
+        self.assertEqual(value, [((1,), {'name': 'value'})])
+
+    def test_reused(self):
+        current = []
+        for _ in range(3):
+            self._run(lambda: current.append(gevent.getcurrent()))
+        self.assertEqual(len(set(current)), 1)
+        self.assertNotIsInstance(current[0], gevent.Greenlet)
+
+    def test_error(self):
+        current = []
+
+        def fail():
+            current.append(gevent.getcurrent())
+            raise ExpectedError('expected')
+
+        self.expect_one_error()
+        self._run(fail)
+        self.assert_error(ExpectedError, 'expected')
+        self._run(lambda: current.append(gevent.getcurrent()))
+        self.assertIs(current[0], current[1])
+
+    def test_killed(self):
+        current = []
+
+        def task():
+            current.append(gevent.getcurrent())
+            gevent.sleep(10)
+
+        gevent.spawn_pooled(task)
+        gevent.sleep(0.001)
+        gevent.kill(current[0])
+        gevent.sleep(0.001)
+        self.assertTrue(current[0].dead)
+        self.assertNotIn(current[0], gevent.get_hub()._pooled_greenlets)
+
+    def test_killed_idle(self):
+        current = []
+        self._run(lambda: current.append(gevent.getcurrent()))
+        idle = gevent.get_hub()._pooled_greenlets
+        self.assertIn(current[0], idle)
+        gevent.kill(current[0])
+        gevent.sleep(0.001)
+        self.assertTrue(current[0].dead)
+        self.assertNotIn(current[0], idle)
+
+    def test_locals_cleared(self):
+        from gevent.local import local
+        data = local()
+        seen = []
+
+        def task(value):
+            seen.append(getattr(data, 'value', None))
+            data.value = value
+            gevent.getcurrent().attribute = value
+
+        def check():
+            seen.append(getattr(data, 'value', None))
+            seen.append(getattr(gevent.getcurrent(), 'attribute', None))
+
+        self._run(task, 1)
+        self._run(check)
+        self.assertEqual(seen, [None, None, None])
+
+    def _idle(self):
+        current = []
+        self._run(lambda: current.append(gevent.getcurrent()))
+        self.assertIn(current[0], gevent.get_hub()._pooled_greenlets)
+        return current[0]
+
+    def _assertReused(self, idle):
+        current = []
+        self._run(lambda: current.append(gevent.getcurrent()))
+        self.assertEqual(current, [idle])
+
+    def test_stale_switch(self):
+        idle = self._idle()
+        gevent.get_hub().loop.run_callback(idle.switch, 'stale')
+        gevent.sleep(0.001)
+        self.assertFalse(idle.dead)
+        self._assertReused(idle)
+
+    def test_stale_throw(self):
+        idle = self._idle()
+        gevent.get_hub().loop.run_callback(idle.throw, ExpectedError('stale'))
+        gevent.sleep(0.001)
+        self.assertFalse(idle.dead)
+        self._assertReused(idle)
+
+    def test_stale_timeout(self):
+        def task():
+            # Started, but never cancelled.
+            gevent.Timeout(0.01).start()
+
+        self._run(task)
+        idle = gevent.get_hub()._pooled_greenlets[-1]
+        gevent.sleep(0.05)
+        self.assertFalse(idle.dead)
+        self._assertReused(idle)
+
+    def test_max_pooled_greenlets(self):
+        hub = gevent.get_hub()
+        hub.max_pooled_greenlets = 2
+        try:
+            for _ in range(5):
+                gevent.spawn_pooled(lambda: None)
+            gevent.sleep(0.001)
+            self.assertEqual(len(hub._pooled_greenlets), 2)
+        finally:
+            del hub.max_pooled_greenlets
+
+
 X = object()
 
 if __name__ == '__main__':
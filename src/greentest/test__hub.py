@@ -113,5 +113,79 @@ class TestWaiter(greentest.TestCase):
         g.kill()
 
 
+class TestWaitAny(greentest.GenericWaitTestCase):
+
+    def wait(self, timeout):
+        with get_hub().loop.timer(10) as t:
+            get_hub().wait_any([t], timeout)
+
+    def test_first_ready(self):
+        loop = get_hub().loop
+        with loop.timer(0.01) as fast, loop.timer(10) as slow:
+            self.assertEqual(get_hub().wait_any([slow, fast]), [fast])
+            self.assertFalse(fast.active)
+            self.assertFalse(slow.active)
+
+    def test_pass_events(self):
+        r, w = socket.socketpair()
+        self._close_on_teardown(r)
+        self._close_on_teardown(w)
+        loop = get_hub().loop
+        w.send(b'x')
+        reader = loop.io(r.fileno(), 1)
+        other = loop.io(w.fileno(), 1)
+        try:
+            result = get_hub().wait_any([reader, other], 1, pass_events=True)
+        finally:
+            reader.close()
+            other.close()
+        self.assertEqual(len(result), 1)
+        self.assertIs(result[0][0], reader)
+        self.assertEqual(result[0][1] & 1, 1)
+
+
+class TestWaitAll(greentest.TestCase):
+
+    def test_all_ready(self):
+        loop = get_hub().loop
+        with loop.timer(0.01) as t1, loop.timer(0.02) as t2:
+            result = get_hub().wait_all([t2, t1])
+        self.assertEqual(result, [t1, t2])
+
+    def test_timeout(self):
+        loop = get_hub().loop
+        with loop.timer(0.01) as fast, loop.timer(10) as slow:
+            result = get_hub().wait_all([fast, slow], DELAY)
+        self.assertEqual(result, [fast])
+
+    def test_empty(self):
+        self.switch_expected = False
+        self.assertEqual(get_hub().wait_all([], 10), [])
+
+
+class TestDestroy(greentest.TestCase):
+
+    def test_shared_helpers(self):
+        # The hub's link notifier and ThreadResult completions go
+        # with it.
+        import threading
+        self.switch_expected = False
+        state = []
+
+        def run():
+            hub = get_hub()
+            gevent.spawn(lambda: None).join()
+            hub.threadpool.apply(abs, (-1,))
+            state.append(hub._greenlet_link_notifier is not None)
+            state.append(hub._thread_result_completions is not None)
+            hub.destroy(destroy_loop=True)
+            state.append(hub._greenlet_link_notifier)
+            state.append(hub._thread_result_completions)
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(state, [True, True, None, None])
+
+
 if __name__ == '__main__':
     greentest.main()
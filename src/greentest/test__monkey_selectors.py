@@ -17,6 +17,10 @@ if sys.platform != 'win32' and sys.version_info[:2] >= (3, 4):
             _select = selectors.SelectSelector._select
             self.assertTrue(hasattr(_select, '_gevent_monkey'), dir(_select))
 
+        def test_default_selector_is_patched(self):
+            from gevent.selectors import GeventSelector
+            self.assertIs(selectors.DefaultSelector, GeventSelector)
+
 
 if __name__ == '__main__':
     greentest.main()
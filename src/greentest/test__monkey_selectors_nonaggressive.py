@@ -0,0 +1,20 @@
+import sys
+import greentest
+try:
+    import selectors # Do this before the patch, just to force it
+except ImportError:
+    pass
+from gevent.monkey import patch_select
+patch_select(aggressive=False)
+
+if sys.platform != 'win32' and sys.version_info[:2] >= (3, 4):
+
+    class TestSelectors(greentest.TestCase):
+
+        def test_default_selector_is_not_patched(self):
+            from gevent.selectors import GeventSelector
+            self.assertIsNot(selectors.DefaultSelector, GeventSelector)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -1,4 +1,5 @@
 from time import time
+import itertools
 import gevent
 from gevent import pool
 from gevent.event import Event
@@ -597,5 +598,99 @@ class TestErrorInHandler(greentest.TestCase):
         self.assertRaises(StopIteration, next, it)
 
 
+class TestIMapBackpressure(greentest.TestCase):
+
+    def _check(self, meth):
+        taken = []
+
+        def source():
+            for i in range(20):
+                taken.append(i)
+                yield i
+
+        p = pool.Pool(10)
+        mapping = getattr(p, meth)(lambda x: x, source(), maxsize=3)
+        result = []
+        for x in mapping:
+            # However slow we are, at most maxsize results are
+            # waiting for us or being computed, and the source is
+            # read no further ahead than that.
+            result.append(x)
+            gevent.sleep(0.001)
+            self.assertLessEqual(len(taken) - len(result), 3)
+            self.assertLessEqual(len(mapping.queue), 3)
+        self.assertEqual(sorted(result), list(range(20)))
+
+    def test_imap(self):
+        self._check('imap')
+
+    def test_imap_unordered(self):
+        self._check('imap_unordered')
+
+    def test_infinite_source(self):
+        p = pool.Pool(2)
+        mapping = p.imap(lambda x: x * 2, itertools.count(), maxsize=5)
+        self.assertEqual([next(mapping) for _ in range(100)], list(range(0, 200, 2)))
+        mapping.kill()
+
+
+class TestTaskGroup(greentest.TestCase):
+    error_fatal = False
+
+    def test_waits_for_all(self):
+        results = []
+        with pool.TaskGroup() as group:
+            for i in range(3):
+                group.spawn(lambda i: (gevent.sleep(0.01 * i), results.append(i)), i)
+        self.assertEqual(results, [0, 1, 2])
+        self.assertEqual(len(group), 0)
+        self.assertIsNone(group.failed)
+
+    def test_failure_cancels_siblings(self):
+        finished = []
+
+        def slow():
+            gevent.sleep(10)
+            finished.append('slow')
+
+        start = time()
+        with self.assertRaises(ZeroDivisionError):
+            with pool.TaskGroup() as group:
+                siblings = [group.spawn(slow) for _ in range(3)]
+                failing = group.spawn(divide_by, 0)
+                gevent.sleep(0.01)
+                self.assertTrue(all(g.dead for g in siblings))
+                # Added after the failure: killed at once.
+                late = group.spawn(slow)
+        self.assertLess(time() - start, 1)
+        self.assertEqual(finished, [])
+        self.assertIs(group.failed, failing)
+        self.assertTrue(late.dead)
+        self.assertTrue(all(g.successful() for g in siblings))
+
+    def test_error_in_block_kills_children(self):
+        with self.assertRaises(ExpectedException):
+            with pool.TaskGroup() as group:
+                child = group.spawn(gevent.sleep, 10)
+                gevent.sleep(0)
+                raise ExpectedException('in block')
+        self.assertTrue(child.dead)
+        self.assertEqual(len(group), 0)
+
+    def test_deadline(self):
+        start = time()
+        with self.assertRaises(Timeout):
+            with pool.TaskGroup(timeout=0.1) as group:
+                children = [group.spawn(gevent.sleep, 10) for _ in range(3)]
+        self.assertLess(time() - start, 1)
+        self.assertTrue(all(g.dead for g in children))
+
+    def test_deadline_not_reached(self):
+        with pool.TaskGroup(timeout=0.2) as group:
+            group.spawn(gevent.sleep, 0.01)
+        # The deadline doesn't fire later
+        gevent.sleep(0.3)
+
+
 if __name__ == '__main__':
     greentest.main()
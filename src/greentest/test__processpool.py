@@ -0,0 +1,225 @@
+import os
+import pickle
+import time
+
+import greentest
+import gevent
+
+if hasattr(os, 'fork'):
+    from gevent.processpool import ProcessPool
+
+
+def sqr(x, delay=0):
+    time.sleep(delay)
+    return x * x
+
+
+def fail(message):
+    raise greentest.ExpectedException(message)
+
+
+def unpicklable():
+    return lambda: None
+
+
+def echo(value):
+    return value
+
+
+def pid_after(delay):
+    time.sleep(delay)
+    return os.getpid()
+
+
+def is_open(fd):
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+@greentest.skipIf(not hasattr(os, 'fork'), "Needs fork")
+class TestCase(greentest.TestCase):
+
+    size = 2
+    maxtasksperchild = None
+    __timeout__ = greentest.LARGE_TIMEOUT
+
+    def setUp(self):
+        greentest.TestCase.setUp(self)
+        self.pool = ProcessPool(self.size, maxtasksperchild=self.maxtasksperchild)
+
+    def tearDown(self):
+        self.pool.join()
+        self.pool.kill()
+        greentest.TestCase.tearDown(self)
+
+
+class TestProcessPool(TestCase):
+
+    def test_apply(self):
+        self.assertEqual(self.pool.apply(sqr, (5,)), 25)
+        self.assertEqual(self.pool.apply(sqr, (5,), {'delay': 0.01}), 25)
+
+    def test_in_other_process(self):
+        pids = set(self.pool.map(pid_after, [0.05] * 10))
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_map(self):
+        self.assertEqual(self.pool.map(sqr, range(50)), [sqr(x) for x in range(50)])
+
+    def test_imap_unordered(self):
+        self.assertEqual(sorted(self.pool.imap_unordered(sqr, range(50))),
+                         [sqr(x) for x in range(50)])
+
+    def test_parallel(self):
+        # Both workers sleep at once, and the hub keeps running.
+        ticks = []
+        ticker = gevent.spawn(lambda: [ticks.append(gevent.sleep(0.05)) for _ in range(4)])
+        start = time.time()
+        self.assertEqual(list(self.pool.imap(sqr, [2, 3], [0.5, 0.5])), [4, 9])
+        self.assertLess(time.time() - start, 0.9)
+        ticker.join()
+        self.assertEqual(len(ticks), 4)
+
+    def test_error(self):
+        with self.assertRaises(greentest.ExpectedException) as exc:
+            self.pool.apply(fail, ('oops',))
+        self.assertEqual(str(exc.exception), 'oops')
+        self.assertEqual(self.pool.apply(sqr, (3,)), 9)
+
+    def test_unpicklable_task(self):
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            self.pool.spawn(unpicklable())
+        self.assertEqual(len(self.pool), 0)
+
+    def test_unpicklable_result(self):
+        with self.assertRaises((pickle.PicklingError, AttributeError, TypeError)):
+            self.pool.apply(unpicklable)
+        self.assertEqual(self.pool.apply(sqr, (3,)), 9)
+
+    def test_large(self):
+        data = os.urandom(1 << 20) * 3
+        self.assertEqual(self.pool.apply(echo, (data,)), data)
+        data = bytearray(data)
+        self.assertEqual(self.pool.apply(echo, (data,)), data)
+
+    def test_worker_exits(self):
+        with self.assertRaises(EOFError):
+            self.pool.apply(os._exit, (1,))
+        self.assertEqual(self.pool.size, 1)
+        self.assertEqual(self.pool.map(sqr, range(10)), [sqr(x) for x in range(10)])
+        self.assertEqual(self.pool.size, 2)
+
+    def test_kill(self):
+        pids = set(self.pool.map(pid_after, [0.05] * 2))
+        self.pool.kill()
+        self.assertEqual(self.pool.size, 0)
+        self.assertEqual(len(pids), 2)
+        for pid in pids:
+            self._assertGone(pid)
+        # It can be used again.
+        self.assertEqual(self.pool.apply(sqr, (3,)), 9)
+
+    def _assertGone(self, pid):
+        endtime = time.time() + 5
+        while time.time() < endtime:
+            try:
+                os.kill(pid, 0)
+            except OSError:
+                return
+            gevent.sleep(0.05)
+        self.fail("Process %s still exists" % pid)
+
+
+    def test_fds_closed(self):
+        r, w = os.pipe()
+        try:
+            pool = ProcessPool(1)
+            try:
+                self.assertFalse(pool.apply(is_open, (r,)))
+                self.assertFalse(pool.apply(is_open, (w,)))
+                self.assertTrue(pool.apply(is_open, (2,)))
+            finally:
+                pool.kill()
+        finally:
+            os.close(r)
+            os.close(w)
+
+    def test_forked(self):
+        # A child process gets workers of its own, whichever method
+        # it uses first.
+        from gevent.os import fork
+        from gevent.os import waitpid
+        worker_pids = set(self.pool.map(pid_after, [0.05] * 2))
+        for method in ('apply', 'map'):
+            pid = fork()
+            if not pid:
+                status = 1
+                try:
+                    if method == 'apply':
+                        pids = [self.pool.apply(os.getpid)]
+                    else:
+                        pids = self.pool.map(pid_after, [0, 0])
+                    if os.getpid() not in pids and not worker_pids.intersection(pids):
+                        status = 0
+                finally:
+                    os._exit(status)
+            _, status = waitpid(pid, 0)
+            self.assertEqual(status, 0, method)
+
+
+@greentest.skipIf(not hasattr(os, 'fork'), "Needs fork")
+@greentest.skipIf(pickle.HIGHEST_PROTOCOL < 5, "Needs pickle protocol 5")
+class TestOutOfBand(TestCase):
+
+    def test_dumps(self):
+        from gevent import processpool
+        data = bytearray(b'x' * 100)
+        chunks = processpool._dumps(pickle.PickleBuffer(data))
+        header_size = processpool._HEADER.size
+        size, buffer_count = processpool._HEADER.unpack(chunks[0][:header_size])
+        self.assertLess(size, len(data))
+        self.assertEqual(buffer_count, 1)
+        # Sent as it is, not copied.
+        self.assertIsInstance(chunks[-1], memoryview)
+        self.assertEqual(chunks[-1], data)
+        # The chunks before the buffer's size prefix are the pickle.
+        pickled = b''.join(chunks[:-2])[header_size:]
+        self.assertEqual(len(pickled), size)
+        loaded = processpool._loads(pickled, [chunks[-1]])
+        self.assertEqual(loaded, data)
+
+    def test_apply(self):
+        data = bytearray(os.urandom(1 << 20))
+        self.assertEqual(self.pool.apply(echo, (pickle.PickleBuffer(data),)), data)
+        self.assertEqual(self.pool.apply(echo, (data,)), data)
+
+
+class TestRecycle(TestCase):
+
+    size = 1
+    maxtasksperchild = 2
+
+    def test_recycle(self):
+        pids = [self.pool.apply(os.getpid) for _ in range(4)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(self.pool.size, 1)
+
+
+@greentest.skipIf(not hasattr(os, 'fork'), "Needs fork")
+class TestBadArguments(greentest.TestCase):
+
+    def test_maxsize(self):
+        self.assertRaises(ValueError, ProcessPool, 0)
+
+    def test_maxtasksperchild(self):
+        self.assertRaises(ValueError, ProcessPool, 1, maxtasksperchild=0)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -485,6 +485,208 @@ class MultiLineHeader(TestCase):
         read_http(fd)
 
 
+class TestPipelinedHeaders(TestCase):
+
+    @staticmethod
+    def application(env, start_response):
+        body = ('%s %s %s' % (env['PATH_INFO'],
+                              env.get('HTTP_X_THING'),
+                              env.get('CONTENT_TYPE'))).encode('ascii')
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [body, env['wsgi.input'].read(int(env.get('CONTENT_LENGTH') or 0))]
+
+    def test_pipelined(self):
+        requests = (
+            'GET /a HTTP/1.1\r\nHost: localhost\r\nX-Thing: 1\r\n\r\n'
+            # Continuation lines
+            'POST /b HTTP/1.1\r\nHost: localhost\r\nContent-Type: text/plain;\r\n charset=ascii\r\n'
+            'Content-Length: 4\r\n\r\nbody'
+            # Bare newlines
+            'GET /c HTTP/1.1\nHost: localhost\nX-Thing: 3\n\n'
+            # Not a header; parsed the slow way, with the same results
+            'GET /d HTTP/1.1\r\nHost: localhost\r\nFrom nobody\r\n\r\n'
+            # A bare \r, which the email feed parser takes as a line
+            # break; parsed the slow way too
+            'GET /e HTTP/1.1\r\nHost: localhost\r\nX-Thing: 5\rX-Other: 6\r\n\r\n'
+            'GET /f HTTP/1.1\r\nHost: localhost\r\nX-Thing: 6\r\nConnection: close\r\n\r\n'
+        )
+        fd = self.makefile()
+        fd.write(requests)
+        read_http(fd, body='/a 1 None')
+        read_http(fd, body='/b None text/plain;\r\n charset=asciibody')
+        read_http(fd, body='/c 3 None')
+        read_http(fd, body='/d None None')
+        read_http(fd, body='/e 5 None')
+        read_http(fd, body='/f 6 None')
+
+
+class TestHeaderEnviron(TestCase):
+
+    @staticmethod
+    def application(env, start_response):
+        body = ' '.join('%s=%s' % (k, env[k]) for k in sorted(env) if k.startswith('HTTP_'))
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [body.encode('latin-1')]
+
+    def test_environ(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n'
+                 'X-Thing: 1\r\nx-thing:  2 \r\n'
+                 'Cookie: a=b\r\nCookie: c=d\r\n'
+                 'X_Thing: dropped\r\n'
+                 'X-Folded: a\r\n b\r\n'
+                 'Content-Type: text/plain\r\n\r\n')
+        read_http(fd, body='HTTP_COOKIE=a=b; c=d HTTP_HOST=localhost '
+                  'HTTP_X_FOLDED=a\r\n b HTTP_X_THING=1,2')
+
+
+class TestShed(TestCase):
+
+    @staticmethod
+    def application(env, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'hello']
+
+    def init_server(self, application):
+        super(TestShed, self).init_server(application)
+        self.server.max_connections = 0
+
+    def test_503(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        read_http(fd, code=503, reason='Service Unavailable', body='')
+        self.assertEqual(self.server.shed_count, 1)
+
+
+class TestDateCache(TestCase):
+
+    __timeout__ = greentest.LARGE_TIMEOUT
+
+    @staticmethod
+    def application(env, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'hello']
+
+    def test_date(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        first = read_http(fd).headers['Date']
+        timer = self.server._date_timer
+        self.assertTrue(timer.active)
+        self.assertEqual(self.server._get_date().decode('ascii'), first)
+
+        # The timer forgets the date at the start of the next second.
+        gevent.sleep(1.1)
+        self.assertIsNone(self.server._date)
+        self.assertFalse(timer.active)
+
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        self.assertNotEqual(read_http(fd).headers['Date'], first)
+
+        self.server.close()
+        self.assertIsNone(self.server._date_timer)
+
+    def test_encoding_caches(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        read_http(fd)
+        self.assertEqual(self.server._status_cache, {'200 OK': (200, b'200 OK')})
+        self.assertEqual(self.server._status_lines, {b'200 OK': b'HTTP/1.1 200 OK\r\n'})
+        self.assertEqual(self.server._header_names,
+                         {'Content-Type': (b'Content-Type', 'content-type')})
+
+        # Each server has its own.
+        other = pywsgi.WSGIServer(('127.0.0.1', 0), self.application)
+        self.assertEqual(other._status_cache, {})
+        self.assertEqual(other._status_lines, {})
+        self.assertEqual(other._header_names, {})
+
+
+class OtherServer(object):
+    # Like the server, without its date cache.
+
+    def __init__(self, server):
+        self._server = server
+
+    def __getattr__(self, name):
+        if name == '_get_date':
+            raise AttributeError(name)
+        return getattr(self._server, name)
+
+
+class OtherServerHandler(pywsgi.WSGIHandler):
+
+    def __init__(self, sock, address, server):
+        pywsgi.WSGIHandler.__init__(self, sock, address, OtherServer(server))
+
+
+class TestDateOtherServer(TestCase):
+
+    @staticmethod
+    def application(env, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'hello']
+
+    def init_server(self, application):
+        self.server = pywsgi.WSGIServer((self.listen_addr, 0),
+                                        application,
+                                        handler_class=OtherServerHandler)
+
+    def test_date(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        self.assertTrue(read_http(fd).headers['Date'])
+        self.assertIsNone(self.server._date)
+
+
+@greentest.skipIf(not PY3, "Needs http.client")
+class TestParseHeaderBlock(greentest.TestCase):
+
+    blocks = (
+        b'Host: localhost\r\nX-Thing: 1\r\n\r\n',
+        b'Content-Type: text/plain;\r\n charset=ascii\r\n\r\n',
+        b'Host: localhost\nX-Thing: 3\n\n',
+        b'X-Thing:   spaced \t\r\n\r\n',
+    )
+
+    # The email feed parser ends a line at a bare \r too.
+    bare_cr_blocks = (
+        b'X-Thing: a\rb\r\n\r\n',
+        b'X-Thing: a\r\r\n\r\n',
+        b'X-Thing: a\r\n b\rc\r\n\r\n',
+        b'X-Thing: a\r\n\r',
+    )
+
+    def _parse(self, block):
+        from gevent._pywsgi_headers import parse_header_block
+        return parse_header_block(block)
+
+    def test_same_as_feedparser(self):
+        from http.client import parse_headers # pylint:disable=import-error
+        for block in self.blocks:
+            parsed = self._parse(block)
+            self.assertIsNotNone(parsed, block)
+            self.assertEqual(parsed[0], parse_headers(StringIO(block)).items())
+
+    def test_bare_cr(self):
+        for block in self.bare_cr_blocks:
+            self.assertIsNone(self._parse(block), block)
+
+
+class TestParseRequestLine(greentest.TestCase):
+
+    def test_parse(self):
+        from gevent._pywsgi_headers import parse_request_line
+        self.assertEqual(tuple(parse_request_line('GET /a?b HTTP/1.1')),
+                         ('GET', '/a?b', 'HTTP/1.1'))
+        self.assertEqual(tuple(parse_request_line('POST * HTTP/1.0')),
+                         ('POST', '*', 'HTTP/1.0'))
+        # Left to WSGIHandler.read_request.
+        for line in ('GET /', 'GET  / HTTP/1.1', 'GET /\t HTTP/1.1',
+                     'GET / HTTP/0.9', 'GET / HTTP/1.1 x', 'GET / HTTP/1.1\r'):
+            self.assertIsNone(parse_request_line(line), line)
+
+
 class TestGetArg(TestCase):
 
     @staticmethod
@@ -577,6 +779,50 @@ class TestBigChunks(TestChunkedApp):
     chunks = [b'a' * 8192] * 3
 
 
+@greentest.skipIf(not PY3, "Needs memoryview.cast")
+class TestMemoryviewChunks(TestChunkedApp):
+    # Chunks of items bigger than a byte.
+    chunks = [b'abcd' * 10, b'efgh' * 1000]
+    validator = None
+
+    def application(self, env, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        for chunk in self.chunks:
+            yield memoryview(chunk).cast('I')
+
+    def test_nbytes(self):
+        self.switch_expected = False
+        self.assertEqual(pywsgi._nbytes(memoryview(b'abcd' * 10).cast('I')), 40)
+
+
+class _NonVectoredSocket(object):
+    # A socket without sendall_vectored, as the handler may be given
+    # by a server that doesn't create gevent sockets.
+
+    def __init__(self, sock):
+        self._wrapped = sock
+
+    def __getattr__(self, name):
+        if name == 'sendall_vectored':
+            raise AttributeError(name)
+        return getattr(self._wrapped, name)
+
+
+class NonVectoredHandler(pywsgi.WSGIHandler):
+
+    def __init__(self, sock, *args, **kwargs):
+        pywsgi.WSGIHandler.__init__(self, _NonVectoredSocket(sock), *args, **kwargs)
+
+
+class TestNonVectoredSocket(TestChunkedApp):
+
+    def init_server(self, application):
+        logger = self.logger = self.init_logger()
+        self.server = pywsgi.WSGIServer((self.listen_addr, 0), application,
+                                        log=logger, error_log=logger,
+                                        handler_class=NonVectoredHandler)
+
+
 class TestChunkedPost(TestCase):
 
     @staticmethod
@@ -778,6 +1024,93 @@ if HAVE_SSLCONTEXT:
     class TestHttpsWithContext(HttpsSslContextTestCase, TestHttps):
         pass
 
+class TestFileWrapper(TestCase):
+    # The validator's IteratorWrapper hides the wsgi.file_wrapper
+    validator = None
+
+    data = b'abcdefghij' * 10000
+    headers = ()
+
+    def setUp(self):
+        import tempfile
+        self.file = tempfile.TemporaryFile()
+        self.file.write(self.data)
+        self.file.flush()
+        super(TestFileWrapper, self).setUp()
+
+    def tearDown(self):
+        super(TestFileWrapper, self).tearDown()
+        self.file.close()
+
+    def application(self, env, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')] + list(self.headers))
+        if env['PATH_INFO'] == '/offset':
+            self.file.seek(10)
+        else:
+            self.file.seek(0)
+        filelike = self.file
+        if env['PATH_INFO'] == '/bytesio':
+            filelike = StringIO(self.data)
+        return env['wsgi.file_wrapper'](filelike, 4096)
+
+    def _get(self, path, **kwargs):
+        fd = self.makefile()
+        fd.write('GET %s HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n' % path)
+        return read_http(fd, **kwargs)
+
+    def test_file(self):
+        response = self._get('/', body=self.data)
+        if PY3:
+            response.assertHeader('Content-Length', str(len(self.data)))
+
+    def test_offset(self):
+        response = self._get('/offset', body=self.data[10:])
+        if PY3:
+            response.assertHeader('Content-Length', str(len(self.data) - 10))
+
+    def test_not_a_file(self):
+        response = self._get('/bytesio', body=self.data)
+        response.assertHeader('Transfer-Encoding', 'chunked')
+        self.assertEqual(response.chunks, [self.data[i:i + 4096]
+                                           for i in range(0, len(self.data), 4096)])
+
+    def test_iterate(self):
+        self.switch_expected = False
+        wrapper = pywsgi.FileWrapper(StringIO(b'abc'), 2)
+        self.assertEqual(list(wrapper), [b'ab', b'c'])
+        wrapper.close()
+
+
+class TestFileWrapperContentLength(TestFileWrapper):
+
+    headers = (('Content-Length', '5'),)
+
+    def test_file(self):
+        self._get('/', body=self.data[:5])
+
+    def test_offset(self):
+        self._get('/offset', body=self.data[10:15])
+
+    test_not_a_file = None
+
+
+class TestFileWrapperTransferEncoding(TestFileWrapper):
+
+    headers = (('Transfer-Encoding', 'chunked'),)
+
+    def test_file(self):
+        # Not both framings. (read_http would reject the
+        # Transfer-Encoding header that the server adds too.)
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+        head = fd.read().split(b'\r\n\r\n', 1)[0]
+        self.assertIn(b'Transfer-Encoding: chunked', head)
+        self.assertNotIn(b'Content-Length', head)
+
+    test_offset = None
+    test_not_a_file = None
+
+
 class TestInternational(TestCase):
     validator = None  # wsgiref.validate.IteratorWrapper([]) does not have __len__
 
@@ -1463,6 +1796,39 @@ class TestHandlerSubclass(TestCase):
         self.assertEqual(fd.read(), b'')
 
 
+class HeadersFromRfileHandler(pywsgi.WSGIHandler):
+
+    def read_request(self, raw_requestline):
+        self.requestline = raw_requestline.rstrip()
+        self.command, self.path, self.request_version = self.requestline.split()
+        self.headers = self.MessageClass(self.rfile, 0)
+        self.content_length = None
+        self.close_connection = True
+        return True
+
+
+class TestReadRequestSubclass(TestCase):
+    # A read_request that reads the headers itself finds them all
+    # in rfile.
+
+    validator = None
+
+    def application(self, environ, start_response):
+        start_response('200 OK', [])
+        return [b'yes' if environ.get('HTTP_X_TEST') else b'no']
+
+    def init_server(self, application):
+        self.server = pywsgi.WSGIServer((self.listen_addr, 0),
+                                        application,
+                                        handler_class=HeadersFromRfileHandler)
+
+    def test(self):
+        fd = self.makefile()
+        fd.write('GET / HTTP/1.1\r\nHost: localhost\r\nX-Test: 1\r\n\r\n')
+        fd.flush()
+        read_http(fd, body='yes')
+
+
 class TestErrorAfterChunk(TestCase):
     validator = None
 
@@ -1678,6 +2044,22 @@ class TestEnviron(TestCase):
     def test_environ_is_secure_by_default(self):
         self.urlopen()
 
+    def test_workers_environ(self):
+        self.assertFalse(self.server.environ['wsgi.multiprocess'])
+        server = pywsgi.WSGIServer(('127.0.0.1', 0), self.application, workers=2)
+        self.assertTrue(server.environ['wsgi.multiprocess'])
+        self.assertEqual(server.max_accept, 1)
+        self.assertEqual(server.max_accept_growth, 1)
+        server.close()
+
+        if hasattr(socket, 'SO_REUSEPORT'):
+            # Each worker listens on its own socket.
+            server = pywsgi.WSGIServer(('127.0.0.1', 0), self.application, workers=2,
+                                       reuse_port=True)
+            self.assertEqual(server.max_accept, pywsgi.WSGIServer.max_accept)
+            self.assertEqual(server.max_accept_growth, pywsgi.WSGIServer.max_accept_growth)
+            server.close()
+
     def test_default_secure_repr(self):
         environ = pywsgi.SecureEnviron()
         self.assertIn('<pywsgi.SecureEnviron dict (keys: 0) at', repr(environ))
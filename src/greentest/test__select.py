@@ -4,8 +4,10 @@ import os
 import errno
 from gevent import select, socket
 import gevent.core
+from gevent.monkey import get_original
 import greentest
 import unittest
+from select import select as original_select
 
 
 class TestSelect(greentest.GenericWaitTestCase):
@@ -86,6 +88,132 @@ if sys.platform != 'win32':
                     result = poll.poll(0)
                     self.assertEqual(result, [(fd, select.POLLNVAL)]) # pylint:disable=no-member
 
+    if hasattr(select, 'epoll'):
+
+        class TestEpollRead(greentest.GenericWaitTestCase):
+            def wait(self, timeout):
+                r, w = os.pipe()
+                try:
+                    with select.epoll() as poll:
+                        poll.register(r, select.EPOLLIN)
+                        poll.poll(timeout)
+                finally:
+                    os.close(r)
+                    os.close(w)
+
+        class TestEpoll(greentest.TestCase):
+
+            def setUp(self):
+                super(TestEpoll, self).setUp()
+                self.r, self.w = os.pipe()
+                self.poll = select.epoll()
+
+            def tearDown(self):
+                self.poll.close()
+                os.close(self.r)
+                os.close(self.w)
+                super(TestEpoll, self).tearDown()
+
+            def test_ready(self):
+                self.poll.register(self.r, select.EPOLLIN)
+                self.poll.register(self.w, select.EPOLLOUT)
+                self.assertEqual(self.poll.poll(1), [(self.w, select.EPOLLOUT)])
+                os.write(self.w, b'x')
+                result = sorted(self.poll.poll(1))
+                self.assertEqual(result, [(self.r, select.EPOLLIN), (self.w, select.EPOLLOUT)])
+                # Still level-triggered after the watchers were left running
+                gevent.sleep(0.01)
+                self.assertEqual(len(self.poll.poll(1)), 2)
+
+            def test_registered_doesnt_block_wait(self):
+                self.poll.register(self.r, select.EPOLLIN)
+                self.assertEqual(self.poll.poll(0.01), [])
+                # Nobody is polling, so the loop finishes.
+                self.assertTrue(gevent.wait(timeout=1))
+
+            def test_wait_forever(self):
+                # Only the poll itself keeps the loop running while a
+                # native thread makes the pipe readable.
+                self.poll.register(self.r, select.EPOLLIN)
+                thread = get_original('threading', 'Timer')(0.05, os.write, (self.w, b'x'))
+                thread.start()
+                try:
+                    self.assertEqual(self.poll.poll(), [(self.r, select.EPOLLIN)])
+                finally:
+                    thread.join()
+
+            def test_maxevents(self):
+                self.poll.register(self.r, select.EPOLLOUT)
+                self.poll.register(self.w, select.EPOLLOUT)
+                self.assertEqual(len(self.poll.poll(1, 1)), 1)
+
+            def test_modify_reuses_watcher(self):
+                self.poll.register(self.w, select.EPOLLIN)
+                watcher = self.poll.fds[self.w]
+                self.poll.modify(self.w, select.EPOLLOUT)
+                self.assertIs(self.poll.fds[self.w], watcher)
+                self.assertEqual(self.poll.poll(1), [(self.w, select.EPOLLOUT)])
+
+            def test_oneshot(self):
+                self.poll.register(self.w, select.EPOLLOUT | select.EPOLLONESHOT)
+                self.assertEqual(self.poll.poll(1), [(self.w, select.EPOLLOUT)])
+                self.assertEqual(self.poll.poll(0.01), [])
+                self.poll.modify(self.w, select.EPOLLOUT)
+                self.assertEqual(self.poll.poll(1), [(self.w, select.EPOLLOUT)])
+
+            def _connection(self):
+                listener = socket.socket()
+                self._close_on_teardown(listener)
+                listener.bind(('127.0.0.1', 0))
+                listener.listen(1)
+                client = socket.create_connection(listener.getsockname())
+                self._close_on_teardown(client)
+                server, _ = listener.accept()
+                self._close_on_teardown(server)
+                return client, server
+
+            def test_pri(self):
+                client, server = self._connection()
+                self.poll.register(server, select.EPOLLIN | select.EPOLLPRI)
+                client.send(b'x')
+                self.assertEqual(self.poll.poll(1), [(server.fileno(), select.EPOLLIN)])
+                client.send(b'!', socket.MSG_OOB)
+                gevent.sleep(0.01)
+                self.assertEqual(self.poll.poll(1),
+                                 [(server.fileno(), select.EPOLLIN | select.EPOLLPRI)])
+                # Only what was registered is reported.
+                self.poll.modify(server, select.EPOLLPRI)
+                self.assertEqual(self.poll.poll(1), [(server.fileno(), select.EPOLLPRI)])
+                self.poll.modify(server, select.EPOLLIN)
+                self.assertEqual(self.poll.poll(1), [(server.fileno(), select.EPOLLIN)])
+
+            def test_fileno(self):
+                self.switch_expected = False
+                self.poll.register(self.r, select.EPOLLIN)
+                fileno = self.poll.fileno()
+                self.assertEqual(self.poll.fileno(), fileno)
+                self.poll.register(self.w, select.EPOLLIN)
+                # The kernel's epoll has the same registrations.
+                self.assertEqual(original_select([fileno], [], [], 0)[0], [])
+                os.write(self.w, b'x')
+                self.assertEqual(original_select([fileno], [], [], 1)[0], [fileno])
+                self.poll.unregister(self.r)
+                self.assertEqual(original_select([fileno], [], [], 0)[0], [])
+                self.poll.close()
+                self.assertRaises(ValueError, self.poll.fileno)
+
+            def test_errors(self):
+                self.switch_expected = False
+                self.poll.register(self.r)
+                self.assertRaises(IOError, self.poll.register, self.r)
+                self.assertRaises(IOError, self.poll.modify, self.w, select.EPOLLIN)
+                self.assertRaises(IOError, self.poll.unregister, self.w)
+                self.poll.unregister(self.r)
+                self.poll.close()
+                self.assertTrue(self.poll.closed)
+                self.assertRaises(ValueError, self.poll.poll)
+
+
 class TestSelectTypes(greentest.TestCase):
 
     def test_int(self):
@@ -0,0 +1,106 @@
+import greentest
+
+try:
+    from gevent import selectors
+except ImportError:
+    selectors = None
+
+from gevent import socket
+
+
+@greentest.skipIf(selectors is None, "Needs selectors or selectors2")
+class TestGeventSelector(greentest.TestCase):
+
+    def setUp(self):
+        super(TestGeventSelector, self).setUp()
+        self.sel = selectors.GeventSelector()
+        self.r, self.w = socket.socketpair()
+
+    def tearDown(self):
+        self.sel.close()
+        self.r.close()
+        self.w.close()
+        super(TestGeventSelector, self).tearDown()
+
+    def test_default(self):
+        self.switch_expected = False
+        self.assertIs(selectors.DefaultSelector, selectors.GeventSelector)
+
+    def test_select(self):
+        key = self.sel.register(self.r, selectors.EVENT_READ, 'data')
+        self.sel.register(self.w, selectors.EVENT_WRITE)
+        result = self.sel.select(1)
+        self.assertEqual([(k.fileobj, ev) for k, ev in result],
+                         [(self.w, selectors.EVENT_WRITE)])
+
+        self.w.send(b'x')
+        result = dict(self.sel.select(1))
+        self.assertEqual(result[key], selectors.EVENT_READ)
+        self.assertEqual(len(result), 2)
+
+    def test_timeout(self):
+        self.sel.register(self.r, selectors.EVENT_READ)
+        self.assertEqual(self.sel.select(0.01), [])
+
+    def test_registered_doesnt_block_wait(self):
+        import gevent
+        self.sel.register(self.r, selectors.EVENT_READ)
+        self.assertEqual(self.sel.select(0.01), [])
+        # Nobody is selecting, so the loop finishes.
+        self.assertTrue(gevent.wait(timeout=1))
+
+    def test_poll(self):
+        # Doesn't wait, but collects what the watchers report.
+        key = self.sel.register(self.r, selectors.EVENT_READ)
+        wkey = self.sel.register(self.w, selectors.EVENT_WRITE)
+        self.assertEqual(self.sel.select(0), [(wkey, selectors.EVENT_WRITE)])
+        self.w.send(b'x')
+        self.assertEqual(sorted(self.sel.select(-1), key=lambda item: item[0].fd),
+                         sorted([(key, selectors.EVENT_READ), (wkey, selectors.EVENT_WRITE)],
+                                key=lambda item: item[0].fd))
+
+    def test_poll_closed(self):
+        key = self.sel.register(self.r, selectors.EVENT_READ)
+        self.w.close()
+        self.assertEqual(self.sel.select(0), [(key, selectors.EVENT_READ)])
+
+    def test_flags(self):
+        self.switch_expected = False
+        from gevent.select import _EV_READ
+        from gevent.select import _EV_WRITE
+
+        def flags(fileobj):
+            # libev may add flags of its own
+            return self.sel._poller.watchers[fileobj.fileno()].events & (_EV_READ | _EV_WRITE)
+
+        self.sel.register(self.r, selectors.EVENT_READ)
+        self.assertEqual(flags(self.r), _EV_READ)
+        self.sel.modify(self.r, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        self.assertEqual(flags(self.r), _EV_READ | _EV_WRITE)
+        self.sel.register(self.w, selectors.EVENT_WRITE)
+        self.assertEqual(flags(self.w), _EV_WRITE)
+
+    def test_modify(self):
+        self.sel.register(self.w, selectors.EVENT_READ)
+        watcher = self.sel._poller.watchers[self.w.fileno()]
+        key = self.sel.modify(self.w, selectors.EVENT_WRITE, 'data')
+        self.assertIs(self.sel._poller.watchers[self.w.fileno()], watcher)
+        self.assertEqual(key.data, 'data')
+        self.assertEqual(self.sel.select(1), [(key, selectors.EVENT_WRITE)])
+
+        key = self.sel.modify(self.w, selectors.EVENT_WRITE, 'other')
+        self.assertEqual(key.data, 'other')
+        self.assertIs(self.sel.get_key(self.w), key)
+
+    def test_unregister(self):
+        self.switch_expected = False
+        self.sel.register(self.r, selectors.EVENT_READ)
+        self.sel.unregister(self.r)
+        self.assertEqual(self.sel._poller.watchers, {})
+        self.assertRaises(KeyError, self.sel.unregister, self.r)
+        self.assertRaises(KeyError, self.sel.modify, self.r, selectors.EVENT_READ)
+        self.assertRaises(ValueError, self.sel.register, self.r, 0)
+
+
+if __name__ == '__main__':
+    greentest.main()
@@ -9,6 +9,7 @@ from greentest import PY3
 from greentest import DEFAULT_SOCKET_TIMEOUT as _DEFAULT_SOCKET_TIMEOUT
 from gevent import socket
 import gevent
+import gevent.event
 from gevent.server import StreamServer
 
 
@@ -260,6 +261,10 @@ class TestDefaultSpawn(TestCase):
         self.switch_expected = False
         self.assertRaises(TypeError, self.ServerClass, self.get_listener(), backlog=25, handle=False)
 
+    def test_reuse_port_is_not_accepted_for_socket(self):
+        self.switch_expected = False
+        self.assertRaises(TypeError, self.ServerClass, self.get_listener(), reuse_port=True, handle=False)
+
     def test_backlog_is_accepted_for_address(self):
         self.server = self.ServerSubClass((greentest.DEFAULT_BIND_ADDR, 0), backlog=25)
         self.assertConnectionRefused()
@@ -458,6 +463,150 @@ class TestSSLSocketNotAllowed(TestCase):
         listener = ssl(listener)
         self.assertRaises(TypeError, self.ServerSubClass, listener)
 
+class TestAcceptGrowth(greentest.TestCase):
+
+    def _accept_limits(self, make_server):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(50)
+        clients = [socket.create_connection(listener.getsockname()) for _ in range(20)]
+        handled = []
+        server = make_server(listener, lambda sock, _address: handled.append(sock))
+        limits = []
+
+        def _do_read():
+            StreamServer._do_read(server)
+            limits.append(server._accept_limit)
+        server._do_read = _do_read
+        server.start()
+        try:
+            with gevent.Timeout(5):
+                while len(handled) < len(clients):
+                    gevent.sleep(0.01)
+        finally:
+            server.stop()
+            for client in clients:
+                client.close()
+        return limits
+
+    def test_growth(self):
+        def make_server(listener, handle):
+            server = StreamServer(listener, handle)
+            server.max_accept = 1
+            return server
+        # Doubling while the backlog is deeper, halving once it's
+        # mostly empty, and never more than max_accept_growth times max_accept.
+        self.assertEqual(self._accept_limits(make_server), [2, 4, 8, 16, 8])
+
+    def test_no_growth_multiprocess(self):
+        from gevent.pywsgi import WSGIServer
+
+        def make_server(listener, handle):
+            class Server(WSGIServer):
+                def handle(self, sock, address):
+                    handle(sock, address)
+            return Server(listener, None, environ={'wsgi.multiprocess': True})
+        # Processes sharing the socket each take one connection at a time.
+        self.assertEqual(set(self._accept_limits(make_server)), set([1]))
+
+
+class TestAdmission(greentest.TestCase):
+
+    def _start(self, handle, **kwargs):
+        server = StreamServer(('127.0.0.1', 0), handle)
+        for k, v in kwargs.items():
+            setattr(server, k, v)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def _connect(self, server):
+        client = socket.create_connection(server.address)
+        self.addCleanup(client.close)
+        return client
+
+    def test_max_connections(self):
+        release = gevent.event.Event()
+
+        def handle(sock, _address):
+            release.wait()
+            sock.sendall(b'ok')
+
+        server = self._start(handle, max_connections=1)
+        first = self._connect(server)
+        gevent.sleep(0.1)
+        # Shed, not left in the backlog
+        second = self._connect(server)
+        self.assertEqual(second.recv(2), b'')
+        self.assertEqual(server.shed_count, 1)
+        release.set()
+        self.assertEqual(first.recv(2), b'ok')
+        gevent.sleep(0.1)
+        self.assertEqual(self._connect(server).recv(2), b'ok')
+        self.assertEqual(server._connections, 0)
+
+    def test_max_connections_full_pool(self):
+        release = gevent.event.Event()
+
+        def handle(sock, _address):
+            release.wait()
+            sock.sendall(b'ok')
+
+        server = self._start(handle, max_connections=10)
+        server.set_spawn(1)
+        first = self._connect(server)
+        gevent.sleep(0.1)
+        self.assertEqual(self._connect(server).recv(2), b'')
+        release.set()
+        self.assertEqual(first.recv(2), b'ok')
+
+    def test_max_accept_rate(self):
+        def handle(sock, _address):
+            sock.sendall(b'ok')
+
+        server = self._start(handle, max_accept_rate=2)
+        clients = [self._connect(server) for _ in range(4)]
+        results = [client.recv(2) for client in clients]
+        self.assertEqual(sorted(results), [b'', b'', b'ok', b'ok'])
+        self.assertEqual(server.shed_count, 2)
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "Needs SO_REUSEPORT")
+class TestReusePort(greentest.TestCase):
+
+    def test_shared_address(self):
+        def handle(sock, _address):
+            sock.sendall(b'hi')
+
+        first = StreamServer(('127.0.0.1', 0), handle, reuse_port=True)
+        first.start()
+        second = StreamServer(first.address, handle, reuse_port=True)
+        second.start()
+        try:
+            self.assertEqual(first.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT), 1)
+            self.assertEqual(second.address, first.address)
+            first.stop()
+            # The second one still serves.
+            conn = socket.create_connection(first.address)
+            try:
+                self.assertEqual(conn.recv(2), b'hi')
+            finally:
+                conn.close()
+        finally:
+            first.stop()
+            second.stop()
+
+    def test_not_shared_without_reuse_port(self):
+        self.switch_expected = False
+        first = StreamServer(('127.0.0.1', 0), lambda *args: None, reuse_port=True)
+        first.start()
+        try:
+            second = StreamServer(first.address, lambda *args: None)
+            self.assertRaises(socket.error, second.start)
+        finally:
+            first.stop()
+
+
 def _file(name, here=os.path.dirname(__file__)):
     return os.path.abspath(os.path.join(here, name))
 
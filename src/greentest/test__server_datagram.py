@@ -0,0 +1,146 @@
+import greentest
+import gevent
+from gevent import socket
+from gevent.server import DatagramServer
+
+
+class TestDatagramServer(greentest.TestCase):
+
+    server_kwargs = {}
+
+    def setUp(self):
+        greentest.TestCase.setUp(self)
+        self.received = []
+        self.server = DatagramServer(('127.0.0.1', 0), self.handle, **self.server_kwargs)
+        self.server.start()
+        self.client = socket.socket(type=socket.SOCK_DGRAM)
+        self.client.settimeout(2)
+        self.client.bind(('127.0.0.1', 0))
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        greentest.TestCase.tearDown(self)
+
+    def handle(self, data, address):
+        self.received.append(data)
+        self.server.sendto(data.upper(), address)
+
+    def _send(self, count):
+        for i in range(count):
+            self.client.sendto(('x%d' % i).encode('ascii'), self.server.address)
+
+    def _recv(self, count):
+        return sorted(self.client.recv(100) for _ in range(count))
+
+    def test_echo(self):
+        self._send(3)
+        self.assertEqual(self._recv(3), [b'X0', b'X1', b'X2'])
+        self.assertEqual(self.received, [b'x0', b'x1', b'x2'])
+
+
+class TestBatches(TestDatagramServer):
+
+    server_kwargs = {'batch_size': 4}
+
+    def handle(self, batch): # pylint:disable=arguments-differ
+        self.received.append([data for data, _ in batch])
+        self.server.sendto_many((data.upper(), address) for data, address in batch)
+
+    def test_echo(self):
+        self._send(3)
+        self.assertEqual(self._recv(3), [b'X0', b'X1', b'X2'])
+        self.assertEqual(self.received, [[b'x0', b'x1', b'x2']])
+
+    def test_batch_size(self):
+        self.server.stop_accepting()
+        self._send(10)
+        gevent.sleep(0.1)
+        self.server.start_accepting()
+        self.assertEqual(len(self._recv(10)), 10)
+        self.assertEqual([len(batch) for batch in self.received], [4, 4, 2])
+
+    def test_bad_batch_size(self):
+        with self.assertRaises(ValueError):
+            DatagramServer(('127.0.0.1', 0), self.handle, batch_size=0)
+
+
+class TestReceiveBuffers(TestDatagramServer):
+
+    server_kwargs = {'receive_buffers': 2, 'max_datagram_size': 4}
+
+    def handle(self, data, address):
+        self.assertIsInstance(data, memoryview)
+        self.received.append(data)
+        self.server.sendto(data.tobytes().upper(), address)
+
+    def test_echo(self):
+        self._send(3)
+        self.assertEqual(self._recv(3), [b'X0', b'X1', b'X2'])
+        self.assertEqual(len(self.received), 3)
+        self.assertEqual(self.server._leased_buffers, {})
+        self.assertEqual(len(self.server._free_buffers), 2)
+
+    def test_reuse(self):
+        buffers = set(id(buf) for buf in self.server._free_buffers)
+        for _ in range(3):
+            self._send(1)
+            self._recv(1)
+            gevent.sleep(0.01)
+        self.assertEqual(set(id(buf) for buf in self.server._free_buffers), buffers)
+
+    def test_overflow(self):
+        self.server.stop_accepting()
+        self._send(5)
+        gevent.sleep(0.1)
+        self.server.start_accepting()
+        self._recv(5)
+        gevent.sleep(0.01)
+        self.assertEqual(self.server._leased_buffers, {})
+        self.assertEqual(len(self.server._free_buffers), 2)
+
+    def test_truncated(self):
+        self.client.sendto(b'abcdefgh', self.server.address)
+        self.assertEqual(self.client.recv(100), b'ABCD')
+
+    @greentest.skipIf(not hasattr(memoryview, 'release'), "Needs memoryview.release")
+    def test_released(self):
+        self._send(1)
+        self._recv(1)
+        gevent.sleep(0.01)
+        with self.assertRaises(ValueError):
+            self.received[0].tobytes()
+        self.assertEqual(len(self.server._free_buffers), 2)
+
+    @greentest.skipIf(not hasattr(memoryview, 'release'), "Needs memoryview.release")
+    def test_kept_slice(self):
+        kept = []
+        self.server.set_handle(lambda data, address: kept.append(data[1:]))
+        for _ in range(4):
+            self._send(1)
+            gevent.sleep(0.05)
+        self.assertEqual([view.tobytes() for view in kept], [b'0'] * 4)
+        # The buffers the handler kept are not reused.
+        kept_buffers = set(id(view.obj) for view in kept)
+        self.assertEqual(len(kept_buffers), 4)
+        for buf in self.server._free_buffers:
+            self.assertNotIn(id(buf), kept_buffers)
+        self.assertEqual(self.server._leased_buffers, {})
+
+
+class TestReceiveBufferBatches(TestBatches):
+
+    server_kwargs = {'batch_size': 4, 'receive_buffers': 4}
+
+    def handle(self, batch): # pylint:disable=arguments-differ
+        self.received.append([data.tobytes() for data, _ in batch])
+        self.server.sendto_many((data.tobytes().upper(), address) for data, address in batch)
+
+    def test_batch_size(self):
+        TestBatches.test_batch_size(self)
+        self.assertEqual(self.server._leased_buffers, {})
+        self.assertEqual(len(self.server._free_buffers), 4)
+
+
+if __name__ == '__main__':
+    greentest.main()
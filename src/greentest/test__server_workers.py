@@ -0,0 +1,136 @@
+"""
+Tests for servers with worker processes.
+
+The server runs in a subprocess, because the workers are forked from
+it, and forking copies everything else that is running too.
+"""
+import sys
+
+if sys.argv[1:2] == ['subprocess']:
+    import os
+    import gevent
+    from gevent.server import StreamServer
+
+    def handle(sock, _address):
+        if sock.makefile('rb').readline().strip() == b'slow':
+            gevent.sleep(0.5)
+        sock.sendall(str(os.getpid()).encode('ascii'))
+
+    class Server(StreamServer):
+
+        def _start_worker(self):
+            before = set(self._workers or ())
+            super(Server, self)._start_worker()
+            for pid in set(self._workers) - before:
+                sys.stdout.write('worker %s\n' % pid)
+            sys.stdout.flush()
+
+    server = Server(('127.0.0.1', 0), handle, workers=2,
+                    reuse_port='reuse_port' in sys.argv)
+    server.start()
+    sys.stdout.write('port %s\n' % server.server_port)
+    sys.stdout.flush()
+    try:
+        server.serve_forever(stop_timeout=5)
+    except KeyboardInterrupt:
+        pass
+    sys.stdout.write('stopped %s\n' % len(server._workers))
+    sys.stdout.flush()
+    sys.exit(0)
+
+else:
+    import os
+    import signal
+    import socket
+    from subprocess import Popen, PIPE
+    import time
+
+    import unittest
+    import greentest
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "Needs fork")
+    class TestWorkers(unittest.TestCase):
+
+        args = ()
+
+        def setUp(self):
+            self.process = Popen([sys.executable, __file__, 'subprocess'] + list(self.args),
+                                 stdout=PIPE)
+
+        def tearDown(self):
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            self.process.stdout.close()
+
+        def _readline(self):
+            line = self.process.stdout.readline()
+            if not isinstance(line, str):
+                line = line.decode('ascii')
+            return line.split()
+
+        def _request(self, port, line=b'fast\n'):
+            sock = socket.create_connection(('127.0.0.1', port))
+            try:
+                sock.sendall(line)
+                return sock.makefile('rb').read()
+            finally:
+                sock.close()
+
+        def _wait_for_exit(self):
+            endtime = time.time() + 15
+            while self.process.poll() is None and time.time() < endtime:
+                time.sleep(0.1)
+            self.assertEqual(self.process.returncode, 0)
+
+        def _assertGone(self, pid):
+            endtime = time.time() + 5
+            while time.time() < endtime:
+                try:
+                    os.kill(pid, 0)
+                except OSError:
+                    return
+                time.sleep(0.1)
+            self.fail("Process %s still exists" % pid)
+
+        def test_workers(self):
+            workers = set(int(self._readline()[1]) for _ in range(2))
+            self.assertNotIn(self.process.pid, workers)
+            port = int(self._readline()[1])
+
+            for _ in range(10):
+                self.assertIn(int(self._request(port)), workers)
+
+            # A worker that dies is replaced
+            dead = workers.pop()
+            os.kill(dead, signal.SIGKILL)
+            word, new = self._readline()
+            self.assertEqual(word, 'worker')
+            workers.add(int(new))
+            self._assertGone(dead)
+            for _ in range(10):
+                self.assertIn(int(self._request(port)), workers)
+
+            # Stopping the master stops the workers, but lets them
+            # finish what they are doing.
+            sock = socket.create_connection(('127.0.0.1', port))
+            sock.sendall(b'slow\n')
+            time.sleep(0.1)
+            self.process.send_signal(signal.SIGINT)
+            try:
+                self.assertIn(int(sock.makefile('rb').read()), workers)
+            finally:
+                sock.close()
+            self.assertEqual(self._readline(), ['stopped', '0'])
+            self._wait_for_exit()
+            for pid in workers:
+                self._assertGone(pid)
+            self.assertRaises(socket.error, self._request, port)
+
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "Needs SO_REUSEPORT")
+    class TestWorkersReusePort(TestWorkers):
+
+        args = ('reuse_port',)
+
+    if __name__ == '__main__':
+        greentest.main()
@@ -82,7 +82,7 @@ class TestTCP(greentest.TestCase):
         return self._close_on_teardown(sock)
 
     def _test_sendall(self, data, match_data=None, client_method='sendall',
-                      **client_args):
+                      client_method_args=None, **client_args):
 
         read_data = []
         server_exc_info = []
@@ -106,7 +106,7 @@ class TestTCP(greentest.TestCase):
         client = self.create_connection(**client_args)
 
         try:
-            getattr(client, client_method)(data)
+            getattr(client, client_method)(data, **(client_method_args or {}))
         finally:
             client.shutdown(socket.SHUT_RDWR)
             client.close()
@@ -130,6 +130,38 @@ class TestTCP(greentest.TestCase):
         data = array.array("B", self.long_data)
         self._test_sendall(data)
 
+    def test_sendall_vectored(self):
+        data = self.long_data
+        self._test_sendall([data[:10], b'', bytearray(data[10:5000]), memoryview(data)[5000:]],
+                           client_method='sendall_vectored')
+
+    def test_sendall_vectored_returns_none(self):
+        self.switch_expected = False
+        a, b = socket.socketpair()
+        try:
+            # Whether or not there's anything to send.
+            self.assertIsNone(a.sendall_vectored([b'', bytearray()]))
+            self.assertIsNone(a.sendall_vectored([b'x']))
+            self.assertEqual(b.recv(1), b'x')
+        finally:
+            a.close()
+            b.close()
+
+    def test_sendall_vectored_many(self):
+        # More buffers than fit in one sendmsg() call
+        data = self.long_data
+        self._test_sendall([data[i:i + 50] for i in range(0, len(data), 50)],
+                           client_method='sendall_vectored')
+
+    @unittest.skipUnless(hasattr(socket.socket, 'sendfile'), "Needs sendfile")
+    def test_sendfile(self):
+        import tempfile
+        with tempfile.TemporaryFile() as f:
+            f.write(b'x' + self.long_data)
+            f.flush()
+            self._test_sendall(f, client_method='sendfile',
+                              client_method_args={'offset': 1})
+
     def test_sendall_empty(self):
         data = b''
         self._test_sendall(data, data)
@@ -226,6 +258,25 @@ class TestTCP(greentest.TestCase):
                 client.close()
                 client_sock[0][0].close()
 
+        def test_sendall_vectored_timeout(self):
+            client_sock = []
+            acceptor = Thread(target=lambda: client_sock.append(self.listener.accept()))
+            client = self.create_connection()
+            time.sleep(0.1)
+            assert client_sock
+            client.settimeout(0.1)
+            start = time.time()
+            try:
+                self.assertRaises(self.TIMEOUT_ERROR, client.sendall_vectored,
+                                  [self._test_sendall_data, self._test_sendall_data])
+                if self._test_sendall_timeout_check_time:
+                    took = time.time() - start
+                    assert 0.09 <= took <= 0.2, took
+            finally:
+                acceptor.join()
+                client.close()
+                client_sock[0][0].close()
+
     def test_makefile(self):
         def accept_once():
             conn, _ = self.listener.accept()
@@ -339,6 +390,18 @@ def get_port():
     return port
 
 
+class TestTCPReadAhead(TestTCP):
+
+    def setUp(self):
+        self.default_read_ahead = socket.socket.default_read_ahead
+        socket.socket.default_read_ahead = True
+        super(TestTCPReadAhead, self).setUp()
+
+    def tearDown(self):
+        super(TestTCPReadAhead, self).tearDown()
+        socket.socket.default_read_ahead = self.default_read_ahead
+
+
 class TestCreateConnection(greentest.TestCase):
 
     __timeout__ = 5
@@ -449,5 +512,130 @@ class TestSocket(greentest.TestCase):
         with self.assertRaises(socket.error):
             s.shutdown(socket.SHUT_RDWR)
 
+
+class TestReadAhead(greentest.TestCase):
+
+    def setUp(self):
+        super(TestReadAhead, self).setUp()
+        self.reader, self.writer = socket.socketpair()
+        self.reader.read_ahead = True
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        super(TestReadAhead, self).tearDown()
+
+    def test_default(self):
+        self.switch_expected = False
+        self.assertTrue(self.reader.read_ahead)
+        self.assertFalse(self.writer.read_ahead)
+
+    def _default_with_env(self, value):
+        import subprocess
+        env = dict(os.environ, GEVENT_SOCKET_READ_AHEAD=value)
+        output = subprocess.check_output(
+            [sys.executable, '-c',
+             'import gevent.socket; print(gevent.socket.socket.default_read_ahead)'],
+            env=env)
+        return output.strip()
+
+    def test_default_env(self):
+        self.assertEqual(self._default_with_env('0'), b'False')
+        self.assertEqual(self._default_with_env('off'), b'False')
+        self.assertEqual(self._default_with_env('1'), b'True')
+
+    def test_watcher_stays_started(self):
+        # pylint:disable=protected-access
+        import gevent
+        reader = self.reader
+        watcher = reader._read_event
+        self.assertFalse(watcher.active)
+
+        gevent.spawn_later(0.01, self.writer.sendall, b'a')
+        self.assertEqual(reader.recv(1), b'a')
+        self.assertTrue(watcher.active)
+
+        gevent.spawn_later(0.01, self.writer.sendall, b'b')
+        self.assertEqual(reader.recv(1), b'b')
+        self.assertTrue(watcher.active)
+
+        # Data arriving while nobody is reading stops the watcher
+        # so the loop doesn't spin, but isn't lost.
+        self.writer.sendall(b'c')
+        gevent.sleep(0.01)
+        self.assertFalse(watcher.active)
+        self.assertEqual(reader.recv(1), b'c')
+
+        reader.read_ahead = False
+        self.assertFalse(watcher.active)
+        gevent.spawn_later(0.01, self.writer.sendall, b'd')
+        self.assertEqual(reader.recv(1), b'd')
+        self.assertFalse(watcher.active)
+
+    def test_idle_unref(self):
+        # pylint:disable=protected-access
+        import gevent
+        reader = self.reader
+        watcher = reader._read_event
+        refs = []
+        gevent.spawn_later(0.01, lambda: refs.append(watcher.ref) or self.writer.sendall(b'a'))
+        self.assertEqual(reader.recv(1), b'a')
+        # Only referenced while somebody is waiting for data, so an
+        # idle socket doesn't keep the loop running.
+        self.assertEqual(refs, [True])
+        self.assertTrue(watcher.active)
+        self.assertFalse(watcher.ref)
+        self.assertTrue(reader.ref)
+
+        reader.ref = False
+        self.assertFalse(reader.ref)
+        receiver = gevent.spawn(reader.recv, 1)
+        gevent.sleep(0.01)
+        self.assertFalse(watcher.ref)
+        self.writer.sendall(b'b')
+        # The watcher alone wouldn't keep the loop running.
+        gevent.sleep(0.01)
+        self.assertEqual(receiver.value, b'b')
+
+        reader.ref = True
+        reader.read_ahead = False
+        self.assertTrue(watcher.ref)
+
+    def test_idle_doesnt_block_wait(self):
+        import gevent
+        gevent.spawn_later(0.01, self.writer.sendall, b'a')
+        self.assertEqual(self.reader.recv(1), b'a')
+        self.assertTrue(self.reader._read_event.active)
+        # Nothing else is running, so the loop finishes.
+        self.assertTrue(gevent.wait(timeout=1))
+
+    def test_timeout(self):
+        self.reader.settimeout(0.01)
+        self.assertRaises(socket.timeout, self.reader.recv, 1)
+        self.writer.sendall(b'a')
+        self.assertEqual(self.reader.recv(1), b'a')
+
+    def test_close_wakes_reader(self):
+        import gevent
+        def read():
+            try:
+                self.reader.recv(1)
+            except socket.error as ex:
+                return ex
+        reader = gevent.spawn(read)
+        gevent.sleep(0.01)
+        self.reader.close()
+        self.assertIsInstance(reader.get(timeout=1), socket.error)
+
+    def test_concurrent_read(self):
+        import gevent
+        from gevent.hub import ConcurrentObjectUseError
+        reader = gevent.spawn(self.reader.recv, 1)
+        gevent.sleep(0.01)
+        with self.assertRaises(ConcurrentObjectUseError):
+            self.reader.recv(1)
+        self.writer.sendall(b'a')
+        self.assertEqual(reader.get(), b'a')
+
 if __name__ == '__main__':
     greentest.main()
@@ -1,4 +1,5 @@
 from __future__ import print_function
+import os
 import sys
 from time import time, sleep
 import contextlib
@@ -7,6 +8,8 @@ import weakref
 import greentest
 import gevent.threadpool
 from gevent.threadpool import ThreadPool
+from gevent.threadpool import ThreadResult
+from gevent.threadpool import WorkStealingThreadPool
 import gevent
 from greentest import ExpectedException
 from greentest import six
@@ -280,6 +283,14 @@ class TestPool10(TestPool):
     size = 10
 
 
+class TestWorkStealingPool(TestPool):
+    ClassUnderTest = WorkStealingThreadPool
+
+
+class TestWorkStealingPool10(TestPool10):
+    ClassUnderTest = WorkStealingThreadPool
+
+
 
 # class TestJoinSleep(greentest.GenericGetTestCase):
 #
@@ -357,6 +368,112 @@ class TestErrorInIterator(TestCase):
         gevent.sleep(0.001)
 
 
+class TestSpawnMany(TestCase):
+
+    error_fatal = False
+
+    def test_results(self):
+        self.pool = ThreadPool(3)
+        results = self.pool.spawn_many(sqr, range(50))
+        self.assertEqual([r.get() for r in results], [sqr(x) for x in range(50)])
+        self.assertEqual(gevent.get_hub()._thread_result_completions._pending, 0)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_error(self):
+        self.pool = ThreadPool(2)
+        results = self.pool.spawn_many(lambda x: 1 // x, [1, 0, 2])
+        self.assertEqual(results[0].get(), 1)
+        self.assertRaises(ZeroDivisionError, results[1].get)
+        self.assertEqual(results[2].get(), 0)
+
+    def test_error_in_iterator(self):
+        self.pool = ThreadPool(2)
+        self.assertRaises(greentest.ExpectedException,
+                          self.pool.spawn_many, lambda x: None, error_iter())
+        self.pool.join()
+        self.assertEqual(len(self.pool), 0)
+
+
+class TestCompletions(TestCase):
+
+    def test_shared_watcher(self):
+        self.pool = ThreadPool(3)
+        self.pool.spawn(sqr, 1).get()
+        completions = gevent.get_hub()._thread_result_completions
+        watcher = completions._watcher
+        results = [self.pool.spawn(sqr, x) for x in range(20)]
+        self.assertEqual([r.get() for r in results], [sqr(x) for x in range(20)])
+        self.assertIs(completions._watcher, watcher)
+        self.assertEqual(completions._pending, 0)
+        self.assertFalse(watcher.ref)
+
+    def test_destroyed_while_queued(self):
+        self.pool = ThreadPool(1)
+        self.pool.spawn(sqr, 1).get()
+        completions = gevent.get_hub()._thread_result_completions
+        result = ThreadResult(None)
+        self.assertEqual(completions._pending, 1)
+        result.set(1)
+        result.destroy()
+        self.assertEqual(completions._pending, 0)
+        gevent.sleep(0.01)
+        self.assertEqual(completions._pending, 0)
+        self.assertEqual(len(completions._ready), 0)
+
+
+class TestWorkStealing(TestCase):
+
+    def test_steal(self):
+        from gevent.threadpool import _StealingQueue, _Worker, _EMPTY
+        queue = _StealingQueue()
+        mine, other = _Worker(), _Worker()
+        queue._workers = [mine, other]
+        queue.put_many(range(4))
+        self.assertEqual(list(other.tasks), [0, 2])
+        self.assertEqual(list(mine.tasks), [1, 3])
+        # Our own tasks from the front, then the others' from the back.
+        taken = [queue._take(mine) for _ in range(5)]
+        self.assertEqual(taken, [1, 3, 2, 0, _EMPTY])
+
+    def test_keepalive(self):
+        pool = self.pool = WorkStealingThreadPool(3, keepalive=0.05)
+        self.assertEqual(pool.map(sqr, range(10)), [sqr(x) for x in range(10)])
+        self.assertGreater(pool.size, 0)
+        gevent.sleep(0.5)
+        self.assertEqual(pool.size, 0)
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool.map(sqr, range(10)), [sqr(x) for x in range(10)])
+
+    def test_retire_racing_spawn(self):
+        pool = self.pool = WorkStealingThreadPool(1, keepalive=0.01)
+        decrease_size = pool._decrease_size
+
+        def slow_decrease_size():
+            # Hold the retiring worker between leaving the queue and
+            # leaving the pool's count of threads.
+            sleep(0.3)
+            decrease_size()
+        pool._decrease_size = slow_decrease_size
+
+        self.assertEqual(pool.apply(sqr, (2,)), 4)
+        gevent.sleep(0.1)
+        # The only worker has retired, but is still counted.
+        self.assertEqual(pool.size, 1)
+        result = pool.spawn(sqr, 3)
+        self.assertEqual(result.get(timeout=5), 9)
+
+    def test_bad_keepalive(self):
+        with self.assertRaises(ValueError):
+            WorkStealingThreadPool(1, keepalive=-1)
+
+    @greentest.skipIf(not hasattr(os, 'sched_setaffinity'), "Needs sched_setaffinity")
+    def test_affinity(self):
+        cpu = min(os.sched_getaffinity(0))
+        pool = self.pool = WorkStealingThreadPool(2, affinity=[cpu])
+        self.assertEqual(pool.apply(os.sched_getaffinity, (0,)), set([cpu]))
+        self.assertIn(cpu, os.sched_getaffinity(0))
+
+
 class TestMaxsize(TestCase):
 
     def test_inc(self):